@@ -2,15 +2,24 @@
 Library of functions for extracting bifurcation data from simulation data.
 
 """
+import io
 import os
+import re
 
 import numpy as np
 
 from scipy import signal
 
+from saf.fm.nonlinear import Reader
+from saf.util.catalog import Catalog
+from saf.util.sweeparchive import SweepArchive, write_sweep_archive
+from saf.util.tararchive import TarArchive
+from saf.util.timewindow import find_time_window, get_time
+
 
 def get_bifurcation_data(n12, start_time, comparator, order,
-                         output_dir='_output', cache_dir='_output-cache'):
+                         output_dir='_output', cache_dir='_output-cache',
+                         archive='time-series.tar.gz'):
     params = {
         'n12': n12,
         'start_time': start_time,
@@ -18,6 +27,7 @@ def get_bifurcation_data(n12, start_time, comparator, order,
         'order': order,
         'output_dir': output_dir,
         'cache_dir': cache_dir,
+        'archive': archive,
         'outdir': os.path.join(output_dir, 'N12=%04d' % n12)
     }
 
@@ -29,13 +39,26 @@ def get_bifurcation_data(n12, start_time, comparator, order,
 
     if os.path.isfile(cache_filename):
         theta, bif_data = load_bifurcation_data(params)
+    elif not os.path.isdir(params['outdir']) and os.path.isfile(archive):
+        # Simulation results are not available, but the archive with
+        # their time series is.
+        theta, D = get_archived_simulation_data(params)
+        extrema = extract_bifurcation_data(D, params)
+        save_bifurcation_data((theta, extrema), params)
+        theta, bif_data = load_bifurcation_data(params)
     else:
         if not os.path.isdir(params['outdir']):
             msg = 'Directory `%s` does not exist' % params['outdir']
             raise FileNotFoundError(msg)
 
-        theta, D = get_simulation_data(params)
-        extrema = extract_bifurcation_data(D, params)
+        result = get_in_situ_bifurcation_data(params)
+
+        if result is None:
+            theta, D = get_simulation_data(params)
+            extrema = extract_bifurcation_data(D, params)
+        else:
+            theta, extrema = result
+
         save_bifurcation_data((theta, extrema), params)
         theta, bif_data = load_bifurcation_data(params)
 
@@ -54,53 +77,122 @@ def get_simulation_data(params):
     cache_file = os.path.join(cache_dir, cache_file)
 
     # If there is cache file with simulation data, then use data from it.
+    # Cache files in the old format (pickled object arrays) are ignored.
     if os.path.isfile(cache_file):
-        with np.load(cache_file, allow_pickle=True) as data:
-            theta = data['theta']
-            D = data['D']
+        try:
+            archive = SweepArchive(cache_file)
+            return archive.params['theta'], archive.get_all('D')
+        except (KeyError, ValueError):
+            pass
 
-        return theta, D
+    runs = Catalog(outdir).find(order_by='theta')
+    theta_list = [run.params['theta'] for run in runs]
 
-    dir_list = os.listdir(outdir)
-    dir_list.sort()
+    print('Reading {} directories in `{}`'.format(len(runs), outdir))
+    dw_list = Reader.read_many([run.path for run in runs],
+                               window=(start_time, None), with_time=False)
 
-    theta_list = []
-    dw_list = []
+    assert len(theta_list) > 1, ('No simulation data was found in the '
+                                 'directory `%s`'.format(outdir))
+
+    assert len(dw_list) == len(theta_list)
 
-    for i, dirname in enumerate(dir_list[:]):
-        if not dirname.startswith('theta'):
-            continue
+    theta_array = np.array(theta_list)
 
-        fn = os.path.join(outdir, dirname, 'detonation-velocity.npz')
+    write_sweep_archive(cache_file, {'theta': theta_array}, {'D': dw_list})
 
-        if i % 10 == 0:
-            print(dirname)
+    return theta_array, dw_list
 
-        with np.load(fn) as data:
-            t, d = data['t'], data['d']
 
-        tw = t[t >= start_time]
-        dw = d[t >= start_time]
+def get_archived_simulation_data(params):
+    """Get simulation data from the tar archive with time series.
 
-        dw_list.append(dw)
+    The archive is not extracted: only the members
+    `.../N12=<n12>/theta=<theta>/detonation-velocity.npz` are read from it,
+    in one pass over the archive.
 
-        chunks = dirname.split('=')
-        theta = float(chunks[1])
-        theta_list.append(theta)
+    """
+    n12 = params['n12']
+    start_time = params['start_time']
 
-        del t, d, tw, dw
+    pattern = re.compile(r'(?:^|/)N12=%04d/theta=([^/]+)/'
+                         r'detonation-velocity\.npz$' % n12)
 
-    assert len(theta_list) > 1, ('No simulation data was found in the '
-                                 'directory `%s`'.format(outdir))
+    print('Reading archive `{}`'.format(params['archive']))
+    with TarArchive(params['archive']) as archive:
+        members = []
+        for name in archive.names:
+            match = pattern.search(name)
+            if match:
+                members.append((float(match.group(1)), name))
+        members.sort()
 
-    assert len(dw_list) == len(theta_list)
+        assert len(members) > 1, ('No simulation data was found in the '
+                                  'archive `{}`'.format(params['archive']))
 
-    theta_array = np.array(theta_list)
-    dw_array = np.array(dw_list)
+        # Members are reduced to the time window one by one, so that
+        # the whole archive is never held in memory.
+        windows = {}
+        for name, content in archive.iter_many(
+                [name for __, name in members]):
+            with np.load(io.BytesIO(content)) as data:
+                t, d = get_time(data), data['d']
+                window = find_time_window(t, t_start=start_time)
+                windows[name] = d[window].copy()
+
+    dw_list = [windows[name] for __, name in members]
+
+    theta_array = np.array([theta for theta, __ in members])
+
+    return theta_array, dw_list
 
-    np.savez(cache_file, theta=theta_array, D=dw_array)
 
-    return theta_array, dw_array
+def get_in_situ_bifurcation_data(params):
+    """Get extrema that were detected during simulations.
+
+    Simulations write detected extrema of detonation velocity to the file
+    `extrema.npz`, if the option `extrema_order` is set.
+    Returns None if such a file is missing for any of the simulations or was
+    written with different order or later start time than required.
+
+    """
+    outdir = params['outdir']
+    start_time = params['start_time']
+    order = params['order']
+
+    if params['comparator'] == 'maxima':
+        t_key, d_key = 't_max', 'd_max'
+    elif params['comparator'] == 'minima':
+        t_key, d_key = 't_min', 'd_min'
+    else:
+        raise ValueError('Comparison is either maxima or minima')
+
+    runs = Catalog(outdir).find(order_by='theta')
+
+    theta_list = []
+    data = []
+
+    for run in runs:
+        filename = os.path.join(run.path, 'extrema.npz')
+
+        if not os.path.isfile(filename):
+            return None
+
+        with np.load(filename) as f:
+            if int(f['order']) != order or f['start_time'] > start_time:
+                return None
+
+            t = f[t_key]
+            extrema = f[d_key][t >= start_time]
+
+        # Remove first and last extrema as they could be false ones.
+        data.append(extrema[1:-1])
+        theta_list.append(run.params['theta'])
+
+    if len(theta_list) <= 1:
+        return None
+
+    return np.array(theta_list), data
 
 
 def extract_bifurcation_data(sim_data, params):
@@ -131,11 +223,20 @@ def extract_bifurcation_data(sim_data, params):
 
 def save_bifurcation_data(bif_data, params):
     cache_file = get_bif_data_filename(params)
-    np.savez(cache_file, theta=bif_data[0], extrema=bif_data[1])
+    write_sweep_archive(cache_file, {'theta': np.asarray(bif_data[0])},
+                        {'extrema': bif_data[1]})
 
 
 def load_bifurcation_data(params):
     cache_file = get_bif_data_filename(params)
+
+    try:
+        archive = SweepArchive(cache_file)
+        return archive.params['theta'], archive.get_all('extrema')
+    except ValueError:
+        pass
+
+    # Bifurcation data in the old format with the pickled object array.
     with np.load(cache_file, allow_pickle=True) as data:
         theta = data['theta']
         extrema = data['extrema']
@@ -7,6 +7,15 @@ import numpy as np
 from scipy import interpolate
 from scipy import signal
 
+from saf.fm.nonlinear import Reader
+from saf.util import find_time_window
+from saf.util.tararchive import TarArchive
+
+# Archive with time series that is downloaded from Zenodo.
+ARCHIVE = 'time-series.tar.gz'
+
+_archive = None
+
 
 def movingaverage(x, N):
     """Smooth `x` by simple moving average algorithm with windows size `N`."""
@@ -44,15 +53,20 @@ def get_data(n12, theta, cutoff_time):
     """
     dirname = os.path.join('N12=%04d/theta=%.3f' % (n12, theta))
     dirname = os.path.join('_output-cache', dirname)
-    filename = os.path.join(dirname, 'detonation-velocity.npz')
 
-    with np.load(filename) as data:
-        t, d = data['t'], data['d']
+    # The full time series is required for the phase portrait.
+    # If the time series are not extracted, they are read directly
+    # from the archive.
+    if not os.path.isdir(dirname) and os.path.isfile(ARCHIVE):
+        r = Reader(dirname, archive=_get_archive())
+    else:
+        r = Reader(dirname)
+    t, d = r.get_time_and_detonation_velocity()
 
-    cond = t >= cutoff_time
+    window = find_time_window(t, t_start=cutoff_time)
 
-    t_window = t[cond]
-    D_window = d[cond]
+    t_window = t[window]
+    D_window = d[window]
 
     tw = t
     dw = d
@@ -71,6 +85,14 @@ def get_data(n12, theta, cutoff_time):
     return t_window, D_window, D_smooth, dD_dt
 
 
+def _get_archive():
+    # The archive is opened once, so that its index is loaded only once.
+    global _archive
+    if _archive is None:
+        _archive = TarArchive(ARCHIVE)
+    return _archive
+
+
 def compute_fft(t, D, freq_ub=1):
     """Compute FFT for D(t) and return power spectrum with peaks."""
 
@@ -6,13 +6,8 @@ asset_list += $(exp)/_assets/$(asset_1)
 
 asset_2  := time-series-and-phase-portraits-together.pdf
 script_2 := plot-time-series-and-phase-portraits-together.py
-data_2   := $(exp)/_output-cache/N12=1280/theta=0.950/detonation-velocity.npz \
-            $(exp)/_output-cache/N12=1280/theta=1.000/detonation-velocity.npz \
-            $(exp)/_output-cache/N12=1280/theta=1.004/detonation-velocity.npz \
-            $(exp)/_output-cache/N12=1280/theta=1.055/detonation-velocity.npz \
-            $(exp)/_output-cache/N12=1280/theta=1.065/detonation-velocity.npz \
-            $(exp)/_output-cache/N12=1280/theta=1.089/detonation-velocity.npz
-
+# Time series are read directly from the archive without extracting it.
+data_2   := $(exp)/time-series.tar.gz
 
 asset_list += $(exp)/_assets/$(asset_2)
 
@@ -38,12 +33,6 @@ $(exp)/_assets/$(asset_2) : $(exp)/$(script_2)
 
 $(exp)/$(script_2) : $(data_2) $(exp)/lib_timeseries.py
 
-$(data_2) : $(exp)/time-series.tar.gz
-	# Extract archive.
-	tar xf $< -C $(<D)
-	# Update timestamps of all extracted data to avoid multiple extractions.
-	find $(<D)/_output-cache/N12=1280/ -type f -exec touch {} \;
-
 $(exp)/time-series.tar.gz:
 	# Download time-series.tar.gz from Zenodo.org because its ~500 MB.
 	curl -L \
@@ -2,6 +2,12 @@
 import numpy as np
 import os
 
+from saf.util import find_time_window
+from saf.util.profileindex import ProfileIndex
+from saf.util.sidecar import read_table_cached
+from saf.util.textio import read_table, read_table_window
+from saf.util.timewindow import find_series_window
+
 
 class ASCIIReader:
     """Read the results of the simulation.
@@ -12,14 +18,19 @@ class ASCIIReader:
     ----------
     results_dir: str
         Path to the directory with simulation results.
+    cache: bool, optional (default is True)
+        Whether to cache parsed text files in binary sidecar files.
+        See `saf.util.sidecar`.
 
     """
-    def __init__(self, results_dir):
+    def __init__(self, results_dir, cache=True):
         if not os.path.exists(results_dir):
             raise Exception('Not a directory')
 
         self._results_dir = results_dir
+        self._cache = cache
         self._znd_data = None
+        self._profile_index = None
 
     def get_computed_values(self):
         results_dir = self._results_dir
@@ -51,9 +62,16 @@ class ASCIIReader:
 
         return result
 
-    def get_time_and_detonation_velocity(self):
+    def get_time_and_detonation_velocity(self, t_start=None, t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -62,27 +80,21 @@ class ASCIIReader:
             Array with detonation velocity data
 
         """
-        fn_1 = os.path.join(self._results_dir, 'detonation-velocity.txt')
-        fn_2 = os.path.join(self._results_dir, 'detonation-velocity.npz')
-        if os.path.exists(fn_1):
-            data = np.genfromtxt(fn_1)
-            assert(data.shape[1] == 2), \
-                'Detonation velocity file must have two columns'
-            t = data[:, 0]
-            d = data[:, 1]
-        elif os.path.exists(fn_2):
-            data = np.load(fn_2)
-            t = data['t']
-            d = data['d']
-        else:
-            msg = 'Cannot read time series of detonation velocity'
-            raise ASCIIReaderError(msg)
+        arrays, window = self._read_series(t_start, t_end)
 
-        return t, d
+        return arrays['t'][window], arrays['d'][window]
 
-    def get_time_and_normalized_detonation_velocity(self):
+    def get_time_and_normalized_detonation_velocity(self, t_start=None,
+                                                    t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -92,98 +104,150 @@ class ASCIIReader:
 
         """
         comp_vals = self.get_computed_values()
-        t, d = self.get_time_and_detonation_velocity()
+        t, d = self.get_time_and_detonation_velocity(
+            t_start=t_start, t_end=t_end)
         d_normalized = (comp_vals['d_znd'] + d) / comp_vals['d_znd']
 
         return t, d_normalized
 
-    # def get_profile(self, time_step):
-    #     """Read profile data from simulation results.
+    def get_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity from simulation results.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        d: ndarray
+            Array with detonation velocity data.
+
+        """
+        arrays, window = self._read_series(t_start, t_end, with_time=False)
+
+        return arrays['d'][window]
+
+    def _read_series(self, t_start, t_end, with_time=True):
+        # Return the arrays of the time series and the window in them.
+        # The time is accessed only if needed, so that the readers that store
+        # it separately can skip it when `with_time` is False and no window
+        # is given.
+        fn_1 = os.path.join(self._results_dir, 'detonation-velocity.txt')
+        fn_2 = os.path.join(self._results_dir, 'detonation-velocity.npz')
+        if os.path.exists(fn_1):
+            # A text file is parsed as a whole, so the time is always read.
+            if self._cache:
+                data = read_table_cached(fn_1)
+                data = data[find_time_window(data[:, 0], t_start, t_end)]
+            else:
+                data = read_table_window(fn_1, t_start, t_end)
+            assert(data.shape[1] == 2), \
+                'Detonation velocity file must have two columns'
+            return {'t': data[:, 0], 'd': data[:, 1]}, slice(None)
+        elif os.path.exists(fn_2):
+            # Arrays of the archive are read only when accessed.
+            data = np.load(fn_2)
+            arrays = {'d': data['d']}
+            if with_time or t_start is not None or t_end is not None:
+                arrays['t'] = data['t']
+        else:
+            msg = 'Cannot read time series of detonation velocity'
+            raise ASCIIReaderError(msg)
 
-    #     Parameters
-    #     ----------
-    #     time_step : int
-    #         Time step number.
+        return arrays, find_series_window(arrays, t_start, t_end)
 
-    #     Returns
-    #     -------
-    #     t, x, u, lamda, omega: array_like
-    #         Time, grid, velocity, reaction progress variable, reaction rate,
-    #         respectively.
+    def get_profile(self, time_step):
+        """Read profile data from simulation results.
 
-    #     """
-    #     fn = 'profile-' + str(time_step) + '.txt'
-    #     full_fn = os.path.join(results_dir, 'profiles', fn)
+        Parameters
+        ----------
+        time_step : int
+            Time step number.
 
-    #     with open(full_fn, 'r') as f:
-    #         for line in f:
-    #             if line.startswith('# time '):
-    #                 chunks = line.split()
-    #                 t = float(chunks[2].strip())
+        Returns
+        -------
+        t : float
+            Simulation time of the profile.
+        x, u, lamda : ndarray
+            Grid, velocity, reaction progress variable, respectively.
 
-    #     data = np.genfromtxt(full_fn)
-    #     x = data[3:, 0]
-    #     u = data[3:, 1]
-    #     lamda = data[3:, 2]
-    #     omega = np.zeros_like(lamda)
-    #     print('Hardcoded stripping off of ghost points on the left boundary')
+        """
+        t, x, u, lamda = self.get_profiles([time_step])
 
-    #     # config_filename = os.path.join(results_dir, 'config.ini')
-    #     # c = Config(config_filename)
-    #     # q = c.q
-    #     # k = computed_values['k']
-    #     # theta = k * np.exp * (theta * (u + q * lamda))
-    #     # omega =
+        return t[0], x, u[0], lamda[0]
 
-    #     return t, x, u, lamda, omega
+    def get_profiles(self, time_steps=None):
+        """Read several profiles at once.
 
+        Parameters
+        ----------
+        time_steps : array_like of int, optional
+            Time step numbers of the profiles. If None, all profiles are read.
 
-    # def get_final_profile(self):
-    #     """Read final profile data from simulation results.
+        Returns
+        -------
+        t : ndarray
+            Simulation times of the profiles.
+        x : ndarray
+            Grid.
+        u, lamda : ndarray
+            Velocity and reaction progress variable, respectively, as arrays
+            of shape (n_profiles, n_grid).
 
-    #     Returns
-    #     -------
-    #     t : float
-    #         Simulation time for the final profile.
-    #     x, u, lamda, omega : array_like
-    #         Grid, velocity, reaction progress variable, reaction rate.
+        """
+        try:
+            t, data = self._get_profile_index().read(time_steps)
+        except ValueError as e:
+            raise ASCIIReaderError(str(e))
 
-    #     """
-    #     last_time_step = get_final_profile_time_step(results_dir)
+        if len(t) == 0:
+            raise ASCIIReaderError('There are no profiles')
 
-    #     return get_profile(results_dir, last_time_step)
+        x = data[0, :, 0]
+        u = data[:, :, 1]
+        lamda = data[:, :, 2]
 
-    # def get_profiles_time_steps(self):
-    #     """Return a sorted array of time steps for which profiles were written.
+        return t, x, u, lamda
 
-    #     Precisely, profiles subdirectory of the `results_dir` is read and time
-    #     steps of the profiles that were written during simulation are returned.
+    def get_final_profile(self):
+        """Read final profile data from simulation results.
 
-    #     Parameters
-    #     ----------
-    #     results_dir : str
-    #         Path to the directory with simulation results.
+        Returns
+        -------
+        t : float
+            Simulation time for the final profile.
+        x, u, lamda : ndarray
+            Grid, velocity, reaction progress variable.
 
-    #     Returns
-    #     -------
-    #     time_steps : ndarray of int
-    #         Sorted array of the time steps for which profiles were saved during
-    #         simulation.
+        """
+        last_time_step = self.get_final_profile_time_step()
 
-    #     """
-    #     profiles_dir = os.path.join(results_dir, 'profiles')
+        return self.get_profile(last_time_step)
 
-    #     files_list = os.listdir(profiles_dir)
+    def get_profiles_time_steps(self):
+        """Return a sorted array of time steps for which profiles were written.
 
-    #     time_steps = []
+        Returns
+        -------
+        time_steps : ndarray of int
+            Sorted array of the time steps for which profiles were saved during
+            simulation.
 
-    #     for i, d in enumerate(files_list):
-    #         ts = int(d.lstrip('profile-').rstrip('.txt'))
-    #         time_steps.append(ts)
+        """
+        return self._get_profile_index().time_steps
 
-    #     time_steps.sort()
+    def _get_profile_index(self):
+        if self._profile_index is None:
+            try:
+                self._profile_index = ProfileIndex(self._results_dir,
+                                                   cache=self._cache)
+            except ValueError as e:
+                raise ASCIIReaderError(str(e))
 
-    #     return np.array(time_steps, dtype=np.int)
+        return self._profile_index
 
     def get_final_profile_time_step(self):
         """Return time step of the final profile generated during simulation.
@@ -205,7 +269,10 @@ class ASCIIReader:
     def get_znd_data(self):
         if self._znd_data is None:
             filename = os.path.join(self._results_dir, 'znd-solution.txt')
-            self._znd_data = np.loadtxt(filename)
+            if self._cache:
+                self._znd_data = read_table_cached(filename)
+            else:
+                self._znd_data = read_table(filename)
 
         result = {
             'x': self._znd_data[:, 0],
@@ -3,6 +3,8 @@ import os
 
 import numpy as np
 
+from saf.util.textio import format_table
+
 from .solution import Solution
 
 
@@ -38,14 +40,21 @@ class ASCIIWriter(object):
         if not os.path.isdir(self._profiles_path):
             os.mkdir(self._profiles_path)
 
-        self._time_series = []
+        self._open_detonation_velocity_file()
 
+    def _open_detonation_velocity_file(self):
         self._filename = os.path.join(self._output, 'detonation-velocity.txt')
         self._file_det_vel = open(self._filename, 'w')
         self._file_det_vel.write(
             '# First column is time, '
             'second column is the perturbation of detonation velocity.\n')
 
+        # Time steps are accumulated in the buffer and formatted as text
+        # in blocks, when the buffer is full.
+        self._counter = 0
+        self._buffer_size = 1000
+        self._buffer = np.empty((self._buffer_size, 2))
+
     def save_configuration(self):
         self._config.copy_to_output(self._output)
 
@@ -88,18 +97,36 @@ class ASCIIWriter(object):
         if time == self._config.final_time:
             self.save_profile(time_step, time, soln_data, force=True)
 
+    def needs_solution(self, time_step, time):
+        """Check if `save` uses more of the solution than its last value.
+
+        At other time steps, only detonation velocity, the last value of
+        the solution, is written.
+
+        """
+        plot_time_step = self._config.plot_time_step
+
+        return plot_time_step != 0 and (time_step % plot_time_step == 0 or
+                                         time == self._config.final_time)
+
     def save_detonation_speed(self, time_step, time, soln_data):
         det_speed = soln_data[-1]
-        self._time_series.append(det_speed)
-        self._file_det_vel.write(
-            '{t:24.16e} {d:24.16e}\n'.format(
-                t=time, d=det_speed))
+        self._buffer[self._counter] = (time, det_speed)
+        self._counter += 1
+
+        if self._counter == self._buffer_size:
+            self._flush_detonation_speed()
+
+    def _flush_detonation_speed(self):
+        block = self._buffer[:self._counter]
+        self._file_det_vel.write(format_table(block, fmt='%24.16e'))
+        self._counter = 0
 
     def save_profile(self, time_step, time, soln_data, force=False):
         if force:
             profile_filename = '/profile-' + str(time_step) + '.txt'
             profile_filename = self._profiles_path + profile_filename
-            h1 = 'Columns: x, u, lamda'
+            h1 = 'Columns: x, u, lamda\n'
             h2 = 'time_step {}\n'.format(time_step)
             h3 = 'time {0:24.16e}'.format(time)
             header = h1 + h2 + h3
@@ -112,4 +139,5 @@ class ASCIIWriter(object):
 
 
     def close(self):
+        self._flush_detonation_speed()
         self._file_det_vel.close()
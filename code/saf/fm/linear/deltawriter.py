@@ -0,0 +1,24 @@
+import os
+
+from saf.util.deltacodec import write_table
+
+from .numpywriter import NumpyWriter
+
+
+class DeltaWriter(NumpyWriter):
+    """Writer of the simulation output compressed with the delta codec.
+
+    This writer streams the time series of detonation velocity to disk in the
+    same way as `NumpyWriter` and writes it in `close` to
+    `detonation-velocity.dz` compressed losslessly with
+    `saf.util.deltacodec`.
+    All other output is written in the same way as by `ASCIIWriter`.
+
+    """
+
+    def _open_detonation_velocity_file(self):
+        super()._open_detonation_velocity_file()
+        self._filename = os.path.join(self._output, 'detonation-velocity.dz')
+
+    def _save_detonation_velocity(self, f, data):
+        write_table(f, data)
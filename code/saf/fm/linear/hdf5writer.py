@@ -35,14 +35,10 @@ class HDF5Writer(object):
         self._znd = znd
 
         self._output = outdir
-        self._profiles_path = self._output + '/profiles'
 
         if not os.path.isdir(self._output):
             os.mkdir(self._output)
 
-        if not os.path.isdir(self._profiles_path):
-            os.mkdir(self._profiles_path)
-
         filename_det_vel = os.path.join(self._output, 'detonation-velocity.h5')
         self._file_det_vel = h5py.File(filename_det_vel, 'w')
 
@@ -55,6 +51,10 @@ class HDF5Writer(object):
         self._buffer_size = 1000
         self._buffer = np.empty((self._buffer_size, 2))
 
+        # File with profiles is created when the first profile is saved.
+        self._file_profiles = None
+        self._last_profile_time_step = None
+
     def save_configuration(self):
         self._config.copy_to_output(self._output)
 
@@ -99,6 +99,18 @@ class HDF5Writer(object):
         if time == self._config.final_time:
             self.save_profile(time_step, time, soln_data, force=True)
 
+    def needs_solution(self, time_step, time):
+        """Check if `save` uses more of the solution than its last value.
+
+        At other time steps, only detonation velocity, the last value of
+        the solution, is written.
+
+        """
+        plot_time_step = self._config.plot_time_step
+
+        return plot_time_step != 0 and (time_step % plot_time_step == 0 or
+                                         time == self._config.final_time)
+
     def save_detonation_speed(self, time_step, time, soln_data):
         det_speed = soln_data[-1]
         buffer_size = self._buffer_size
@@ -116,19 +128,59 @@ class HDF5Writer(object):
         self._counter += 1
 
     def save_profile(self, time_step, time, soln_data, force=False):
-        if force:
-            profile_filename = '/profile-' + str(time_step) + '.txt'
-            profile_filename = self._profiles_path + profile_filename
-            h1 = 'Columns: x, rho, u, p, lamda'
-            h2 = 'time_step {}\n'.format(time_step)
-            h3 = 'time {0:24.16e}'.format(time)
-            header = h1 + h2 + h3
-            data = np.empty((len(self._grid), 3))
-            solution = Solution(soln_data)
-            data[:, 0] = self._grid
-            data[:, 1] = solution.u
-            data[:, 2] = solution.lamda
-            np.savetxt(profile_filename, data, fmt='%24.16e', header=header)
+        """Append profiles of the solution to the file `profiles.h5`.
+
+        Profiles of all fields are stored in two-dimensional datasets
+        `u` and `lamda` of shape (n_profiles, n_grid) that are extended
+        by one row per snapshot.
+        Datasets `time` and `time_step` index the rows, and dataset `x`
+        stores the grid.
+
+        """
+        if self._last_profile_time_step == time_step:
+            # The final profile was already saved as a regular one.
+            return
+
+        if self._file_profiles is None:
+            self._create_profiles_file()
+
+        fh = self._file_profiles
+        solution = Solution(soln_data)
+        n = fh['time'].shape[0]
+
+        for name, value in [('time', time), ('time_step', time_step),
+                            ('u', solution.u), ('lamda', solution.lamda)]:
+            dset = fh[name]
+            dset.resize(n + 1, axis=0)
+            dset[n] = value
+
+        self._last_profile_time_step = time_step
+
+    def _create_profiles_file(self):
+        filename = os.path.join(self._output, 'profiles.h5')
+        fh = h5py.File(filename, 'w')
+        npoints = len(self._grid)
+
+        # Chunks of about 128 KiB hold several consecutive profiles, so that
+        # compression works over the time dimension as well and a single
+        # profile is read by decompressing one chunk.
+        rows_per_chunk = max(1, 2**17 // (8 * npoints))
+
+        fh.create_dataset('x', data=self._grid)
+
+        for name in ['u', 'lamda']:
+            fh.create_dataset(
+                name, dtype=np.float64,
+                shape=(0, npoints), maxshape=(None, npoints),
+                chunks=(rows_per_chunk, npoints), compression='gzip',
+                shuffle=True)
+
+        fh.create_dataset('time', dtype=np.float64, shape=(0,),
+                          maxshape=(None,), chunks=(1024,))
+        fh.create_dataset('time_step', dtype=np.int64, shape=(0,),
+                          maxshape=(None,), chunks=(1024,))
+
+        self._file_profiles = fh
 
     def close(self):
         buffer_size = self._buffer_size
@@ -144,3 +196,6 @@ class HDF5Writer(object):
             dset.resize(self._counter, axis=0)
 
         self._file_det_vel.close()
+
+        if self._file_profiles is not None:
+            self._file_profiles.close()
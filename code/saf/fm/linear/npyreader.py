@@ -0,0 +1,27 @@
+"""Description of the class NpyReader."""
+import numpy as np
+import os
+
+from saf.util import find_time_window
+
+from .asciireader import ASCIIReader
+
+
+class NpyReader(ASCIIReader):
+    """Read the results of the simulation.
+
+    Works with the time series of detonation velocity written as a raw
+    Numpy array, which is memory-mapped instead of being read into memory.
+    The returned arrays are memory-mapped views of the file, hence, only
+    the parts of the file that are actually accessed are read from disk.
+
+    """
+    def _read_series(self, t_start, t_end, with_time=True):
+        fn = os.path.join(self._results_dir, 'detonation-velocity.npy')
+        data = np.load(fn, mmap_mode='r')
+        t = data[:, 0]
+        d = data[:, 1]
+
+        window = find_time_window(t, t_start, t_end)
+
+        return {'t': t, 'd': d}, window
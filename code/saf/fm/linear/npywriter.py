@@ -0,0 +1,33 @@
+import os
+
+from saf.util.npyio import NpyAppender
+
+from .asciiwriter import ASCIIWriter
+
+
+class NpyWriter(ASCIIWriter):
+    """Writer of the simulation output for linear Fickett--Faria model.
+
+    This writer writes the time series of detonation velocity as a raw
+    uncompressed array in the Numpy format [1]_, such that it can be opened
+    with `np.load(fn, mmap_mode='r')` and sliced without reading the whole
+    file into memory.
+    The array has two columns: time and detonation velocity.
+    All other output is written in the same way as by `ASCIIWriter`.
+
+    References
+    ----------
+    [1] https://docs.scipy.org/doc/numpy/neps/npy-format.html
+
+    """
+
+    def _open_detonation_velocity_file(self):
+        self._filename = os.path.join(self._output, 'detonation-velocity.npy')
+        self._det_vel_appender = NpyAppender(self._filename, 2)
+
+    def save_detonation_speed(self, time_step, time, soln_data):
+        det_speed = soln_data[-1]
+        self._det_vel_appender.append((time, det_speed))
+
+    def close(self):
+        self._det_vel_appender.close()
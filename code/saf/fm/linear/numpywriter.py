@@ -1,14 +1,22 @@
 import os
+import tempfile
 
 import numpy as np
 
-from .asciiwriter import ASCIIWriter
+from .npywriter import NpyWriter
 
 
-class NumpyWriter(ASCIIWriter):
+class NumpyWriter(NpyWriter):
     """Writer of the simulation output for linear Fickett--Faria model.
 
     This writer writes simulation data in the Numpy format [1]_.
+    The time series of detonation velocity is streamed to disk as raw
+    float64 blocks in the same way as by `NpyWriter`, so that a killed
+    simulation leaves `detonation-velocity.npy` with the series computed
+    so far.
+    In `close`, the series is copied to `detonation-velocity.npz` and the
+    `.npy` file is removed.
+    All other output is written in the same way as by `ASCIIWriter`.
 
     References
     ----------
@@ -16,11 +24,28 @@ class NumpyWriter(ASCIIWriter):
 
     """
 
-    def close(self):
-        super(NumpyWriter, self).close()
-
-        npz_filename = os.path.join(self._output, 'detonation-velocity.npz')
-        t, d = np.loadtxt(self._filename, unpack=True)
+    def _open_detonation_velocity_file(self):
+        super()._open_detonation_velocity_file()
+        self._npy_filename = self._filename
+        self._filename = os.path.join(self._output, 'detonation-velocity.npz')
 
-        np.savez(npz_filename, t=t, d=d)
-        os.remove(self._filename)
+    def close(self):
+        self._det_vel_appender.close()
+        data = np.load(self._npy_filename, mmap_mode='r')
+
+        # The `.npy` file is removed only after the final file is complete.
+        fd, tmp_filename = tempfile.mkstemp(dir=self._output, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._save_detonation_velocity(f, data)
+            os.replace(tmp_filename, self._filename)
+        except BaseException:
+            os.remove(tmp_filename)
+            raise
+
+        # The memory map must be released before the file is removed.
+        del data
+        os.remove(self._npy_filename)
+
+    def _save_detonation_velocity(self, f, data):
+        np.savez(f, t=data[:, 0], d=data[:, 1])
@@ -1,7 +1,11 @@
 import logging
 import os
 
+from saf.util.bulkread import read_many
+
 from .asciireader import ASCIIReader
+from .deltareader import DeltaReader
+from .npyreader import NpyReader
 from .numpyreader import NumpyReader
 
 _hdf5_enabled = False
@@ -28,10 +32,16 @@ class Reader(object):
     ----------
     results_dir : str
         Path to the directory with simulation results.
+    file_pool : HDF5FilePool, optional
+        Pool of open HDF5 files that is shared between readers.
+        Used only if the results are written in the HDF5 format.
+    cache : bool, optional (default is True)
+        Whether to cache parsed text files in binary sidecar files, such that
+        they are parsed only once. See `saf.util.sidecar`.
 
     """
 
-    def __init__(self, results_dir):
+    def __init__(self, results_dir, file_pool=None, cache=True):
         if not os.path.exists(results_dir):
             raise ReaderError('Directory does not exist')
 
@@ -41,24 +51,64 @@ class Reader(object):
                                           'detonation-velocity.txt')
         det_vel_file_numpy = os.path.join(self._results_dir,
                                           'detonation-velocity.npz')
+        det_vel_file_npy = os.path.join(self._results_dir,
+                                        'detonation-velocity.npy')
         det_vel_file_hdf5 = os.path.join(self._results_dir,
                                          'detonation-velocity.h5')
+        det_vel_file_delta = os.path.join(self._results_dir,
+                                          'detonation-velocity.dz')
 
         if os.path.exists(det_vel_file_ascii):
-            self._reader = ASCIIReader(results_dir)
+            self._reader = ASCIIReader(results_dir, cache=cache)
         elif os.path.exists(det_vel_file_numpy):
-            self._reader = NumpyReader(results_dir)
+            self._reader = NumpyReader(results_dir, cache=cache)
+        elif os.path.exists(det_vel_file_npy):
+            self._reader = NpyReader(results_dir, cache=cache)
+        elif os.path.exists(det_vel_file_delta):
+            self._reader = DeltaReader(results_dir, cache=cache)
         elif os.path.exists(det_vel_file_hdf5) and _hdf5_enabled:
-            self._reader = HDF5Reader(results_dir)
+            self._reader = HDF5Reader(results_dir, file_pool=file_pool,
+                                      cache=cache)
         else:
             raise ReaderError('Unknown format')
 
+    @classmethod
+    def read_many(cls, dirs, window=None, workers=None, processes=False,
+                  normalized=False, stack=False, with_time=True, **kwargs):
+        """Read time series of detonation velocity from many directories.
+
+        The directories are read concurrently with a pool of threads or
+        processes, see `saf.util.bulkread.read_many` for the description
+        of the parameters.
+
+        Returns
+        -------
+        t, d : list of ndarray or ndarray
+            Times and detonation velocities in the order of `dirs`.
+            If `with_time` is False, only `d` is returned.
+
+        Examples
+        --------
+        >>> t, d = Reader.read_many(dirs, window=(900, None), workers=16)
+
+        """
+        return read_many(cls, dirs, window=window, workers=workers,
+                         processes=processes, normalized=normalized,
+                         stack=stack, with_time=with_time, **kwargs)
+
     def get_computed_values(self):
         return self._reader.get_computed_values()
 
-    def get_time_and_detonation_velocity(self):
+    def get_time_and_detonation_velocity(self, t_start=None, t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -67,11 +117,20 @@ class Reader(object):
             Array with detonation velocity data
 
         """
-        return self._reader.get_time_and_detonation_velocity()
+        return self._reader.get_time_and_detonation_velocity(
+            t_start=t_start, t_end=t_end)
 
-    def get_time_and_normalized_detonation_velocity(self):
+    def get_time_and_normalized_detonation_velocity(self, t_start=None,
+                                                    t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -80,7 +139,71 @@ class Reader(object):
             Array with normalized detonation velocity data.
 
         """
-        return self._reader.get_time_and_normalized_detonation_velocity()
+        return self._reader.get_time_and_normalized_detonation_velocity(
+            t_start=t_start, t_end=t_end)
+
+    def get_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity from simulation results.
+
+        Use it instead of `get_time_and_detonation_velocity` when the time is
+        not needed: if no window is given, the readers of binary formats
+        do not read the time at all.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        d: ndarray
+            Array with detonation velocity data.
+
+        """
+        return self._reader.get_detonation_velocity(
+            t_start=t_start, t_end=t_end)
+
+    def get_profile(self, time_step):
+        """Read the profile written at the time step `time_step`.
+
+        Returns
+        -------
+        t : float
+            Simulation time of the profile.
+        x, u, lamda : ndarray
+            Grid, velocity, reaction progress variable, respectively.
+
+        """
+        return self._reader.get_profile(time_step)
+
+    def get_profiles(self, time_steps=None):
+        """Read several profiles at once.
+
+        Parameters
+        ----------
+        time_steps : array_like of int, optional
+            Time step numbers of the profiles. If None, all profiles are read.
+
+        Returns
+        -------
+        t : ndarray
+            Simulation times of the profiles.
+        x : ndarray
+            Grid.
+        u, lamda : ndarray
+            Velocity and reaction progress variable, respectively, as arrays
+            of shape (n_profiles, n_grid).
+
+        """
+        return self._reader.get_profiles(time_steps)
+
+    def get_profiles_time_steps(self):
+        return self._reader.get_profiles_time_steps()
+
+    def get_final_profile(self):
+        return self._reader.get_final_profile()
 
     def get_znd_data(self):
         return self._reader.get_znd_data()
@@ -3,6 +3,10 @@ import os
 
 import numpy as np
 
+from saf.util.checkpoint import save_checkpoint as write_checkpoint
+from saf.util.extrema import ExtremaTracker
+from saf.util.textio import format_table
+
 from .solution import Solution
 
 
@@ -19,16 +23,38 @@ class ASCIIWriter(object):
         ZND solution.
     outdir : str
         Path to the directory to which simulation results should be written.
+    checkpoint : dict, optional
+        Checkpoint returned by `saf.util.checkpoint.load_checkpoint`.
+        If given, the output of the simulation restarted from this checkpoint
+        is appended to the existing output in `outdir`, which is truncated
+        to the state at the checkpoint.
+        The solver should continue from the time step next to the time step
+        of the checkpoint.
 
     """
 
-    def __init__(self, config, grid, dx, znd, outdir):
+    def __init__(self, config, grid, dx, znd, outdir, checkpoint=None):
         self._logger = logging.getLogger(__name__)
         self._config = config
         self._grid = grid
         self._dx = dx
         self._znd = znd
 
+        self._output_step = config.output_step
+        # Time accumulated by the solver has round-off errors, hence,
+        # the start time is compared with the tolerance of half a time step.
+        self._output_start_time = config.output_start_time
+        if config.dt:
+            self._output_start_time -= 0.5 * config.dt
+
+        self._extrema_tracker = None
+        if config.extrema_order > 0:
+            self._extrema_tracker = ExtremaTracker(
+                order=config.extrema_order,
+                start_time=config.extrema_start_time)
+
+        self._checkpoint_every = config.checkpoint_every
+
         self._output = outdir
         self._profiles_path = self._output + '/profiles'
 
@@ -38,14 +64,71 @@ class ASCIIWriter(object):
         if not os.path.isdir(self._profiles_path):
             os.mkdir(self._profiles_path)
 
-        self._time_series = []
+        if checkpoint is None:
+            self._open_detonation_velocity_file()
+        else:
+            self._resume(checkpoint)
 
+    def _open_detonation_velocity_file(self):
         self._filename = os.path.join(self._output, 'detonation-velocity.txt')
         self._file_det_vel = open(self._filename, 'w')
         self._file_det_vel.write(
             '# First column is time, '
             'second column is the perturbation of detonation velocity.\n')
 
+        # Time steps are accumulated in the buffer and formatted as text
+        # in blocks, when the buffer is full.
+        self._counter = 0
+        self._buffer_size = 1000
+        self._buffer = np.empty((self._buffer_size, 2))
+
+    def _resume_detonation_velocity_file(self, checkpoint):
+        self._filename = os.path.join(self._output, 'detonation-velocity.txt')
+
+        # Discard the lines written after the checkpoint.
+        os.truncate(self._filename, int(checkpoint['det_vel_position']))
+        self._file_det_vel = open(self._filename, 'a')
+
+        self._counter = 0
+        self._buffer_size = 1000
+        self._buffer = np.empty((self._buffer_size, 2))
+
+    def _get_detonation_velocity_state(self):
+        self._flush_detonation_speed()
+        self._file_det_vel.flush()
+        os.fsync(self._file_det_vel.fileno())
+
+        return {'det_vel_position': self._file_det_vel.tell()}
+
+    def _resume(self, checkpoint):
+        self._resume_detonation_velocity_file(checkpoint)
+
+        if self._extrema_tracker is not None:
+            self._extrema_tracker.set_state({
+                'maxima': checkpoint['extrema_maxima'],
+                'minima': checkpoint['extrema_minima'],
+                'pending': checkpoint['extrema_pending'],
+            })
+
+    def save_checkpoint(self, time_step, time, soln_data):
+        """Save the state of the simulation to `checkpoint.npz`.
+
+        All output is flushed to disk before the checkpoint is written.
+
+        """
+        state = {
+            'time_step': time_step,
+            'time': time,
+            'soln_data': soln_data,
+        }
+        state.update(self._get_detonation_velocity_state())
+
+        if self._extrema_tracker is not None:
+            for key, value in self._extrema_tracker.get_state().items():
+                state['extrema_' + key] = value
+
+        write_checkpoint(self._output, state)
+
     def save_configuration(self):
         self._config.copy_to_output(self._output)
 
@@ -78,24 +161,60 @@ class ASCIIWriter(object):
         np.savetxt(filename, data, fmt='%24.16e', header=header)
 
     def save(self, time_step, time, soln_data):
+        if self._extrema_tracker is not None:
+            self._extrema_tracker.append(time, soln_data[-1])
+
         self.save_detonation_speed(time_step, time, soln_data)
 
-        if self._config.plot_time_step == 0:
-            return
+        if self._config.plot_time_step != 0:
+            if time_step % self._config.plot_time_step == 0:
+                self.save_profile(time_step, time, soln_data)
+
+            # Output profiles if we reached the end of simulation.
+            if time == self._config.final_time:
+                self.save_profile(time_step, time, soln_data, force=True)
+
+        if (self._checkpoint_every > 0 and
+                time_step % self._checkpoint_every == 0):
+            self.save_checkpoint(time_step, time, soln_data)
+
+    def needs_solution(self, time_step, time):
+        """Check if `save` uses more of the solution than its last value.
+
+        At other time steps, only detonation velocity, the last value of
+        the solution, is written.
+
+        """
+        plot_time_step = self._config.plot_time_step
+        if plot_time_step != 0 and (time_step % plot_time_step == 0 or
+                                    time == self._config.final_time):
+            return True
 
-        if time_step % self._config.plot_time_step == 0:
-            self.save_profile(time_step, time, soln_data)
+        return (self._checkpoint_every > 0 and
+                time_step % self._checkpoint_every == 0)
 
-        # Output profiles if we reached the end of simulation.
-        if time == self._config.final_time:
-            self.save_profile(time_step, time, soln_data, force=True)
+    def _is_output_time_step(self, time_step, time):
+        """Check if detonation velocity is written at this time step."""
+        if time < self._output_start_time:
+            return False
+
+        return time_step % self._output_step == 0
 
     def save_detonation_speed(self, time_step, time, soln_data):
+        if not self._is_output_time_step(time_step, time):
+            return
+
         det_speed = soln_data[-1]
-        self._time_series.append(det_speed)
-        self._file_det_vel.write(
-            '{t:24.16e} {d:24.16e}\n'.format(
-                t=time, d=det_speed))
+        self._buffer[self._counter] = (time, det_speed)
+        self._counter += 1
+
+        if self._counter == self._buffer_size:
+            self._flush_detonation_speed()
+
+    def _flush_detonation_speed(self):
+        block = self._buffer[:self._counter]
+        self._file_det_vel.write(format_table(block, fmt='%24.16e'))
+        self._counter = 0
 
     def save_profile(self, time_step, time, soln_data, force=False):
         """TODO: Docstring for save_profile.
@@ -109,7 +228,7 @@ class ASCIIWriter(object):
         if force:
             profile_filename = '/profile-' + str(time_step) + '.txt'
             profile_filename = self._profiles_path + profile_filename
-            h1 = 'Columns: x, rho, u, p, lamda'
+            h1 = 'Columns: x, u, lamda\n'
             h2 = 'time_step {}\n'.format(time_step)
             h3 = 'time {0:24.16e}'.format(time)
             header = h1 + h2 + h3
@@ -121,5 +240,13 @@ class ASCIIWriter(object):
             np.savetxt(profile_filename, data, fmt='%24.16e', header=header)
 
 
+    def _save_extrema(self):
+        if self._extrema_tracker is not None:
+            filename = os.path.join(self._output, 'extrema.npz')
+            self._extrema_tracker.save(filename)
+
     def close(self):
+        self._save_extrema()
+
+        self._flush_detonation_speed()
         self._file_det_vel.close()
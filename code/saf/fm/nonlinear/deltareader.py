@@ -0,0 +1,33 @@
+"""Description of the class DeltaReader."""
+import os
+
+from saf.util import find_time_window
+from saf.util.deltacodec import read_table
+
+from .asciireader import ASCIIReader
+
+
+class DeltaReader(ASCIIReader):
+    """Read the results of the simulation.
+
+    Works with the time series of detonation velocity compressed with
+    the delta codec, see `saf.util.deltacodec`.
+    Only the blocks of the file that overlap with the requested time window
+    are decompressed; if only detonation velocity of the whole series is
+    requested, the time column is not decompressed at all.
+
+    """
+    def _read_series(self, t_start, t_end, with_time=True):
+        fn = os.path.join(self._results_dir, 'detonation-velocity.dz')
+
+        if not with_time and t_start is None and t_end is None:
+            d = read_table(fn, columns=[1])[:, 0]
+            return {'d': d}, slice(None)
+
+        data = read_table(fn, t_start, t_end)
+        t = data[:, 0]
+        d = data[:, 1]
+
+        window = find_time_window(t, t_start, t_end)
+
+        return {'t': t, 'd': d}, window
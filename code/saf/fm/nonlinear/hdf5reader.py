@@ -1,9 +1,14 @@
 """Description of the class fickettmodel.euler1d.linear.asciireader."""
+import contextlib
 import os
 
 import numpy as np
 import h5py
 
+from saf.util import find_time_window
+from saf.util.sidecar import read_table_cached
+from saf.util.textio import read_table
+
 
 class HDF5Reader(object):
     """Read the results of the simulation.
@@ -14,13 +19,22 @@ class HDF5Reader(object):
     ----------
     results_dir: str
         Path to the directory with simulation results.
+    file_pool: HDF5FilePool, optional
+        Pool of open HDF5 files. If given, the files are taken from the pool
+        and are left open after reading, otherwise, they are opened and closed
+        on every read.
+    cache: bool, optional (default is True)
+        Whether to cache parsed text files in binary sidecar files.
+        See `saf.util.sidecar`.
 
     """
-    def __init__(self, results_dir):
+    def __init__(self, results_dir, file_pool=None, cache=True):
         if not os.path.exists(results_dir):
             raise Exception('Not a directory')
 
         self._results_dir = results_dir
+        self._file_pool = file_pool
+        self._cache = cache
         self._znd_data = None
 
     def get_computed_values(self):
@@ -50,9 +64,16 @@ class HDF5Reader(object):
 
         return result
 
-    def get_time_and_detonation_velocity(self):
+    def get_time_and_detonation_velocity(self, t_start=None, t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -62,16 +83,68 @@ class HDF5Reader(object):
 
         """
         fn = os.path.join(self._results_dir, 'detonation-velocity.h5')
-        fh = h5py.File(fn, 'r')
 
-        t = fh['detonation-velocity'][:, 0]
-        d = fh['detonation-velocity'][:, 1]
+        with self._open(fn) as fh:
+            dset = fh['detonation-velocity']
+
+            # Locate the window by binary search over the time column
+            # and then read both columns with one hyperslab selection,
+            # such that every chunk of the window is decompressed once.
+            window = find_time_window(dset, t_start, t_end, column=0)
+            data = dset[window]
+
+        t = data[:, 0]
+        d = data[:, 1]
 
         return t, d
 
-    def get_time_and_normalized_detonation_velocity(self):
+    def get_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity from simulation results.
+
+        Only the time values needed to locate the window are read.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        d: ndarray
+            Array with detonation velocity data.
+
+        """
+        fn = os.path.join(self._results_dir, 'detonation-velocity.h5')
+
+        with self._open(fn) as fh:
+            dset = fh['detonation-velocity']
+            window = find_time_window(dset, t_start, t_end, column=0)
+            d = dset[window, 1]
+
+        return d
+
+    @contextlib.contextmanager
+    def _open(self, filename):
+        if self._file_pool is not None:
+            with self._file_pool.open(filename) as fh:
+                yield fh
+        else:
+            with h5py.File(filename, 'r') as fh:
+                yield fh
+
+    def get_time_and_normalized_detonation_velocity(self, t_start=None,
+                                                    t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -81,111 +154,125 @@ class HDF5Reader(object):
 
         """
         comp_vals = self.get_computed_values()
-        t, d = self.get_time_and_detonation_velocity()
+        t, d = self.get_time_and_detonation_velocity(
+            t_start=t_start, t_end=t_end)
         d_normalized = (comp_vals['d_znd'] + d) / comp_vals['d_znd']
 
         return t, d_normalized
 
-    # def get_profile(self, time_step):
-    #     """Read profile data from simulation results.
+    def get_profile(self, time_step):
+        """Read profile data from simulation results.
 
-    #     Parameters
-    #     ----------
-    #     time_step : int
-    #         Time step number.
+        Parameters
+        ----------
+        time_step : int
+            Time step number.
 
-    #     Returns
-    #     -------
-    #     t, x, u, lamda, omega: array_like
-    #         Time, grid, velocity, reaction progress variable, reaction rate,
-    #         respectively.
+        Returns
+        -------
+        t : float
+            Simulation time of the profile.
+        x, u, lamda : ndarray
+            Grid, velocity, reaction progress variable, respectively.
 
-    #     """
-    #     fn = 'profile-' + str(time_step) + '.txt'
-    #     full_fn = os.path.join(results_dir, 'profiles', fn)
+        """
+        t, x, u, lamda = self.get_profiles([time_step])
 
-    #     with open(full_fn, 'r') as f:
-    #         for line in f:
-    #             if line.startswith('# time '):
-    #                 chunks = line.split()
-    #                 t = float(chunks[2].strip())
+        return t[0], x, u[0], lamda[0]
 
-    #     data = np.genfromtxt(full_fn)
-    #     x = data[3:, 0]
-    #     u = data[3:, 1]
-    #     lamda = data[3:, 2]
-    #     omega = np.zeros_like(lamda)
-    #     print('Hardcoded stripping off of ghost points on the left boundary')
+    def get_profiles(self, time_steps=None):
+        """Read several profiles at once.
 
-    #     # config_filename = os.path.join(results_dir, 'config.ini')
-    #     # c = Config(config_filename)
-    #     # q = c.q
-    #     # k = computed_values['k']
-    #     # theta = k * np.exp * (theta * (u + q * lamda))
-    #     # omega =
+        Parameters
+        ----------
+        time_steps : array_like of int, optional
+            Time step numbers of the profiles. If None, all profiles are read.
+
+        Returns
+        -------
+        t : ndarray
+            Simulation times of the profiles.
+        x : ndarray
+            Grid.
+        u, lamda : ndarray
+            Velocity and reaction progress variable, respectively, as arrays
+            of shape (n_profiles, n_grid).
 
-    #     return t, x, u, lamda, omega
+        """
+        fn = os.path.join(self._results_dir, 'profiles.h5')
 
+        with self._open(fn) as fh:
+            x = fh['x'][:]
 
-    # def get_final_profile(self):
-    #     """Read final profile data from simulation results.
+            if time_steps is None:
+                t = fh['time'][:]
+                u = fh['u'][:]
+                lamda = fh['lamda'][:]
+            else:
+                rows = self._find_profile_rows(fh['time_step'][:],
+                                               time_steps)
+                # HDF5 point selections must be strictly increasing,
+                # hence, unique rows are read and then put in the order
+                # of the requested time steps.
+                unique_rows, inverse = np.unique(rows, return_inverse=True)
+                t = fh['time'][unique_rows][inverse]
+                u = fh['u'][unique_rows][inverse]
+                lamda = fh['lamda'][unique_rows][inverse]
 
-    #     Returns
-    #     -------
-    #     t : float
-    #         Simulation time for the final profile.
-    #     x, u, lamda, omega : array_like
-    #         Grid, velocity, reaction progress variable, reaction rate.
+        return t, x, u, lamda
 
-    #     """
-    #     last_time_step = get_final_profile_time_step(results_dir)
+    def _find_profile_rows(self, all_time_steps, time_steps):
+        time_steps = np.asarray(time_steps, dtype=np.int64)
+        rows = np.searchsorted(all_time_steps, time_steps)
 
-    #     return get_profile(results_dir, last_time_step)
+        found = rows < len(all_time_steps)
+        found[found] = all_time_steps[rows[found]] == time_steps[found]
 
-    # def get_profiles_time_steps(self):
-    #     """Return a sorted array of time steps for which profiles were written.
+        if not np.all(found):
+            raise ASCIIReaderError(
+                'Profiles for time steps {} are not found'.format(
+                    time_steps[~found]))
 
-    #     Precisely, profiles subdirectory of the `results_dir` is read and time
-    #     steps of the profiles that were written during simulation are returned.
+        return rows
 
-    #     Parameters
-    #     ----------
-    #     results_dir : str
-    #         Path to the directory with simulation results.
+    def get_final_profile(self):
+        """Read final profile data from simulation results.
 
-    #     Returns
-    #     -------
-    #     time_steps : ndarray of int
-    #         Sorted array of the time steps for which profiles were saved during
-    #         simulation.
+        Returns
+        -------
+        t : float
+            Simulation time for the final profile.
+        x, u, lamda : ndarray
+            Grid, velocity, reaction progress variable.
 
-    #     """
-    #     profiles_dir = os.path.join(results_dir, 'profiles')
+        """
+        last_time_step = self.get_final_profile_time_step()
 
-    #     files_list = os.listdir(profiles_dir)
+        return self.get_profile(last_time_step)
 
-    #     time_steps = []
+    def get_profiles_time_steps(self):
+        """Return a sorted array of time steps for which profiles were written.
 
-    #     for i, d in enumerate(files_list):
-    #         ts = int(d.lstrip('profile-').rstrip('.txt'))
-    #         time_steps.append(ts)
+        Returns
+        -------
+        time_steps : ndarray of int
+            Sorted array of the time steps for which profiles were saved during
+            simulation.
 
-    #     time_steps.sort()
+        """
+        fn = os.path.join(self._results_dir, 'profiles.h5')
 
-    #     return np.array(time_steps, dtype=np.int)
+        with self._open(fn) as fh:
+            time_steps = fh['time_step'][:]
 
+        return time_steps
 
-    def get_final_profile_time_step(results_dir):
+    def get_final_profile_time_step(self):
         """Return time step of the final profile generated during simulation.
 
         This profile always exists, because it is written in the end of the
         simulation unconditionally.
 
-        Parameters
-        ----------
-        results_dir : str
-            Path to the directory with simulation results.
-
         Returns
         -------
         int
@@ -200,7 +287,10 @@ class HDF5Reader(object):
     def get_znd_data(self):
         if self._znd_data is None:
             filename = os.path.join(self._results_dir, 'znd-solution.txt')
-            self._znd_data = np.loadtxt(filename)
+            if self._cache:
+                self._znd_data = read_table_cached(filename)
+            else:
+                self._znd_data = read_table(filename)
 
         result = {
             'x': self._znd_data[:, 0],
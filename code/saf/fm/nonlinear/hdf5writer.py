@@ -8,6 +8,9 @@ try:
 except ImportError:
     raise Exception('Cannot import h5py module')
 
+from saf.util.checkpoint import save_checkpoint as write_checkpoint
+from saf.util.extrema import ExtremaTracker
+
 from .solution import Solution
 
 
@@ -24,36 +27,125 @@ class HDF5Writer(object):
         ZND solution.
     outdir : str
         Path to the directory to which simulation results should be written.
+    checkpoint : dict, optional
+        Checkpoint returned by `saf.util.checkpoint.load_checkpoint`.
+        If given, the output of the simulation restarted from this checkpoint
+        is appended to the existing output in `outdir`, which is truncated
+        to the state at the checkpoint.
+        The solver should continue from the time step next to the time step
+        of the checkpoint.
 
     """
 
-    def __init__(self, config, grid, dx, znd, outdir):
+    def __init__(self, config, grid, dx, znd, outdir, checkpoint=None):
         self._logger = logging.getLogger(__name__)
         self._config = config
         self._grid = grid
         self._dx = dx
         self._znd = znd
 
+        self._output_step = config.output_step
+        # Time accumulated by the solver has round-off errors, hence,
+        # the start time is compared with the tolerance of half a time step.
+        self._output_start_time = config.output_start_time
+        if config.dt:
+            self._output_start_time -= 0.5 * config.dt
+
+        self._extrema_tracker = None
+        if config.extrema_order > 0:
+            self._extrema_tracker = ExtremaTracker(
+                order=config.extrema_order,
+                start_time=config.extrema_start_time)
+
+        self._checkpoint_every = config.checkpoint_every
+
         self._output = outdir
-        self._profiles_path = self._output + '/profiles'
 
         if not os.path.isdir(self._output):
             os.mkdir(self._output)
 
-        if not os.path.isdir(self._profiles_path):
-            os.mkdir(self._profiles_path)
+        self._counter = 0
+        self._buffer_size = 1000
+        self._buffer = np.empty((self._buffer_size, 2))
+
+        # File with profiles is created when the first profile is saved.
+        self._file_profiles = None
+        self._last_profile_time_step = None
 
         filename_det_vel = os.path.join(self._output, 'detonation-velocity.h5')
-        self._file_det_vel = h5py.File(filename_det_vel, 'w')
 
-        self._det_vel_dataset = self._file_det_vel.create_dataset(
-            'detonation-velocity', dtype=np.float64,
-            shape=(1000, 2), maxshape=(None, 2),
-            chunks=(1000, 2), compression='gzip')
+        if checkpoint is None:
+            self._file_det_vel = h5py.File(filename_det_vel, 'w')
 
-        self._counter = 0
-        self._buffer_size = 1000
-        self._buffer = np.empty((self._buffer_size, 2))
+            self._det_vel_dataset = self._file_det_vel.create_dataset(
+                'detonation-velocity', dtype=np.float64,
+                shape=(1000, 2), maxshape=(None, 2),
+                chunks=(1000, 2), compression='gzip')
+        else:
+            self._file_det_vel = h5py.File(filename_det_vel, 'r+')
+            self._det_vel_dataset = self._file_det_vel['detonation-velocity']
+            self._resume(checkpoint)
+
+    def _resume(self, checkpoint):
+        buffer_size = self._buffer_size
+        dset = self._det_vel_dataset
+
+        # Restore the buffer with the incomplete block of rows and
+        # discard the rows written after the checkpoint.
+        self._counter = int(checkpoint['det_vel_rows'])
+        idx_1 = self._counter - self._counter % buffer_size
+        self._buffer[:self._counter - idx_1] = dset[idx_1:self._counter]
+        dset.resize(idx_1 + buffer_size, axis=0)
+
+        nprofiles = int(checkpoint['profile_rows'])
+        if nprofiles > 0:
+            filename = os.path.join(self._output, 'profiles.h5')
+            fh = h5py.File(filename, 'r+')
+            for name in ['time', 'time_step', 'u', 'lamda']:
+                fh[name].resize(nprofiles, axis=0)
+            self._last_profile_time_step = int(fh['time_step'][-1])
+            self._file_profiles = fh
+
+        if self._extrema_tracker is not None:
+            self._extrema_tracker.set_state({
+                'maxima': checkpoint['extrema_maxima'],
+                'minima': checkpoint['extrema_minima'],
+                'pending': checkpoint['extrema_pending'],
+            })
+
+    def save_checkpoint(self, time_step, time, soln_data):
+        """Save the state of the simulation to `checkpoint.npz`.
+
+        All output is flushed to disk before the checkpoint is written.
+
+        """
+        buffer_size = self._buffer_size
+        dset = self._det_vel_dataset
+
+        # Write the incomplete block of rows. It is kept in the buffer and
+        # is written again when the block is complete.
+        idx_1 = self._counter - self._counter % buffer_size
+        dset[idx_1:self._counter, :] = self._buffer[:self._counter - idx_1]
+        self._file_det_vel.flush()
+
+        nprofiles = 0
+        if self._file_profiles is not None:
+            self._file_profiles.flush()
+            nprofiles = self._file_profiles['time'].shape[0]
+
+        state = {
+            'time_step': time_step,
+            'time': time,
+            'soln_data': soln_data,
+            'det_vel_rows': self._counter,
+            'profile_rows': nprofiles,
+        }
+
+        if self._extrema_tracker is not None:
+            for key, value in self._extrema_tracker.get_state().items():
+                state['extrema_' + key] = value
+
+        write_checkpoint(self._output, state)
 
     def save_configuration(self):
         self._config.copy_to_output(self._output)
@@ -87,19 +179,49 @@ class HDF5Writer(object):
         np.savetxt(filename, data, fmt='%24.16e', header=header)
 
     def save(self, time_step, time, soln_data):
+        if self._extrema_tracker is not None:
+            self._extrema_tracker.append(time, soln_data[-1])
+
         self.save_detonation_speed(time_step, time, soln_data)
 
-        if self._config.plot_time_step == 0:
-            return
+        if self._config.plot_time_step != 0:
+            if time_step % self._config.plot_time_step == 0:
+                self.save_profile(time_step, time, soln_data)
 
-        if time_step % self._config.plot_time_step == 0:
-            self.save_profile(time_step, time, soln_data)
+            # Output profiles if we reached the end of simulation.
+            if time == self._config.final_time:
+                self.save_profile(time_step, time, soln_data, force=True)
 
-        # Output profiles if we reached the end of simulation.
-        if time == self._config.final_time:
-            self.save_profile(time_step, time, soln_data, force=True)
+        if (self._checkpoint_every > 0 and
+                time_step % self._checkpoint_every == 0):
+            self.save_checkpoint(time_step, time, soln_data)
+
+    def needs_solution(self, time_step, time):
+        """Check if `save` uses more of the solution than its last value.
+
+        At other time steps, only detonation velocity, the last value of
+        the solution, is written.
+
+        """
+        plot_time_step = self._config.plot_time_step
+        if plot_time_step != 0 and (time_step % plot_time_step == 0 or
+                                    time == self._config.final_time):
+            return True
+
+        return (self._checkpoint_every > 0 and
+                time_step % self._checkpoint_every == 0)
+
+    def _is_output_time_step(self, time_step, time):
+        """Check if detonation velocity is written at this time step."""
+        if time < self._output_start_time:
+            return False
+
+        return time_step % self._output_step == 0
 
     def save_detonation_speed(self, time_step, time, soln_data):
+        if not self._is_output_time_step(time_step, time):
+            return
+
         det_speed = soln_data[-1]
         buffer_size = self._buffer_size
         _buffer = self._buffer
@@ -116,21 +238,68 @@ class HDF5Writer(object):
         self._counter += 1
 
     def save_profile(self, time_step, time, soln_data, force=False):
-        if force:
-            profile_filename = '/profile-' + str(time_step) + '.txt'
-            profile_filename = self._profiles_path + profile_filename
-            h1 = 'Columns: x, rho, u, p, lamda'
-            h2 = 'time_step {}\n'.format(time_step)
-            h3 = 'time {0:24.16e}'.format(time)
-            header = h1 + h2 + h3
-            data = np.empty((len(self._grid), 3))
-            solution = Solution(soln_data)
-            data[:, 0] = self._grid
-            data[:, 1] = solution.u
-            data[:, 2] = solution.lamda
-            np.savetxt(profile_filename, data, fmt='%24.16e', header=header)
+        """Append profiles of the solution to the file `profiles.h5`.
+
+        Profiles of all fields are stored in two-dimensional datasets
+        `u` and `lamda` of shape (n_profiles, n_grid) that are extended
+        by one row per snapshot.
+        Datasets `time` and `time_step` index the rows, and dataset `x`
+        stores the grid.
+
+        """
+        if self._last_profile_time_step == time_step:
+            # The final profile was already saved as a regular one.
+            return
+
+        if self._file_profiles is None:
+            self._create_profiles_file()
+
+        fh = self._file_profiles
+        solution = Solution(soln_data)
+        n = fh['time'].shape[0]
+
+        for name, value in [('time', time), ('time_step', time_step),
+                            ('u', solution.u), ('lamda', solution.lamda)]:
+            dset = fh[name]
+            dset.resize(n + 1, axis=0)
+            dset[n] = value
+
+        self._last_profile_time_step = time_step
+
+    def _create_profiles_file(self):
+        filename = os.path.join(self._output, 'profiles.h5')
+        fh = h5py.File(filename, 'w')
+        npoints = len(self._grid)
+
+        # Chunks of about 128 KiB hold several consecutive profiles, so that
+        # compression works over the time dimension as well and a single
+        # profile is read by decompressing one chunk.
+        rows_per_chunk = max(1, 2**17 // (8 * npoints))
+
+        fh.create_dataset('x', data=self._grid)
+
+        for name in ['u', 'lamda']:
+            fh.create_dataset(
+                name, dtype=np.float64,
+                shape=(0, npoints), maxshape=(None, npoints),
+                chunks=(rows_per_chunk, npoints), compression='gzip',
+                shuffle=True)
+
+        fh.create_dataset('time', dtype=np.float64, shape=(0,),
+                          maxshape=(None,), chunks=(1024,))
+        fh.create_dataset('time_step', dtype=np.int64, shape=(0,),
+                          maxshape=(None,), chunks=(1024,))
+
+        self._file_profiles = fh
+
+    def _save_extrema(self):
+        if self._extrema_tracker is not None:
+            filename = os.path.join(self._output, 'extrema.npz')
+            self._extrema_tracker.save(filename)
 
     def close(self):
+        self._save_extrema()
+
         buffer_size = self._buffer_size
         _buffer = self._buffer
         dset = self._det_vel_dataset
@@ -144,3 +313,6 @@ class HDF5Writer(object):
             dset.resize(self._counter, axis=0)
 
         self._file_det_vel.close()
+
+        if self._file_profiles is not None:
+            self._file_profiles.close()
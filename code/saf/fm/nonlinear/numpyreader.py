@@ -1,7 +1,12 @@
 """Description of the class fickettmodel.euler1d.linear.asciireader."""
-import numpy as np
 import os
 
+import numpy as np
+
+from saf.util import find_time_window
+from saf.util.npyio import load_npz_mmap
+from saf.util.timewindow import get_time
+
 from .asciireader import ASCIIReader
 
 
@@ -9,11 +14,21 @@ class NumpyReader(ASCIIReader):
     """Read the results of the simulation.
 
     Works with the results written in Numpy format.
+    The time of the series can be stored explicitly or implicitly
+    (see the option `implicit_time` of the configuration), in the latter
+    case it is computed only for the requested window.
 
     """
-    def get_time_and_detonation_velocity(self):
+    def get_time_and_detonation_velocity(self, t_start=None, t_end=None):
         """Read detonation velocity vs time from simulation results.
 
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
         Returns
         -------
         t: ndarray
@@ -22,9 +37,39 @@ class NumpyReader(ASCIIReader):
             Array with detonation velocity data.
 
         """
+        t, d, window = self._read(t_start, t_end)
+
+        return np.array(t[window]), np.array(d[window])
+
+    def get_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity from simulation results.
+
+        If the time is stored implicitly, it is never computed.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        d: ndarray
+            Array with detonation velocity data.
+
+        """
+        __, d, window = self._read(t_start, t_end)
+
+        return np.array(d[window])
+
+    def _read(self, t_start, t_end):
         fn = os.path.join(self._results_dir, 'detonation-velocity.npz')
-        data = np.load(fn)
-        t = data['t']
+        data = load_npz_mmap(fn)
+        t = get_time(data)
         d = data['d']
 
-        return t, d
+        # Only the window is read from disk as the arrays are memory-mapped.
+        window = find_time_window(t, t_start, t_end)
+
+        return t, d, window
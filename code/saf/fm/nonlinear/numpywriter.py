@@ -1,15 +1,25 @@
 import os
+import tempfile
 
 import numpy as np
 
-from .asciiwriter import ASCIIWriter
-from .solution import Solution
+from .npywriter import NpyWriter
 
 
-class NumpyWriter(ASCIIWriter):
+class NumpyWriter(NpyWriter):
     """Writer of the simulation output for linear Fickett--Faria model.
 
     This writer writes simulation data in the Numpy format [1]_.
+    The time series of detonation velocity is streamed to disk as raw
+    float64 blocks in the same way as by `NpyWriter`, so that a killed
+    simulation leaves `detonation-velocity.npy` with the series computed
+    so far.
+    In `close`, the series is copied to `detonation-velocity.npz` and the
+    `.npy` file is removed.
+    If the option `implicit_time` is set, the times of the series are stored
+    implicitly as the initial time `t0`, the interval `dt` between outputs
+    and the number of values `n`, which halves the size of the file.
+    All other output is written in the same way as by `ASCIIWriter`.
 
     References
     ----------
@@ -17,11 +27,51 @@ class NumpyWriter(ASCIIWriter):
 
     """
 
+    def _open_detonation_velocity_file(self):
+        super()._open_detonation_velocity_file()
+        self._npy_filename = self._filename
+        self._filename = os.path.join(self._output, 'detonation-velocity.npz')
+
+    def _resume_detonation_velocity_file(self, checkpoint):
+        super()._resume_detonation_velocity_file(checkpoint)
+        self._npy_filename = self._filename
+        self._filename = os.path.join(self._output, 'detonation-velocity.npz')
+
     def close(self):
-        super(NumpyWriter, self).close()
+        self._save_extrema()
+
+        self._det_vel_appender.close()
+        data = np.load(self._npy_filename, mmap_mode='r')
+
+        # The `.npy` file is removed only after the final file is complete.
+        fd, tmp_filename = tempfile.mkstemp(dir=self._output, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._save_detonation_velocity(f, data)
+            os.replace(tmp_filename, self._filename)
+        except BaseException:
+            os.remove(tmp_filename)
+            raise
+
+        # The memory map must be released before the file is removed.
+        del data
+        os.remove(self._npy_filename)
+
+    def _save_detonation_velocity(self, f, data):
+        t, d = data[:, 0], data[:, 1]
+        arrays = {'t': t, 'd': d}
+
+        if self._config.implicit_time and len(t) > 0:
+            dt = self._config.dt * self._output_step
+            t_uniform = t[0] + dt * np.arange(len(t))
 
-        npz_filename = os.path.join(self._output, 'detonation-velocity.npz')
-        t, d = np.loadtxt(self._filename, unpack=True)
+            # Time accumulated by the solver has round-off errors, hence,
+            # the times are compared with a tolerance that is much smaller
+            # than the interval between outputs but larger than the errors.
+            if np.all(np.abs(t - t_uniform) <= 1e-3 * dt):
+                arrays = {'d': d, 't0': t[0], 'dt': dt, 'n': len(d)}
+            else:
+                self._logger.warning('Output times are not uniform, the '
+                                     'time is stored explicitly')
 
-        np.savez(npz_filename, t=t, d=d)
-        os.remove(self._filename)
+        np.savez(f, **arrays)
@@ -0,0 +1,136 @@
+"""Read the results of the simulation stored in a tar archive."""
+import io
+
+import numpy as np
+
+from saf.util.tararchive import TarArchive
+from saf.util.textio import read_table
+from saf.util.timewindow import find_series_window, get_time
+
+
+class TarReader(object):
+    """Read the results of the simulation from a tar archive.
+
+    Works with the results written in Numpy or text format and then packed
+    into a tar archive. Only the requested files are read from the archive,
+    it is never extracted.
+
+    Parameters
+    ----------
+    results_dir : str
+        Path to the directory with simulation results inside the archive.
+    archive : str or TarArchive
+        Path to the archive or an open archive, which can be shared between
+        readers to avoid loading its index more than once.
+
+    """
+    def __init__(self, results_dir, archive):
+        if not isinstance(archive, TarArchive):
+            archive = TarArchive(archive)
+
+        if not archive.isdir(results_dir):
+            raise ValueError('Directory `{}` is not found in archive `{}`'
+                             .format(results_dir, archive.filename))
+
+        self._results_dir = results_dir.rstrip('/')
+        self._archive = archive
+
+    def get_computed_values(self):
+        content = self._read('computed-values.txt').decode('utf-8')
+        result = {}
+
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            chunks = line.split('=')
+            par = chunks[0].strip()
+            val = chunks[1].strip()
+            if par not in ['reaction_length', 'k', 'd_cj', 'd_znd']:
+                raise Exception('Unknown parameter name')
+            result[par] = float(val)
+
+        return result
+
+    def get_time_and_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity vs time from simulation results.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        t: ndarray
+            Array with time data.
+        d: ndarray
+            Array with detonation velocity data.
+
+        """
+        arrays, window = self._read_series(t_start, t_end)
+        t = get_time(arrays)
+
+        return np.array(t[window]), np.array(arrays['d'][window])
+
+    def get_time_and_normalized_detonation_velocity(self, t_start=None,
+                                                    t_end=None):
+        """Read detonation velocity vs time from simulation results.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        t: ndarray
+            Array with time data.
+        d_normalized: ndarray
+            Array with normalized detonation velocity data.
+
+        """
+        comp_vals = self.get_computed_values()
+        t, d = self.get_time_and_detonation_velocity(
+            t_start=t_start, t_end=t_end)
+        d_normalized = (comp_vals['d_znd'] + d) / comp_vals['d_znd']
+
+        return t, d_normalized
+
+    def get_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity from simulation results.
+
+        If no window is given, the time is not read from `.npz` files.
+
+        """
+        arrays, window = self._read_series(t_start, t_end, with_time=False)
+
+        return np.array(arrays['d'][window])
+
+    def _read_series(self, t_start, t_end, with_time=True):
+        name_npz = self._get_name('detonation-velocity.npz')
+        name_txt = self._get_name('detonation-velocity.txt')
+
+        if name_npz in self._archive:
+            keys = None
+            if not with_time and t_start is None and t_end is None:
+                keys = ['d']
+            arrays = self._archive.load_npz(name_npz, keys)
+        elif name_txt in self._archive:
+            # A text file is parsed as a whole, so the time is always read.
+            data = read_table(io.BytesIO(self._archive.read(name_txt)))
+            arrays = {'t': data[:, 0], 'd': data[:, 1]}
+        else:
+            raise ValueError('There is no time series of detonation velocity '
+                             'in `{}`'.format(self._results_dir))
+
+        return arrays, find_series_window(arrays, t_start, t_end)
+
+    def _get_name(self, filename):
+        return self._results_dir + '/' + filename
+
+    def _read(self, filename):
+        return self._archive.read(self._get_name(filename))
@@ -3,6 +3,11 @@ import shutil
 
 from configparser import ConfigParser
 
+from saf.util import configcodec
+
+# Version of the dictionary representation of configurations.
+DICT_VERSION = 1
+
 
 class Config(object):
     """Base configuration class for linear simulations.
@@ -24,6 +29,7 @@ class Config(object):
             'plot_time_step': None,
             'play_animation': False,
             'extend': True,
+            'io_format': 'ascii',
         }
         self._config_filename = None
         self._config_string = None
@@ -169,6 +175,31 @@ class Config(object):
         else:
             raise Exception('Unknown value for `play_animation`')
 
+    @property
+    def io_format(self):
+        """
+        Format in which the time series of detonation velocity is written:
+        * ascii - text file `detonation-velocity.txt`
+        * numpy - compressed Numpy archive `detonation-velocity.npz`
+        * npy   - raw Numpy array `detonation-velocity.npy` that can be
+                  memory-mapped
+        * hdf5  - HDF5 file `detonation-velocity.h5`
+        * delta - file `detonation-velocity.dz` compressed losslessly
+                  with `saf.util.deltacodec`
+
+        """
+        return self._options['simulation']['io_format']
+
+    @io_format.setter
+    def io_format(self, value):
+        choices = ['ascii', 'numpy', 'npy', 'hdf5', 'delta']
+
+        if value in choices:
+            self._options['simulation']['io_format'] = value
+        else:
+            raise ValueError('Parameter `io_format` has incorrect value. '
+                             'Correct values: {}'.format(choices))
+
     @property
     def extend(self):
         """Specify if solution can be extended.
@@ -207,6 +238,62 @@ class Config(object):
 
         self._process_parser(cp)
 
+    def to_dict(self):
+        """Return the configuration as a dictionary.
+
+        The dictionary contains only built-in types, such that it can be
+        sent between processes or serialized without pickling.
+        It is versioned and can be converted back with `from_dict`.
+
+        """
+        cls = type(self)
+        options = {section: configcodec.to_builtin(values)
+                   for section, values in self._options.items()}
+
+        return {
+            'version': DICT_VERSION,
+            'class': cls.__module__ + '.' + cls.__name__,
+            'options': options,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a configuration from the dictionary returned by `to_dict`.
+
+        Options are assigned through the properties, hence, they are
+        validated in the same way as when they are read from a file.
+
+        """
+        if data.get('version') != DICT_VERSION:
+            raise ValueError('Unsupported version {} of configuration'
+                             .format(data.get('version')))
+
+        c = cls()
+        for section, values in data['options'].items():
+            c._options.setdefault(section, {})
+            for name, value in values.items():
+                prop = getattr(cls, name, None)
+                if value is not None and isinstance(prop, property):
+                    setattr(c, name, value)
+                else:
+                    c._options[section][name] = value
+
+        return c
+
+    def to_bytes(self):
+        """Return the configuration as compact bytes.
+
+        Equal configurations give equal bytes, so the result can be used as
+        a key of caches. See `saf.util.configcodec`.
+
+        """
+        return configcodec.encode(self.to_dict())
+
+    @classmethod
+    def from_bytes(cls, buf):
+        """Create a configuration from the bytes returned by `to_bytes`."""
+        return cls.from_dict(configcodec.decode(buf))
+
     def _process_parser(self, cp):
         sim_params = cp['simulation']
         self.n12 = int(sim_params['n12'])
@@ -218,6 +305,8 @@ class Config(object):
         self.plot_time_step = int(sim_params['plot_time_step'])
         if 'play_animation' in sim_params:
             self.play_animation = sim_params['play_animation']
+        if 'io_format' in sim_params:
+            self.io_format = sim_params['io_format']
 
     def copy_to_output(self, outdir):
         self._validate()
@@ -272,6 +361,9 @@ class Config(object):
             '; Whether animation should be played during simulation. Default value is False.',
             'play_animation = {}'.format(self.play_animation),
             '',
+            '; Input-output format.',
+            'io_format = {}'.format(self.io_format),
+            '',
         ]
 
         return '\n'.join(lines)
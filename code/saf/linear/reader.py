@@ -3,6 +3,9 @@ import os
 
 import numpy as np
 
+from saf.util import find_time_window
+from saf.util.textio import read_table_window
+
 _hdf5_enabled = False
 
 try:
@@ -30,33 +33,59 @@ class Reader(object):
 
         self._results_dir = results_dir
 
-    def get_time_and_detonation_velocity(self):
+    def get_time_and_detonation_velocity(self, t_start=None, t_end=None):
+        """Read detonation velocity vs time from simulation results.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            If given, only the data with `t >= t_start` are returned.
+        t_end : float, optional
+            If given, only the data with `t <= t_end` are returned.
+
+        Returns
+        -------
+        t: ndarray
+            Array with time data
+        d: ndarray
+            Array with detonation velocity data
+
+        """
         det_vel_file_ascii = os.path.join(self._results_dir,
                                           'detonation-velocity.txt')
         det_vel_file_numpy = os.path.join(self._results_dir,
                                           'detonation-velocity.npz')
+        det_vel_file_npy = os.path.join(self._results_dir,
+                                        'detonation-velocity.npy')
         det_vel_file_hdf5 = os.path.join(self._results_dir,
                                          'detonation-velocity.h5')
 
         if os.path.exists(det_vel_file_ascii):
-            data = np.genfromtxt(det_vel_file_ascii)
+            data = read_table_window(det_vel_file_ascii, t_start, t_end)
             assert(data.shape[1] == 2), \
                 'Detonation velocity file must have two columns'
-            t = data[:, 0]
-            d = data[:, 1]
+            return data[:, 0], data[:, 1]
         elif os.path.exists(det_vel_file_numpy):
             data = np.load(det_vel_file_numpy)
             t = data['t']
             d = data['d']
+        elif os.path.exists(det_vel_file_npy):
+            data = np.load(det_vel_file_npy, mmap_mode='r')
+            t = data[:, 0]
+            d = data[:, 1]
         elif os.path.exists(det_vel_file_hdf5):
-            fh = h5py.File(det_vel_file_hdf5, 'r')
+            with h5py.File(det_vel_file_hdf5, 'r') as fh:
+                dset = fh['detonation-velocity']
+                window = find_time_window(dset, t_start, t_end, column=0)
+                data = dset[window]
 
-            t = fh['detonation-velocity'][:, 0]
-            d = fh['detonation-velocity'][:, 1]
+            return data[:, 0], data[:, 1]
         else:
             raise Exception('Unknown format')
 
-        return t, d
+        window = find_time_window(t, t_start, t_end)
+
+        return t[window], d[window]
 
     @property
     def outdir(self):
@@ -1,8 +1,14 @@
+import numbers
 import os
 import shutil
 
 from configparser import ConfigParser
 
+from saf.util import configcodec
+
+# Version of the dictionary representation of configurations.
+DICT_VERSION = 1
+
 
 class Config(object):
     """Base configuration class for nonlinear simulations.
@@ -28,7 +34,14 @@ class Config(object):
             'time_integrator': None,
             'plot_time_step': None,
             'play_animation': False,
-            'io_format': 'ascii'
+            'io_format': 'ascii',
+            'output_every': 1,
+            'output_interval': 0.0,
+            'output_start_time': 0.0,
+            'extrema_order': 0,
+            'extrema_start_time': 0.0,
+            'checkpoint_every': 0,
+            'implicit_time': False,
         }
         self._config_filename = None
         self._config_string = None
@@ -184,11 +197,22 @@ class Config(object):
 
     @property
     def io_format(self):
+        """
+        Format in which the time series of detonation velocity is written:
+        * ascii - text file `detonation-velocity.txt`
+        * numpy - compressed Numpy archive `detonation-velocity.npz`
+        * npy   - raw Numpy array `detonation-velocity.npy` that can be
+                  memory-mapped
+        * hdf5  - HDF5 file `detonation-velocity.h5`
+        * delta - file `detonation-velocity.dz` compressed losslessly
+                  with `saf.util.deltacodec`
+
+        """
         return self._options['simulation']['io_format']
 
     @io_format.setter
     def io_format(self, value):
-        choices = ['ascii', 'numpy', 'hdf5']
+        choices = ['ascii', 'numpy', 'npy', 'hdf5', 'delta']
 
         if value in choices:
             self._options['simulation']['io_format'] = value
@@ -196,6 +220,158 @@ class Config(object):
             raise ValueError('Parameter `io_format` has incorrect value. '
                              'Correct values: {}'.format(choices))
 
+    @property
+    def output_every(self):
+        """
+        Number of time steps between consecutive outputs of detonation
+        velocity.
+        Optional parameter.
+        If not specified, detonation velocity is written at every time step.
+        Ignored if `output_interval` is given.
+
+        """
+        return self._options['simulation']['output_every']
+
+    @output_every.setter
+    def output_every(self, value):
+        if (isinstance(value, bool) or
+                not isinstance(value, numbers.Integral)):
+            raise Exception('Parameter `output_every` must be an integer')
+
+        if not value > 0:
+            raise Exception('Parameter `output_every` must be positive')
+
+        self._options['simulation']['output_every'] = int(value)
+
+    @property
+    def output_interval(self):
+        """
+        Time interval between consecutive outputs of detonation velocity,
+        which is rounded to a whole number of time steps.
+        Optional parameter.
+        If zero or not specified, `output_every` is used.
+
+        """
+        return self._options['simulation']['output_interval']
+
+    @output_interval.setter
+    def output_interval(self, value):
+        if not float(value) >= 0.0:
+            raise Exception('Invalid argument value')
+
+        self._options['simulation']['output_interval'] = float(value)
+
+    @property
+    def output_step(self):
+        """
+        Number of time steps between consecutive outputs of detonation
+        velocity computed from `output_every` and `output_interval`.
+
+        """
+        if self.output_interval > 0:
+            return max(1, int(round(self.output_interval / self.dt)))
+
+        return self.output_every
+
+    @property
+    def output_start_time(self):
+        """
+        Time from which detonation velocity is written.
+        Optional parameter.
+        If not specified, detonation velocity is written from the beginning
+        of the simulation.
+        Use it to skip the transient when only late-time behavior matters.
+
+        """
+        return self._options['simulation']['output_start_time']
+
+    @output_start_time.setter
+    def output_start_time(self, value):
+        if not float(value) >= 0.0:
+            raise Exception('Invalid argument value')
+
+        self._options['simulation']['output_start_time'] = float(value)
+
+    @property
+    def extrema_order(self):
+        """
+        Order of local extrema of detonation velocity that are detected
+        during simulation and written to `extrema.npz`, that is, the number
+        of values on each side of an extremum to compare with
+        (see `saf.util.extrema.ExtremaTracker`).
+        Optional parameter.
+        If zero or not specified, extrema are not detected.
+
+        """
+        return self._options['simulation']['extrema_order']
+
+    @extrema_order.setter
+    def extrema_order(self, value):
+        if not isinstance(value, int) or value < 0:
+            raise Exception('Invalid argument value')
+
+        self._options['simulation']['extrema_order'] = value
+
+    @property
+    def extrema_start_time(self):
+        """
+        Time from which local extrema of detonation velocity are detected.
+        Optional parameter.
+        If not specified, extrema are detected from the beginning of the
+        simulation.
+
+        """
+        return self._options['simulation']['extrema_start_time']
+
+    @extrema_start_time.setter
+    def extrema_start_time(self, value):
+        if not float(value) >= 0.0:
+            raise Exception('Invalid argument value')
+
+        self._options['simulation']['extrema_start_time'] = float(value)
+
+    @property
+    def checkpoint_every(self):
+        """
+        Number of time steps between checkpoints, from which the simulation
+        can be restarted (see `saf.util.checkpoint`).
+        Optional parameter.
+        If zero or not specified, checkpoints are not written.
+
+        """
+        return self._options['simulation']['checkpoint_every']
+
+    @checkpoint_every.setter
+    def checkpoint_every(self, value):
+        if not isinstance(value, int) or value < 0:
+            raise Exception('Invalid argument value')
+
+        self._options['simulation']['checkpoint_every'] = value
+
+    @property
+    def implicit_time(self):
+        """
+        Specify whether the time of the time series of detonation velocity
+        is stored implicitly, that is, only its initial value `t0`,
+        the interval `dt` between outputs and the number of values `n`
+        are stored instead of the time column.
+        Optional parameter.
+        It is used only with the `numpy` format; if the output times turn out
+        to be not uniform, the time column is stored anyway.
+        If not specified, the time column is stored.
+
+        """
+        return self._options['simulation']['implicit_time']
+
+    @implicit_time.setter
+    def implicit_time(self, value):
+        if value in ['true', 'True', 1]:
+            self._options['simulation']['implicit_time'] = True
+        elif value in ['false', 'False', 0]:
+            self._options['simulation']['implicit_time'] = False
+        else:
+            raise Exception('Unknown value for `implicit_time`')
+
     @property
     def extend(self):
         """Specify if solution can be extended.
@@ -234,6 +410,62 @@ class Config(object):
 
         self._process_parser(cp)
 
+    def to_dict(self):
+        """Return the configuration as a dictionary.
+
+        The dictionary contains only built-in types, such that it can be
+        sent between processes or serialized without pickling.
+        It is versioned and can be converted back with `from_dict`.
+
+        """
+        cls = type(self)
+        options = {section: configcodec.to_builtin(values)
+                   for section, values in self._options.items()}
+
+        return {
+            'version': DICT_VERSION,
+            'class': cls.__module__ + '.' + cls.__name__,
+            'options': options,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a configuration from the dictionary returned by `to_dict`.
+
+        Options are assigned through the properties, hence, they are
+        validated in the same way as when they are read from a file.
+
+        """
+        if data.get('version') != DICT_VERSION:
+            raise ValueError('Unsupported version {} of configuration'
+                             .format(data.get('version')))
+
+        c = cls()
+        for section, values in data['options'].items():
+            c._options.setdefault(section, {})
+            for name, value in values.items():
+                prop = getattr(cls, name, None)
+                if value is not None and isinstance(prop, property):
+                    setattr(c, name, value)
+                else:
+                    c._options[section][name] = value
+
+        return c
+
+    def to_bytes(self):
+        """Return the configuration as compact bytes.
+
+        Equal configurations give equal bytes, so the result can be used as
+        a key of caches. See `saf.util.configcodec`.
+
+        """
+        return configcodec.encode(self.to_dict())
+
+    @classmethod
+    def from_bytes(cls, buf):
+        """Create a configuration from the bytes returned by `to_bytes`."""
+        return cls.from_dict(configcodec.decode(buf))
+
     def _process_parser(self, cp):
         sim_params = cp['simulation']
         self.n12 = int(sim_params['n12'])
@@ -245,6 +477,23 @@ class Config(object):
         self.plot_time_step = int(sim_params['plot_time_step'])
         if 'play_animation' in sim_params:
             self.play_animation = sim_params['play_animation']
+        if 'io_format' in sim_params:
+            self.io_format = sim_params['io_format']
+        if 'output_every' in sim_params:
+            self.output_every = int(sim_params['output_every'])
+        if 'output_interval' in sim_params:
+            self.output_interval = float(sim_params['output_interval'])
+        if 'output_start_time' in sim_params:
+            self.output_start_time = float(sim_params['output_start_time'])
+        if 'extrema_order' in sim_params:
+            self.extrema_order = int(sim_params['extrema_order'])
+        if 'extrema_start_time' in sim_params:
+            self.extrema_start_time = float(
+                sim_params['extrema_start_time'])
+        if 'checkpoint_every' in sim_params:
+            self.checkpoint_every = int(sim_params['checkpoint_every'])
+        if 'implicit_time' in sim_params:
+            self.implicit_time = sim_params['implicit_time']
 
     def copy_to_output(self, outdir):
         self._validate()
@@ -303,7 +552,32 @@ class Config(object):
             'play_animation = {}'.format(self.play_animation),
             '',
             '; Input-output format.',
-            'io_format = {}'.format(self.io_format)
+            'io_format = {}'.format(self.io_format),
+            '',
+            '; Output detonation velocity at every nth time step.',
+            'output_every = {}'.format(self.output_every),
+            '',
+            '; Time interval between outputs of detonation velocity.',
+            '; If nonzero, `output_every` is ignored.',
+            'output_interval = {}'.format(self.output_interval),
+            '',
+            '; Time from which detonation velocity is written.',
+            'output_start_time = {}'.format(self.output_start_time),
+            '',
+            '; Order of local extrema of detonation velocity written to',
+            '; `extrema.npz`. Zero means that extrema are not detected.',
+            'extrema_order = {}'.format(self.extrema_order),
+            '',
+            '; Time from which local extrema are detected.',
+            'extrema_start_time = {}'.format(self.extrema_start_time),
+            '',
+            '; Number of time steps between checkpoints. Zero means that',
+            '; checkpoints are not written.',
+            'checkpoint_every = {}'.format(self.checkpoint_every),
+            '',
+            '; Whether the time of detonation velocity is stored implicitly',
+            '; as the initial time, output interval and number of values.',
+            'implicit_time = {}'.format(self.implicit_time)
         ]
 
         return '\n'.join(lines)
@@ -0,0 +1,12 @@
+"""
+Package `sweep` runs parameter sweeps of simulations.
+
+"""
+from .executors import (get_executor, map_longest_first, MPIExecutor,
+                        ProcessPoolExecutor, SerialExecutor)
+from .sweep import (check_results, run_task, Sweep, SweepError, Task,
+                    TaskResult)
+
+__all__ = [Sweep, SweepError, Task, TaskResult, check_results, run_task,
+           get_executor, map_longest_first, MPIExecutor, ProcessPoolExecutor,
+           SerialExecutor]
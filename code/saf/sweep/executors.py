@@ -0,0 +1,405 @@
+"""
+Executors that run the tasks of sweeps.
+
+All executors have the same interface: the method `map(func, iterable)`
+applies `func` to every task and returns the list of the results in the order
+of the tasks, and the attribute `is_root` tells whether the current process
+is the one that should write summaries of the results.
+
+- `SerialExecutor` runs the tasks one after another in this process.
+- `ProcessPoolExecutor` runs the tasks in worker processes on this machine.
+  By default, the number of workers is the number of available cores,
+  reduced if the available memory is not enough for that many tasks.
+- `MPIExecutor` distributes the tasks among the processes of an MPI job:
+  the root process hands out the tasks on demand to the other processes,
+  and all processes receive all results.
+
+`get_executor` chooses the executor from the environment, so that the same
+script runs on a workstation and on a cluster: the MPI executor is used if the
+script is started with `mpirun` with more than one process, otherwise, the
+process pool is used.
+The choice can be overridden with the environment variables `SAF_EXECUTOR`
+('serial', 'process' or 'mpi') and `SAF_WORKERS` (the number of worker
+processes of the process pool).
+
+Examples
+--------
+>>> with get_executor(memory_per_task=2 * 1024**3) as executor:
+...     results = sweep.run(executor)
+...     if executor.is_root:
+...         print(results)
+
+"""
+import multiprocessing as mp
+import os
+import traceback
+
+# Environment variables that MPI launchers set in the started processes.
+_MPI_SIZE_VARIABLES = ['OMPI_COMM_WORLD_SIZE', 'PMI_SIZE']
+
+EXECUTORS = ['serial', 'process', 'mpi']
+
+# Tags of the messages between the root process and the workers.
+_TAG_TASK, _TAG_RESULT = 1, 2
+
+# Memory in bytes of a worker process besides the data of its task:
+# the interpreter with Numpy and the solver loaded.
+PROCESS_MEMORY = 256 * 1024**2
+
+
+def get_cpu_count():
+    """Return the number of cores available to this process.
+
+    The affinity mask of the process (for example, set by a batch system)
+    and the CPU quota of its control group are taken into account.
+
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+
+    quota = _get_cgroup_cpu_quota()
+    if quota is not None:
+        count = min(count, quota)
+
+    return max(count, 1)
+
+
+def get_available_memory():
+    """Return the memory available for new processes in bytes.
+
+    Returns None if it cannot be determined.
+
+    """
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_worker_count(memory_per_task=None):
+    """Return the number of worker processes for this machine.
+
+    Parameters
+    ----------
+    memory_per_task : int, optional
+        Memory in bytes that a task needs. The number of workers is limited
+        such that all running tasks fit into the available memory.
+        By default, `PROCESS_MEMORY` is used.
+
+    """
+    count = get_cpu_count()
+
+    if memory_per_task is None:
+        memory_per_task = PROCESS_MEMORY
+
+    memory = get_available_memory()
+    if memory is not None:
+        count = min(count, memory // memory_per_task)
+
+    return max(int(count), 1)
+
+
+def get_executor(name=None, workers=None, memory_per_task=None):
+    """Return an executor suitable for the environment.
+
+    Parameters
+    ----------
+    name : str, optional
+        'serial', 'process' or 'mpi'. By default, it is taken from the
+        environment variable `SAF_EXECUTOR`; if it is not set, 'mpi' is used
+        in MPI jobs with more than one process and 'process' otherwise.
+    workers : int, optional
+        Number of worker processes of the process pool. By default, it is
+        taken from the environment variable `SAF_WORKERS`; if it is not set,
+        it is determined by `get_worker_count`.
+    memory_per_task : int, optional
+        Memory in bytes that a task needs, see `get_worker_count`.
+
+    """
+    if name is None:
+        name = os.environ.get('SAF_EXECUTOR')
+    if name is None:
+        name = 'mpi' if _is_mpi_job() else 'process'
+
+    if name == 'serial':
+        return SerialExecutor()
+    elif name == 'process':
+        if workers is None and os.environ.get('SAF_WORKERS'):
+            workers = int(os.environ['SAF_WORKERS'])
+        return ProcessPoolExecutor(workers, memory_per_task=memory_per_task)
+    elif name == 'mpi':
+        return MPIExecutor()
+    else:
+        raise ValueError('Unknown executor `{}`. Correct values: {}'.format(
+            name, EXECUTORS))
+
+
+class SerialExecutor(object):
+    """Executor that runs tasks one after another in this process."""
+
+    is_root = True
+
+    def map(self, func, iterable):
+        return [func(x) for x in iterable]
+
+    def shutdown(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+class ProcessPoolExecutor(SerialExecutor):
+    """Executor that runs tasks in worker processes on this machine.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes. By default, it is determined by
+        `get_worker_count`.
+    memory_per_task : int, optional
+        Memory in bytes that a task needs, see `get_worker_count`.
+
+    Notes
+    -----
+    Every task is sent to a worker separately, so that a worker that
+    finished its task takes the next one. Hence, `func` and the tasks must be
+    picklable.
+
+    """
+
+    def __init__(self, workers=None, memory_per_task=None):
+        if workers is None:
+            workers = get_worker_count(memory_per_task)
+
+        self._workers = workers
+        self._pool = None
+
+    @property
+    def workers(self):
+        return self._workers
+
+    def map(self, func, iterable):
+        if self._pool is None:
+            self._pool = mp.Pool(processes=self._workers)
+
+        return self._pool.map(func, iterable, chunksize=1)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+class MPIExecutor(SerialExecutor):
+    """Executor that distributes tasks among the processes of an MPI job.
+
+    All processes must call `map`; the tasks of the root process (rank 0)
+    are used. All processes return the same list of results.
+
+    By default, tasks are handed out dynamically: the root process only
+    manages the queue of tasks and sends the next task to a worker process
+    as soon as the worker finishes its previous one, so that long tasks do
+    not delay the whole job if they happen to be on the same process.
+    Hence, the tasks are run by `size - 1` processes, in the order of
+    the list; use `map_longest_first` to start the long tasks first.
+    With `dynamic=False`, tasks are assigned to all processes in
+    round-robin order in advance, which avoids the idle root process
+    when all tasks take the same time.
+
+    Parameters
+    ----------
+    comm : mpi4py.MPI.Comm, optional
+        Communicator of the processes. By default, `MPI.COMM_WORLD` is used.
+    dynamic : bool, optional (default is True)
+        Whether to hand out tasks on demand.
+
+    """
+
+    def __init__(self, comm=None, dynamic=True):
+        try:
+            from mpi4py import MPI
+        except ImportError:
+            raise RuntimeError('MPI executor requires `mpi4py` module')
+
+        if comm is None:
+            comm = MPI.COMM_WORLD
+
+        self._comm = comm
+        self._any_source = MPI.ANY_SOURCE
+        self._dynamic = dynamic
+
+    @property
+    def rank(self):
+        return self._comm.Get_rank()
+
+    @property
+    def size(self):
+        return self._comm.Get_size()
+
+    @property
+    def is_root(self):
+        return self.rank == 0
+
+    def map(self, func, iterable):
+        tasks = self._comm.bcast(list(iterable) if self.is_root else None,
+                                 root=0)
+
+        if self._dynamic and self.size > 1:
+            if self.is_root:
+                results = self._serve(tasks)
+            else:
+                self._work(func)
+                results = None
+        else:
+            results = [None] * len(tasks)
+            local = [(i, _call(func, tasks[i]))
+                     for i in range(self.rank, len(tasks), self.size)]
+            for chunk in self._comm.allgather(local):
+                for i, result in chunk:
+                    results[i] = result
+
+        results = self._comm.bcast(results, root=0)
+
+        for result in results:
+            if isinstance(result, _Failure):
+                raise RuntimeError('Task failed on another process:\n' +
+                                   result.message)
+
+        return results
+
+    def _serve(self, tasks):
+        results = [None] * len(tasks)
+        next_index = 0
+        active = self.size - 1
+
+        while active > 0:
+            # Every message of a worker carries the result of its previous
+            # task and requests the next one.
+            rank, done = self._comm.recv(source=self._any_source,
+                                         tag=_TAG_RESULT)
+            if done is not None:
+                i, result = done
+                results[i] = result
+
+            if next_index < len(tasks):
+                self._comm.send((next_index, tasks[next_index]), dest=rank,
+                                tag=_TAG_TASK)
+                next_index += 1
+            else:
+                self._comm.send(None, dest=rank, tag=_TAG_TASK)
+                active -= 1
+
+        return results
+
+    def _work(self, func):
+        done = None
+
+        while True:
+            self._comm.send((self.rank, done), dest=0, tag=_TAG_RESULT)
+            message = self._comm.recv(source=0, tag=_TAG_TASK)
+            if message is None:
+                break
+            i, task = message
+            done = (i, _call(func, task))
+
+
+def map_longest_first(executor, func, iterable, cost):
+    """Apply `func` to the tasks starting with the longest ones.
+
+    When tasks are handed out on demand, starting the longest tasks first
+    keeps a long task from being started last and finishing long after
+    all other processes become idle.
+
+    Parameters
+    ----------
+    executor
+        Executor that starts the tasks in the order of the list,
+        for example, `ProcessPoolExecutor` or `MPIExecutor`.
+    func : callable
+        Function to apply.
+    iterable
+        Tasks.
+    cost : callable
+        Function that returns the expected run time of a task;
+        it may return None if the run time is unknown, then the task
+        is started before all other tasks.
+
+    Returns
+    -------
+    list
+        Results in the order of `iterable`.
+
+    """
+    tasks = list(iterable)
+
+    def key(i):
+        c = cost(tasks[i])
+        return float('inf') if c is None else c
+
+    # Sorting is stable, so tasks with equal costs keep their order.
+    order = sorted(range(len(tasks)), key=key, reverse=True)
+    results = executor.map(func, [tasks[i] for i in order])
+
+    ordered = [None] * len(tasks)
+    for i, result in zip(order, results):
+        ordered[i] = result
+
+    return ordered
+
+
+def _is_mpi_job():
+    for name in _MPI_SIZE_VARIABLES:
+        value = os.environ.get(name)
+        if value is not None:
+            try:
+                return int(value) > 1
+            except ValueError:
+                pass
+
+    return False
+
+
+def _get_cgroup_cpu_quota():
+    # Containers limit the CPU time with a quota that `os.cpu_count`
+    # does not see.
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        return None
+
+    if quota == 'max':
+        return None
+
+    return max(int(int(quota) / int(period)), 1)
+
+
+class _Failure(object):
+    # Exception raised by a task on another process; exceptions themselves
+    # are not always picklable.
+    def __init__(self, message):
+        self.message = message
+
+
+def _call(func, task):
+    # A process that raises leaves other processes waiting for its
+    # messages forever, hence, errors are sent as results.
+    try:
+        return func(task)
+    except Exception:
+        return _Failure(traceback.format_exc())
@@ -0,0 +1,360 @@
+"""
+Declarative parameter sweeps.
+
+A sweep is specified by the kind of the simulation, a base configuration and
+the values of the parameters that vary between runs, either as a grid
+(all combinations of the given values) or as a list of cases.
+`Sweep` creates a task for every run and executes the tasks with an
+executor, which decides where and in what order they run.
+For every task, the engine
+
+- prepares the results directory (wiping the results of a previous run),
+- redirects standard output and error of the run to `stdout.log` and
+  `stderr.log` in this directory,
+- runs the simulation and, optionally, its postprocessing,
+- registers the outcome in `task.json` in this directory.
+
+With `resume=True`, tasks that are registered as done with the same
+configuration are skipped, and the other tasks are run from the beginning.
+With a result store (see `saf.util.resultstore`), every configuration is
+computed only once across sweeps and experiments, and the results
+directory is a symbolic link to the results in the store.
+The store is shared, hence, the outcome of such a task is registered next
+to the link, in `<results directory>.task.json`.
+
+Examples
+--------
+>>> c = Config()
+>>> c.n12 = 40
+>>> ...
+>>> sweep = Sweep('nonlinear', c,
+...               grid={'theta': np.linspace(0.90, 1.15, num=251)},
+...               outdir='_output/N12=0040', dirname='theta={theta:.3f}')
+>>> results = sweep.run()
+
+"""
+import collections
+import copy
+import itertools
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+
+from saf.sweep.executors import SerialExecutor, map_longest_first
+from saf.util import reset_logging
+from saf.util.resultstore import ResultStore, get_config_key
+
+TASK_FILENAME = 'task.json'
+
+Task = collections.namedtuple('Task', ['index', 'kind', 'params', 'config',
+                                       'outdir', 'settings'])
+Task.__doc__ = """Single run of a sweep.
+
+Attributes
+----------
+index : int
+    Index of the task in the sweep.
+kind : str
+    Kind of the simulation, 'linear' or 'nonlinear'.
+params : dict
+    Values of the swept parameters.
+config : Config
+    Configuration of the run.
+outdir : str
+    Results directory of the run.
+settings : dict
+    Settings of the sweep shared by all tasks.
+
+"""
+
+TaskResult = collections.namedtuple('TaskResult', ['index', 'params',
+                                                   'outdir', 'status',
+                                                   'elapsed', 'error'])
+TaskResult.__doc__ = """Outcome of a task.
+
+Attributes
+----------
+index : int
+    Index of the task in the sweep.
+params : dict
+    Values of the swept parameters.
+outdir : str
+    Results directory of the run.
+status : str
+    'done', 'failed' or 'skipped' (if it was done before).
+elapsed : float
+    Wall-clock time of the run in seconds.
+error : str or None
+    Error message if the run failed.
+
+"""
+
+
+class SweepError(RuntimeError):
+    """Error raised when runs of a sweep failed."""
+
+
+class Sweep(object):
+    """Parameter sweep over simulations of one kind.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of the simulation, 'linear' or 'nonlinear'.
+    config : Config
+        Base configuration. The swept parameters are assigned to its copies
+        as attributes, so they can be any options of the configuration.
+    grid : dict, optional
+        Sequences of values by parameter name. Runs are made for all
+        combinations of the values, the last parameter varying fastest.
+    cases : list of dict, optional
+        Values of the parameters for every run. Either `grid` or `cases`
+        must be given.
+    outdir : str, optional (default is '_output')
+        Directory in which the results directories of the runs are created.
+    dirname : str, optional
+        Format string for the names of the results directories, which is
+        formatted with the values of the parameters,
+        for example, 'theta={theta:.3f}'.
+        By default, the names are 'name=value' joined with '-'.
+    solve : callable, optional
+        Function `solve(kind, config, outdir, **kwargs)` that runs a
+        simulation. By default, `saf.action.solve` is used.
+        It must be defined at the module level to be sent to other processes.
+    postprocess : callable, optional
+        Function `postprocess(outdir)` called after a successful run.
+    solve_kwargs : dict, optional
+        Keyword arguments passed to `solve`.
+    store : str, optional
+        Directory of the result store. If given, runs are computed in the
+        store and are reused if they were computed before.
+    resume : bool, optional (default is False)
+        Whether to skip runs that are done.
+
+    """
+
+    def __init__(self, kind, config, grid=None, cases=None, outdir='_output',
+                 dirname=None, solve=None, postprocess=None, solve_kwargs=None,
+                 store=None, resume=False):
+        if (grid is None) == (cases is None):
+            raise ValueError('Either `grid` or `cases` must be given')
+
+        if grid is not None:
+            names = list(grid)
+            cases = [dict(zip(names, values))
+                     for values in itertools.product(*grid.values())]
+
+        self._kind = kind
+        self._config = config
+        self._cases = [dict(case) for case in cases]
+        self._outdir = outdir
+        self._dirname = dirname
+        self._settings = {
+            'solve': solve,
+            'postprocess': postprocess,
+            'solve_kwargs': dict(solve_kwargs or {}),
+            'store': store,
+            'resume': resume,
+        }
+
+    @property
+    def tasks(self):
+        """List of the tasks of the sweep."""
+        tasks = []
+
+        for i, params in enumerate(self._cases):
+            c = copy.deepcopy(self._config)
+            for name, value in params.items():
+                setattr(c, name, value)
+
+            outdir = os.path.join(self._outdir, self._format_dirname(params))
+            tasks.append(Task(i, self._kind, params, c, outdir,
+                              self._settings))
+
+        return tasks
+
+    def run(self, executor=None, longest_first=False):
+        """Run all tasks of the sweep.
+
+        Parameters
+        ----------
+        executor : optional
+            Object with the method `map(func, iterable)` that returns
+            the results in the order of `iterable`, for example, one of
+            `saf.sweep.executors` or `multiprocessing.Pool`.
+            By default, `SerialExecutor` is used.
+        longest_first : bool, optional (default is False)
+            Whether to start the tasks in the order of decreasing run time
+            of their previous runs (tasks that were not run before are
+            started first), which shortens the sweep when the executor
+            hands out tasks on demand.
+
+        Returns
+        -------
+        list of TaskResult
+            Outcomes of the tasks in the order of the tasks.
+
+        """
+        # Processes of an MPI job create the directory simultaneously.
+        os.makedirs(self._outdir, exist_ok=True)
+
+        if executor is None:
+            executor = SerialExecutor()
+
+        if longest_first:
+            return map_longest_first(executor, run_task, self.tasks,
+                                     _get_previous_elapsed)
+
+        return list(executor.map(run_task, self.tasks))
+
+    def _format_dirname(self, params):
+        if self._dirname is not None:
+            return self._dirname.format(**params)
+
+        return '-'.join('{}={}'.format(name, value)
+                        for name, value in params.items())
+
+
+def check_results(results):
+    """Raise `SweepError` if any of the `TaskResult`s is failed.
+
+    Drivers call it after `Sweep.run` to stop before they use results
+    of failed runs.
+
+    """
+    failed = [r for r in results if r.status == 'failed']
+
+    if failed:
+        lines = ['{} | {}'.format(r.outdir, r.error) for r in failed]
+        raise SweepError('{} of {} runs failed:\n'.format(
+            len(failed), len(results)) + '\n'.join(lines))
+
+
+def run_task(task):
+    """Run a task of a sweep and return its `TaskResult`.
+
+    Errors of the run are not raised but are reported in the result.
+
+    """
+    settings = task.settings
+    outdir = task.outdir
+    config_key = get_config_key(task.kind, task.config, code_version='')
+
+    if settings['resume'] and _is_done(task, config_key):
+        return TaskResult(task.index, task.params, outdir, 'skipped', 0.0,
+                          None)
+
+    start = time.perf_counter()
+    error = None
+
+    try:
+        if settings['store'] is None:
+            if os.path.lexists(outdir):
+                _remove(outdir)
+            os.makedirs(outdir)
+            _solve_with_logs(task.kind, task.config, outdir, settings)
+        else:
+            store = ResultStore(settings['store'])
+            path = store.solve(task.kind, task.config, _solve_with_logs,
+                               settings=settings)
+            if os.path.lexists(outdir):
+                _remove(outdir)
+            os.symlink(os.path.relpath(path, os.path.dirname(outdir)), outdir)
+    except Exception as e:
+        error = '{}: {}'.format(type(e).__name__, e)
+
+    elapsed = time.perf_counter() - start
+    status = 'done' if error is None else 'failed'
+
+    if settings['store'] is not None or os.path.isdir(outdir):
+        _register(task, config_key, status, elapsed, error)
+
+    return TaskResult(task.index, task.params, outdir, status, elapsed, error)
+
+
+def _solve_with_logs(kind, config, outdir, settings):
+    solve = settings['solve']
+    if solve is None:
+        from saf.action import solve
+
+    stdout, stderr = sys.stdout, sys.stderr
+
+    with open(os.path.join(outdir, 'stdout.log'), 'w') as out, \
+            open(os.path.join(outdir, 'stderr.log'), 'w') as err:
+        sys.stdout, sys.stderr = out, err
+        try:
+            solve(kind, config, outdir, **settings['solve_kwargs'])
+            if settings['postprocess'] is not None:
+                settings['postprocess'](outdir)
+        except Exception:
+            traceback.print_exc()
+            raise
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            reset_logging()
+
+
+def _get_record_filename(task):
+    # Entries of a result store are shared by sweeps and must not change
+    # after they are stored.
+    if task.settings['store'] is not None:
+        return task.outdir + '.' + TASK_FILENAME
+
+    return os.path.join(task.outdir, TASK_FILENAME)
+
+
+def _read_record(task):
+    try:
+        with open(_get_record_filename(task)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_done(task, config_key):
+    record = _read_record(task)
+
+    # Results in a store can be removed after they are registered.
+    return (os.path.isdir(task.outdir) and record.get('status') == 'done' and
+            record.get('config_key') == config_key)
+
+
+def _get_previous_elapsed(task):
+    record = _read_record(task)
+
+    # Failed runs say nothing about how long the run takes.
+    if record.get('status') != 'done':
+        return None
+
+    return record.get('elapsed')
+
+
+def _register(task, config_key, status, elapsed, error):
+    record = {
+        'params': {name: _to_json(value)
+                   for name, value in task.params.items()},
+        'config_key': config_key,
+        'status': status,
+        'elapsed': elapsed,
+        'error': error,
+    }
+
+    with open(_get_record_filename(task), 'w') as f:
+        json.dump(record, f, indent=4, sort_keys=True)
+
+
+def _remove(path):
+    if os.path.islink(path) or not os.path.isdir(path):
+        os.remove(path)
+    else:
+        shutil.rmtree(path)
+
+
+def _to_json(value):
+    # Values of the parameters are often Numpy scalars.
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
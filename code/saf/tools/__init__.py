@@ -0,0 +1,4 @@
+"""
+Package `tools` contains command-line tools for managing simulation results.
+
+"""
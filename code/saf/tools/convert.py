@@ -0,0 +1,261 @@
+"""
+Convert simulation results between output formats.
+
+Walks a tree of results directories and converts the time series of
+detonation velocity of every run to the given format (see the option
+`io_format` of the configuration) in parallel worker processes.
+Every converted file is written to a temporary file, read back and compared
+bitwise with the original data before it atomically replaces the target,
+so an interrupted or failed conversion never leaves partial files.
+After successful conversion, the source file is removed, unless `--keep`
+is given, and the option `io_format` in `config.ini` is updated.
+Other files of the runs, for example, profiles, are left as they are.
+
+Examples
+--------
+Convert all text results of a sweep to the delta codec with 8 processes::
+
+    python -m saf.tools.convert --to delta --workers 8 linear-solutions/_output
+
+"""
+import argparse
+import concurrent.futures
+import os
+import re
+import sys
+import tempfile
+
+import numpy as np
+
+from saf.util import deltacodec
+from saf.util.catalog import Catalog
+from saf.util.textio import format_table, read_table
+from saf.util.timewindow import get_time
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+FILENAMES = {
+    'ascii': 'detonation-velocity.txt',
+    'numpy': 'detonation-velocity.npz',
+    'npy': 'detonation-velocity.npy',
+    'hdf5': 'detonation-velocity.h5',
+    'delta': 'detonation-velocity.dz',
+}
+
+_HEADER = ('# First column is time, '
+           'second column is the perturbation of detonation velocity.\n')
+
+_IO_FORMAT = re.compile(r'^(\s*io_format\s*=\s*)\S+', re.MULTILINE)
+
+
+class ConversionError(Exception):
+    pass
+
+
+def read_detonation_velocity(filename, fmt):
+    """Read the time series of detonation velocity in the format `fmt`.
+
+    Returns
+    -------
+    data : ndarray
+        Array of shape (n, 2) with time and detonation velocity.
+
+    """
+    if fmt == 'ascii':
+        data = read_table(filename)
+    elif fmt == 'numpy':
+        with np.load(filename) as f:
+            data = np.column_stack((get_time(f), f['d']))
+    elif fmt == 'npy':
+        data = np.load(filename)
+    elif fmt == 'hdf5':
+        with _open_hdf5(filename, 'r') as fh:
+            data = fh['detonation-velocity'][...]
+    elif fmt == 'delta':
+        data = deltacodec.read_table(filename)
+    else:
+        raise ValueError('Unknown format `{}`'.format(fmt))
+
+    if data.ndim != 2 or data.shape[1] != 2:
+        raise ConversionError('File `{}` must have two columns'.format(
+            filename))
+
+    return data
+
+
+def write_detonation_velocity(filename, fmt, data):
+    """Write the time series of detonation velocity in the format `fmt`.
+
+    The file is written in the same way as the writers of the format do.
+
+    """
+    if fmt == 'ascii':
+        with open(filename, 'w') as f:
+            f.write(_HEADER)
+            f.write(format_table(data, fmt='%24.16e'))
+    elif fmt == 'numpy':
+        with open(filename, 'wb') as f:
+            np.savez(f, t=data[:, 0], d=data[:, 1])
+    elif fmt == 'npy':
+        with open(filename, 'wb') as f:
+            np.save(f, np.ascontiguousarray(data))
+    elif fmt == 'hdf5':
+        with _open_hdf5(filename, 'w') as fh:
+            fh.create_dataset(
+                'detonation-velocity', data=data, maxshape=(None, 2),
+                chunks=(1000, 2), compression='gzip')
+    elif fmt == 'delta':
+        with open(filename, 'wb') as f:
+            deltacodec.write_table(f, data)
+    else:
+        raise ValueError('Unknown format `{}`'.format(fmt))
+
+
+def convert_run(results_dir, source, target, keep=False):
+    """Convert the results in `results_dir` from `source` to `target` format.
+
+    Raises
+    ------
+    ConversionError
+        If the data read back from the converted file differ from
+        the original data. The results directory is not changed then.
+
+    """
+    source_filename = os.path.join(results_dir, FILENAMES[source])
+    target_filename = os.path.join(results_dir, FILENAMES[target])
+
+    data = read_detonation_velocity(source_filename, source)
+
+    fd, tmp_filename = tempfile.mkstemp(dir=results_dir, suffix='.tmp')
+    os.close(fd)
+
+    try:
+        write_detonation_velocity(tmp_filename, target, data)
+        written = read_detonation_velocity(tmp_filename, target)
+
+        # Values are compared bitwise, such that NaNs and signed zeros
+        # are checked as well.
+        if (written.shape != data.shape or
+                not np.array_equal(written.view(np.uint64),
+                                   data.view(np.uint64))):
+            raise ConversionError('Round trip of `{}` to `{}` changed data'
+                                  .format(source_filename, target))
+
+        os.replace(tmp_filename, target_filename)
+    except BaseException:
+        os.remove(tmp_filename)
+        raise
+
+    _update_config(os.path.join(results_dir, 'config.ini'), target)
+
+    if not keep:
+        os.remove(source_filename)
+        # Sidecar cache of the text file is useless without it.
+        sidecar = source_filename + '.cache.npz'
+        if os.path.isfile(sidecar):
+            os.remove(sidecar)
+
+
+def convert_tree(root, target, workers=None, keep=False, verbose=True):
+    """Convert all runs in the directory tree `root` to the `target` format.
+
+    Returns
+    -------
+    converted : list of str
+        Results directories that were converted.
+    failed : list of tuple
+        Pairs of a results directory and the error message.
+
+    """
+    if target not in FILENAMES:
+        raise ValueError('Unknown format `{}`. Correct values: {}'.format(
+            target, sorted(FILENAMES)))
+
+    # Formats of the runs must be current, hence, the full update.
+    with Catalog(root, update=True) as catalog:
+        runs = [run for run in catalog.find()
+                if run.format is not None and run.format != target]
+
+    converted, failed = [], []
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(convert_run, run.path, run.format, target, keep):
+                   run for run in runs}
+
+        for future in concurrent.futures.as_completed(futures):
+            run = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((run.path, str(e)))
+                status = 'FAILED: {}'.format(e)
+            else:
+                converted.append(run.path)
+                status = 'converted from {}'.format(run.format)
+
+            if verbose:
+                print('{}: {}'.format(run.path, status))
+
+    return sorted(converted), sorted(failed)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m saf.tools.convert',
+        description='Convert simulation results between output formats.')
+    p.add_argument('root', help='Root directory of the tree with results')
+    p.add_argument('--to', dest='target', required=True,
+                   choices=sorted(FILENAMES), help='Target format')
+    p.add_argument('--workers', type=int, default=None,
+                   help='Number of worker processes '
+                        '(default is the number of processors)')
+    p.add_argument('--keep', action='store_true',
+                   help='Keep the files in the source format')
+    p.add_argument('--quiet', action='store_true',
+                   help='Print only the summary')
+    args = p.parse_args(argv)
+
+    converted, failed = convert_tree(args.root, args.target,
+                                     workers=args.workers, keep=args.keep,
+                                     verbose=not args.quiet)
+
+    print('Converted {} runs, failed {} runs'.format(len(converted),
+                                                     len(failed)))
+
+    return 1 if failed else 0
+
+
+def _open_hdf5(filename, mode):
+    if h5py is None:
+        raise ConversionError('HDF5 format requires `h5py` module')
+
+    return h5py.File(filename, mode)
+
+
+def _update_config(filename, target):
+    if not os.path.isfile(filename):
+        return
+
+    with open(filename) as f:
+        content = f.read()
+
+    new_content = _IO_FORMAT.sub(r'\g<1>' + target, content)
+    if new_content == content:
+        return
+
+    fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(filename),
+                                        suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(new_content)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.remove(tmp_filename)
+        raise
+
+
+if __name__ == '__main__':
+    sys.exit(main())
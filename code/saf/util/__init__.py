@@ -1,5 +1,7 @@
 from .logginghelper import init as init_logging
 from .logginghelper import reset as reset_logging
 from .observedorder import compute_observed_order_of_accuracy
+from .timewindow import find_time_window
 
-__all__ = [init_logging, reset_logging, compute_observed_order_of_accuracy]
+__all__ = [init_logging, reset_logging, compute_observed_order_of_accuracy,
+           find_time_window]
@@ -0,0 +1,148 @@
+"""
+Asynchronous writing of simulation output in a background thread."""
+import queue
+import threading
+
+import numpy as np
+
+# Marker that tells the background thread to stop.
+_STOP = object()
+
+
+class AsyncWriter(object):
+    """Wrap a writer such that it runs in a background thread.
+
+    Calls of `save_configuration`, `save_znd_solution` and `save` are put
+    into a bounded queue and executed by the wrapped writer in a background
+    thread in the same order, so that formatting, compression and disk
+    latency do not stall time integration.
+    The solution is copied only at the time steps at which the writer uses
+    all of it (see `needs_solution` of the writers); at other time steps,
+    only its last value, detonation velocity, is kept, and such calls are
+    sent to the background thread in batches of `batch_size`.
+    When the queue is full, `save` blocks until the background thread catches
+    up, hence, memory usage is bounded by `maxsize` copies of the solution.
+
+    If the wrapped writer raises an exception, the remaining calls are
+    dropped and the exception is re-raised in the calling thread by the next
+    call of any method.
+
+    Parameters
+    ----------
+    writer : object
+        Writer of any format, for example, `ASCIIWriter` or `HDF5Writer`.
+    maxsize : int, optional (default is 64)
+        Maximum number of pending calls.
+    batch_size : int, optional (default is 1024)
+        Number of calls of `save` that write only detonation velocity
+        and are sent to the background thread at once.
+
+    """
+
+    def __init__(self, writer, maxsize=64, batch_size=1024):
+        if maxsize < 1:
+            raise ValueError('Parameter `maxsize` must be positive')
+        if batch_size < 1:
+            raise ValueError('Parameter `batch_size` must be positive')
+
+        self._writer = writer
+        self._needs_solution = getattr(writer, 'needs_solution', None)
+        self._batch = []
+        self._batch_size = batch_size
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run,
+                                        name='AsyncWriter', daemon=True)
+        self._thread.start()
+
+    def save_configuration(self):
+        self._submit(self._writer.save_configuration)
+
+    def save_znd_solution(self):
+        self._submit(self._writer.save_znd_solution)
+
+    def save(self, time_step, time, soln_data):
+        # The solver updates the solution array in place, so the writer
+        # must get a copy of it.
+        if (self._needs_solution is None or
+                self._needs_solution(time_step, time)):
+            self._submit(self._writer.save, time_step, time,
+                         np.copy(soln_data))
+        else:
+            if self._closed:
+                raise ValueError('Writer is closed')
+            if self._error is not None:
+                raise self._error
+            self._batch.append((time_step, time, soln_data[-1:].copy()))
+            if len(self._batch) == self._batch_size:
+                self._flush_batch()
+
+    def close(self):
+        """Wait until all pending calls are done and close the writer."""
+        if self._closed:
+            return
+
+        self._flush_batch()
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+        if self._error is None:
+            self._writer.close()
+        else:
+            # Release the files of the writer, but report the original error.
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            raise self._error
+
+    def _submit(self, method, *args):
+        if self._closed:
+            raise ValueError('Writer is closed')
+
+        # Pending calls of `save` go first to keep the order of calls.
+        if self._batch:
+            self._flush_batch()
+
+        if self._error is not None:
+            raise self._error
+
+        self._queue.put((method, args))
+
+    def _flush_batch(self):
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+        self._queue.put((self._save_batch, (batch,)))
+
+    def _save_batch(self, batch):
+        save = self._writer.save
+        for time_step, time, soln_data in batch:
+            save(time_step, time, soln_data)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+
+            if item is _STOP:
+                return
+
+            if self._error is not None:
+                # Drop remaining calls after a failure.
+                continue
+
+            method, args = item
+            try:
+                method(*args)
+            except Exception as e:
+                self._error = e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
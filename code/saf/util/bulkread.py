@@ -0,0 +1,115 @@
+"""
+Concurrent reading of time series from many results directories.
+
+Reading the results of a parameter sweep file by file is dominated by the
+latency of the file system, especially on parallel file systems.
+`read_many` issues the reads concurrently from a pool of threads or
+processes.
+
+"""
+import concurrent.futures
+import os
+
+import numpy as np
+
+
+def _read_one(reader_cls, results_dir, window, normalized, with_time,
+              reader_kwargs):
+    r = reader_cls(results_dir, **reader_kwargs)
+    t_start, t_end = window
+
+    if not with_time:
+        d = r.get_detonation_velocity(t_start=t_start, t_end=t_end)
+        if normalized:
+            d_znd = r.get_computed_values()['d_znd']
+            d = (d_znd + d) / d_znd
+        return None, np.array(d)
+
+    if normalized:
+        t, d = r.get_time_and_normalized_detonation_velocity(
+            t_start=t_start, t_end=t_end)
+    else:
+        t, d = r.get_time_and_detonation_velocity(
+            t_start=t_start, t_end=t_end)
+
+    # Memory-mapped arrays cannot be sent between processes efficiently
+    # and keep files open, hence, the data are copied into memory.
+    return np.array(t), np.array(d)
+
+
+def read_many(reader_cls, dirs, window=None, workers=None, processes=False,
+              normalized=False, stack=False, with_time=True, **reader_kwargs):
+    """Read time series of detonation velocity from many directories.
+
+    Parameters
+    ----------
+    reader_cls : type
+        Class of the reader, for example, `saf.fm.nonlinear.Reader`.
+    dirs : list of str
+        Results directories.
+    window : tuple of float, optional
+        Time window `(t_start, t_end)`, where either boundary can be None.
+        If not given, the whole time series are read.
+    workers : int, optional
+        Number of threads or processes. By default, it is the number of
+        processors, but not more than 32 for threads.
+    processes : bool, optional (default is False)
+        Whether to use a pool of processes instead of threads.
+        Processes are useful when parsing text files dominates the cost
+        of reading.
+    normalized : bool, optional (default is False)
+        Whether to read normalized detonation velocity.
+    stack : bool, optional (default is False)
+        Whether to stack the time series into two-dimensional arrays.
+        All time series must have the same length then.
+    with_time : bool, optional (default is True)
+        Whether to return the times. If False, only detonation velocities
+        are read, which avoids computing the times when they are stored
+        implicitly. The reader must have the method
+        `get_detonation_velocity` then.
+    **reader_kwargs
+        Keyword arguments passed to the constructor of the reader.
+
+    Returns
+    -------
+    t, d : list of ndarray or ndarray
+        Times and detonation velocities in the order of `dirs`, as lists of
+        arrays or, if `stack` is True, as arrays of shape
+        (len(dirs), n_times).
+        If `with_time` is False, only `d` is returned.
+
+    """
+    if window is None:
+        window = (None, None)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+        if not processes:
+            workers = min(32, workers + 4)
+
+    if processes:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    with executor:
+        futures = [executor.submit(_read_one, reader_cls, d, window,
+                                   normalized, with_time, reader_kwargs)
+                   for d in dirs]
+        results = [f.result() for f in futures]
+
+    t_list = [t for t, __ in results]
+    d_list = [d for __, d in results]
+
+    if stack:
+        lengths = set(len(d) for d in d_list)
+        if len(lengths) > 1:
+            raise ValueError('Time series have different lengths; '
+                             'cannot stack them')
+        t_list = np.array(t_list)
+        d_list = np.array(d_list)
+
+    if not with_time:
+        return d_list
+
+    return t_list, d_list
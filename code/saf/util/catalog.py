@@ -0,0 +1,416 @@
+"""
+Catalog of simulation results in a directory tree.
+
+Post-processing scripts find the results of a parameter sweep by listing
+directories and parsing parameters from their names.
+`Catalog` walks the tree once and stores, for every results directory,
+its parameters, the output format, status and size in an SQLite database
+`catalog.sqlite` in the root of the tree, so that subsequent queries do not
+touch the file system.
+When a catalog is opened again, only the directories that contain runs are
+checked for changes, so that opening it does not depend on the number
+of runs.
+
+A results directory is a directory that contains `config.ini`,
+`computed-values.txt`, `stability.txt` or a time series of detonation
+velocity.
+Parameters of a run are taken from the names of the directories on the path
+from the root to the run, which have the form `name=value` or
+`label-name=value`, for example, `N12=1280/theta=0.950` or
+`stable-n12=0020`, and from all options of `config.ini`, which take
+precedence.
+Parameter names are case-insensitive.
+
+Examples
+--------
+>>> catalog = Catalog('_output')
+>>> runs = catalog.find(q=4, n12=1280, theta=(0.95, 1.0), order_by='theta')
+>>> for run in runs:
+...     print(run.path, run.params['theta'])
+
+"""
+import collections
+import logging
+import os
+import sqlite3
+
+from configparser import ConfigParser, Error as ConfigParserError
+
+FILENAME = 'catalog.sqlite'
+
+# Relative tolerance for the comparison of floating-point parameters.
+RTOL = 1e-9
+
+# Files other than time series, by which results directories are recognized.
+_MARKERS = ['config.ini', 'computed-values.txt', 'stability.txt']
+
+# Formats of the time series of detonation velocity by file name.
+_FORMATS = collections.OrderedDict([
+    ('detonation-velocity.txt', 'ascii'),
+    ('detonation-velocity.npz', 'numpy'),
+    ('detonation-velocity.npy', 'npy'),
+    ('detonation-velocity.h5', 'hdf5'),
+    ('detonation-velocity.dz', 'delta'),
+])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    format TEXT,
+    status TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    num REAL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS params_by_num ON params (name, num);
+CREATE INDEX IF NOT EXISTS params_by_text ON params (name, text);
+"""
+
+Run = collections.namedtuple('Run', ['path', 'format', 'status', 'size',
+                                     'params'])
+Run.__doc__ = """Results of one simulation.
+
+Attributes
+----------
+path : str
+    Path to the results directory.
+format : str or None
+    Format of the time series of detonation velocity ('ascii', 'numpy',
+    'npy', 'hdf5', 'delta') or None if there is no time series.
+status : str
+    'missing' if there is no time series of detonation velocity,
+    'failed' if file `stderr.log` is not empty, 'done' otherwise.
+size : int
+    Total size of the files in the results directory in bytes
+    (not including subdirectories).
+params : dict
+    Parameters of the simulation. Numeric values are floats.
+
+"""
+
+
+class Catalog(object):
+    """Catalog of simulation results in the directory tree `root`.
+
+    Parameters
+    ----------
+    root : str
+        Root directory of the tree with simulation results.
+    update : bool, optional
+        Whether to synchronize the catalog with the file system when it is
+        opened (see `update`).
+        If False, the stored catalog is used as is, unless it does not exist.
+        By default, the catalog is synchronized only if the modification
+        time of the root or of a directory containing runs changed since
+        the previous update, that is, if runs were added or removed.
+        Changes inside existing results directories are not detected then;
+        call `update` explicitly to take them into account.
+
+    """
+
+    def __init__(self, root, update=None):
+        if not os.path.isdir(root):
+            raise ValueError('Directory `{}` does not exist'.format(root))
+
+        self._root = root
+        filename = os.path.join(root, FILENAME)
+        exists = os.path.isfile(filename)
+
+        try:
+            self._conn = sqlite3.connect(filename)
+            self._conn.execute('PRAGMA foreign_keys = ON')
+            # The journal is kept between transactions, otherwise,
+            # its creation and removal change the modification time of
+            # the root directory, by which the catalog detects new runs.
+            self._conn.execute('PRAGMA journal_mode = PERSIST')
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            # Results can be in a read-only location, then the catalog
+            # is kept in memory.
+            logger = logging.getLogger(__name__)
+            logger.debug('Cannot write catalog `{}`: {}'.format(filename, e))
+            exists = False
+            self._conn = sqlite3.connect(':memory:')
+            self._conn.execute('PRAGMA foreign_keys = ON')
+            self._conn.executescript(_SCHEMA)
+
+        if update is None:
+            update = self._is_stale()
+
+        if update or not exists:
+            self.update()
+
+    def update(self):
+        """Synchronize the catalog with the directory tree.
+
+        The whole tree is walked, and the results directories whose files
+        changed since the previous update are read again.
+
+        """
+        stored = dict(self._conn.execute('SELECT path, mtime_ns FROM runs'))
+        found = set()
+        dirs = []
+
+        with self._conn:
+            # Clearing the table first also makes sure that the journal
+            # exists before the modification times are taken.
+            self._conn.execute('DELETE FROM dirs')
+
+            # Runs of sweeps can be symbolic links to a result store.
+            for dirpath, dirnames, filenames in os.walk(self._root,
+                                                        followlinks=True):
+                dirnames.sort()
+                # Profiles are never results directories themselves.
+                if 'profiles' in dirnames:
+                    dirnames.remove('profiles')
+
+                if not _is_results_dir(filenames):
+                    dirs.append(dirpath)
+                    continue
+
+                path = os.path.relpath(dirpath, self._root)
+                found.add(path)
+                mtime_ns = _get_mtime_ns(dirpath, filenames)
+
+                if stored.get(path) == mtime_ns:
+                    continue
+
+                self._add_run(path, dirpath, filenames, mtime_ns)
+
+            for path in set(stored) - found:
+                self._conn.execute('DELETE FROM runs WHERE path = ?', (path,))
+
+            self._conn.executemany(
+                'INSERT INTO dirs (path, mtime_ns) VALUES (?, ?)',
+                [(os.path.relpath(d, self._root), os.stat(d).st_mtime_ns)
+                 for d in dirs])
+
+    def find(self, order_by=None, status=None, **conditions):
+        """Find runs whose parameters satisfy the given conditions.
+
+        Parameters
+        ----------
+        order_by : str, optional
+            Name of the parameter by which the runs are sorted.
+            If not given, the runs are sorted by path.
+        status : str, optional
+            If given, only runs with this status are returned.
+        **conditions
+            Conditions on the parameters.
+            A tuple `(lo, hi)` selects the runs with `lo <= value <= hi`,
+            where either boundary can be None.
+            A number selects the runs with the value equal to it within
+            relative tolerance `RTOL`.
+            A string selects the runs with the value equal to it.
+
+        Returns
+        -------
+        list of Run
+            Runs satisfying all conditions.
+
+        """
+        query = ['SELECT runs.id FROM runs']
+        args = []
+
+        if order_by is not None:
+            query.append('LEFT JOIN params AS o '
+                         'ON o.run_id = runs.id AND o.name = ?')
+            args.append(order_by.lower())
+
+        where = []
+        if status is not None:
+            where.append('runs.status = ?')
+            args.append(status)
+
+        for name, value in conditions.items():
+            clause, clause_args = _make_clause(value)
+            where.append('runs.id IN (SELECT run_id FROM params '
+                         'WHERE name = ? AND ' + clause + ')')
+            args.append(name.lower())
+            args.extend(clause_args)
+
+        if where:
+            query.append('WHERE ' + ' AND '.join(where))
+
+        if order_by is not None:
+            query.append('ORDER BY o.num, o.text, runs.path')
+        else:
+            query.append('ORDER BY runs.path')
+
+        ids = [row[0] for row in self._conn.execute(' '.join(query), args)]
+
+        return self._get_runs(ids)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _is_stale(self):
+        dirs = list(self._conn.execute('SELECT path, mtime_ns FROM dirs'))
+        if not dirs:
+            return True
+
+        for path, mtime_ns in dirs:
+            try:
+                current = os.stat(os.path.join(self._root, path)).st_mtime_ns
+            except OSError:
+                return True
+            if current != mtime_ns:
+                return True
+
+        return False
+
+    def _get_runs(self, ids):
+        params = collections.defaultdict(dict)
+        runs = {}
+
+        # Fetch in batches to stay below the limit on the number of
+        # parameters of an SQLite query.
+        batch_size = 500
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i:i + batch_size]
+            marks = ','.join('?' * len(batch))
+
+            for row in self._conn.execute(
+                    'SELECT run_id, name, num, text FROM params '
+                    'WHERE run_id IN (' + marks + ')', batch):
+                run_id, name, num, text = row
+                params[run_id][name] = text if num is None else num
+
+            for row in self._conn.execute(
+                    'SELECT id, path, format, status, size FROM runs '
+                    'WHERE id IN (' + marks + ')', batch):
+                runs[row[0]] = row[1:]
+
+        result = []
+        for run_id in ids:
+            path, fmt, status, size = runs[run_id]
+            result.append(Run(os.path.join(self._root, path), fmt, status,
+                              size, params[run_id]))
+
+        return result
+
+    def _add_run(self, path, dirpath, filenames, mtime_ns):
+        fmt = None
+        for name, value in _FORMATS.items():
+            if name in filenames:
+                fmt = value
+                break
+
+        size = 0
+        for name in filenames:
+            size += os.path.getsize(os.path.join(dirpath, name))
+
+        if fmt is None:
+            status = 'missing'
+        elif ('stderr.log' in filenames and
+                os.path.getsize(os.path.join(dirpath, 'stderr.log')) > 0):
+            status = 'failed'
+        else:
+            status = 'done'
+
+        params = _get_params_from_path(path)
+        if 'config.ini' in filenames:
+            params.update(_get_params_from_config(
+                os.path.join(dirpath, 'config.ini')))
+
+        self._conn.execute('DELETE FROM runs WHERE path = ?', (path,))
+        cursor = self._conn.execute(
+            'INSERT INTO runs (path, format, status, size, mtime_ns) '
+            'VALUES (?, ?, ?, ?, ?)', (path, fmt, status, size, mtime_ns))
+        run_id = cursor.lastrowid
+
+        self._conn.executemany(
+            'INSERT INTO params (run_id, name, num, text) '
+            'VALUES (?, ?, ?, ?)',
+            [(run_id, name, _to_number(value), value)
+             for name, value in params.items()])
+
+
+def _is_results_dir(filenames):
+    if any(name in filenames for name in _MARKERS):
+        return True
+
+    return any(name in filenames for name in _FORMATS)
+
+
+def _get_mtime_ns(dirpath, filenames):
+    # Files can be rewritten in place without changing the modification time
+    # of the directory, hence, the time of the latest file is used as well.
+    mtime_ns = os.stat(dirpath).st_mtime_ns
+    for name in filenames:
+        mtime_ns = max(mtime_ns,
+                       os.stat(os.path.join(dirpath, name)).st_mtime_ns)
+
+    return mtime_ns
+
+
+def _get_params_from_path(path):
+    params = {}
+
+    for component in path.split(os.sep):
+        if '=' in component:
+            name, value = component.split('=', 1)
+            name = name.rsplit('-', 1)[-1]
+            params[name.strip().lower()] = value.strip()
+
+    return params
+
+
+def _get_params_from_config(filename):
+    cp = ConfigParser()
+
+    try:
+        cp.read(filename)
+    except ConfigParserError:
+        return {}
+
+    params = {}
+    for section in cp.sections():
+        for name, value in cp[section].items():
+            params[name.lower()] = value
+
+    return params
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _make_clause(value):
+    if isinstance(value, tuple):
+        lo, hi = value
+        clauses, args = [], []
+        if lo is not None:
+            clauses.append('num >= ?')
+            args.append(lo - RTOL * abs(lo))
+        if hi is not None:
+            clauses.append('num <= ?')
+            args.append(hi + RTOL * abs(hi))
+        if not clauses:
+            clauses.append('num IS NOT NULL')
+        return ' AND '.join(clauses), args
+    elif isinstance(value, str):
+        return 'text = ?', [value]
+    else:
+        tol = RTOL * abs(value)
+        return 'num BETWEEN ? AND ?', [value - tol, value + tol]
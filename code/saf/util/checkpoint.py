@@ -0,0 +1,92 @@
+"""
+Checkpoints of simulations for restarting them.
+
+A checkpoint is an uncompressed `.npz` archive with the state of
+a simulation: the time step number, the time, the solution array and
+the state of the writer, that is, how much output was written when the
+checkpoint was made.
+The archive is written to a temporary file that replaces the previous
+checkpoint atomically, such that a simulation killed during writing
+leaves the previous checkpoint intact.
+
+"""
+import logging
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+FILENAME = 'checkpoint.npz'
+
+
+def save_checkpoint(outdir, state):
+    """Save the state of a simulation to the directory `outdir`.
+
+    Parameters
+    ----------
+    outdir : str
+        Directory with simulation results.
+    state : dict
+        Arrays or scalars to save. Must contain keys `time_step`, `time`
+        and `soln_data`.
+
+    Returns
+    -------
+    bool
+        True if the checkpoint was saved.
+
+    """
+    logger = logging.getLogger(__name__)
+    filename = os.path.join(outdir, FILENAME)
+
+    fd, tmp_filename = tempfile.mkstemp(dir=outdir, suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **state)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+    except OSError as e:
+        # Failed checkpoint should not stop the simulation.
+        logger.warning('Cannot write checkpoint `{}`: {}'.format(filename, e))
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        return False
+
+    return True
+
+
+def load_checkpoint(outdir):
+    """Load the latest checkpoint from the directory `outdir`.
+
+    Parameters
+    ----------
+    outdir : str
+        Directory with simulation results.
+
+    Returns
+    -------
+    dict or None
+        State of the simulation as saved by `save_checkpoint` or None
+        if there is no valid checkpoint in `outdir`.
+
+    """
+    filename = os.path.join(outdir, FILENAME)
+
+    if not os.path.isfile(filename):
+        return None
+
+    try:
+        with np.load(filename) as data:
+            state = {key: data[key] for key in data.files}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        logger = logging.getLogger(__name__)
+        logger.warning('Checkpoint `{}` is corrupted'.format(filename))
+        return None
+
+    state['time_step'] = int(state['time_step'])
+    state['time'] = float(state['time'])
+
+    return state
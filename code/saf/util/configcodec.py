@@ -0,0 +1,149 @@
+"""
+Compact binary serialization of configurations.
+
+Configurations are represented as dictionaries (see `Config.to_dict`) whose
+values are None, bool, int, float, str or nested dictionaries with string
+keys.
+`encode` converts such a dictionary to a compact byte string and `decode`
+converts it back; floats are stored as IEEE 754 doubles, hence, the round
+trip is exact.
+Keys are written in sorted order, so that equal dictionaries give equal
+byte strings, which can be used as keys of caches.
+
+"""
+import importlib
+import struct
+
+MAGIC = b'SAFC'
+
+# Version of the binary format.
+VERSION = 1
+
+_HEADER = struct.Struct('<4sB')
+_LENGTH = struct.Struct('<I')
+_SHORT_LENGTH = struct.Struct('<B')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+
+
+def encode(data):
+    """Encode the dictionary `data` to bytes."""
+    chunks = [_HEADER.pack(MAGIC, VERSION)]
+    _encode_value(data, chunks)
+
+    return b''.join(chunks)
+
+
+def decode(buf):
+    """Decode bytes returned by `encode` back to the dictionary."""
+    buf = bytes(buf)
+    magic, version = _HEADER.unpack_from(buf)
+
+    if magic != MAGIC:
+        raise ValueError('Data are not an encoded configuration')
+    if version != VERSION:
+        raise ValueError('Unsupported version {} of encoded configuration'
+                         .format(version))
+
+    value, offset = _decode_value(buf, _HEADER.size)
+
+    if offset != len(buf):
+        raise ValueError('Encoded configuration has trailing data')
+
+    return value
+
+
+def load_config(buf):
+    """Create a configuration object from the bytes of `Config.to_bytes`.
+
+    Unlike `Config.from_bytes`, the class of the configuration does not need
+    to be known in advance: it is imported by the name stored in the data.
+
+    """
+    data = decode(buf)
+    module_name, __, class_name = data['class'].rpartition('.')
+    cls = getattr(importlib.import_module(module_name), class_name)
+
+    return cls.from_dict(data)
+
+
+def to_builtin(value):
+    """Convert Numpy scalars in `value` to built-in types.
+
+    Setters of configurations keep the types of the assigned values, hence,
+    options can be Numpy scalars, for example, taken from a grid of
+    a parameter sweep built with `np.arange`. Nested dictionaries are
+    converted recursively.
+
+    """
+    if isinstance(value, dict):
+        return {key: to_builtin(v) for key, v in value.items()}
+
+    # Numpy is not imported here: its scalars are zero-dimensional objects
+    # with the method `item` that returns the equal built-in value.
+    if (type(value).__module__ == 'numpy' and
+            getattr(value, 'ndim', None) == 0):
+        return value.item()
+
+    return value
+
+
+def _encode_value(value, chunks):
+    if value is None:
+        chunks.append(b'N')
+    elif value is True:
+        chunks.append(b'T')
+    elif value is False:
+        chunks.append(b'F')
+    elif isinstance(value, int):
+        chunks.append(b'i' + _INT.pack(value))
+    elif isinstance(value, float):
+        chunks.append(b'd' + _FLOAT.pack(value))
+    elif isinstance(value, str):
+        raw = value.encode('utf-8')
+        # Names and most values are short strings.
+        if len(raw) < 256:
+            chunks.append(b's' + _SHORT_LENGTH.pack(len(raw)) + raw)
+        else:
+            chunks.append(b'S' + _LENGTH.pack(len(raw)) + raw)
+    elif isinstance(value, dict):
+        chunks.append(b'm' + _LENGTH.pack(len(value)))
+        for key in sorted(value):
+            if not isinstance(key, str):
+                raise TypeError('Keys must be strings')
+            _encode_value(key, chunks)
+            _encode_value(value[key], chunks)
+    else:
+        raise TypeError('Cannot encode value of type `{}`'.format(
+            type(value).__name__))
+
+
+def _decode_value(buf, offset):
+    tag = buf[offset:offset + 1]
+    offset += 1
+
+    if tag == b'N':
+        return None, offset
+    elif tag == b'T':
+        return True, offset
+    elif tag == b'F':
+        return False, offset
+    elif tag == b'i':
+        return _INT.unpack_from(buf, offset)[0], offset + _INT.size
+    elif tag == b'd':
+        return _FLOAT.unpack_from(buf, offset)[0], offset + _FLOAT.size
+    elif tag in (b's', b'S'):
+        fmt = _SHORT_LENGTH if tag == b's' else _LENGTH
+        length, = fmt.unpack_from(buf, offset)
+        offset += fmt.size
+        return buf[offset:offset + length].decode('utf-8'), offset + length
+    elif tag == b'm':
+        length, = _LENGTH.unpack_from(buf, offset)
+        offset += _LENGTH.size
+        result = {}
+        for __ in range(length):
+            key, offset = _decode_value(buf, offset)
+            result[key], offset = _decode_value(buf, offset)
+        return result, offset
+    else:
+        raise ValueError('Corrupted encoded configuration')
@@ -0,0 +1,220 @@
+"""
+Lossless compression of smooth floating-point time series.
+
+Consecutive values of a smooth series, such as detonation velocity or
+uniformly spaced time, share the sign, the exponent and the leading bits of
+the mantissa.
+The codec reinterprets the values as 64-bit integers and replaces them with
+their differences of first or second order, or with the XOR of consecutive
+values, so that most of the bytes become zero.
+The residuals are mapped to unsigned integers with the zigzag transform,
+their bytes are regrouped by significance (byte shuffling) and the result
+is compressed with zlib.
+All steps are exact integer operations, hence, the decoded values are
+bitwise identical to the original ones, and all steps are vectorized.
+
+A file is a sequence of blocks of at most `BLOCK_SIZE` rows.
+Every block starts with a header containing the number of rows and the
+first and the last values of the first column, which is the time, so that
+a window of the series is decoded without decoding other blocks.
+
+"""
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b'SAFDZ\x01'
+
+BLOCK_SIZE = 2**16
+
+# Transforms of the integer representation of the values.
+_XOR, _DELTA_1, _DELTA_2 = 0, 1, 2
+
+_FILE_HEADER = struct.Struct('<6sB')
+_BLOCK_HEADER = struct.Struct('<QddQ')
+_COLUMN_HEADER = struct.Struct('<BQ')
+
+
+def encode(values, level=6):
+    """Compress a one-dimensional array of floats to bytes.
+
+    All transforms are tried and the one giving the smallest result is used.
+
+    Parameters
+    ----------
+    values : array_like
+        Values to compress; they are converted to float64.
+    level : int, optional (default is 6)
+        Compression level of zlib.
+
+    Returns
+    -------
+    bytes
+        Compressed values, starting with a byte that identifies the transform.
+
+    """
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+
+    best = None
+    for mode in [_XOR, _DELTA_1, _DELTA_2]:
+        payload = zlib.compress(_shuffle(_forward(bits, mode)), level)
+        if best is None or len(payload) < len(best):
+            best = bytes([mode]) + payload
+
+    return best
+
+
+def decode(data, n):
+    """Decompress `n` values compressed with `encode`.
+
+    Returns
+    -------
+    ndarray
+        Array of `n` float64 values.
+
+    """
+    mode = data[0]
+    shuffled = np.frombuffer(zlib.decompress(data[1:]), dtype=np.uint8)
+
+    if shuffled.size != 8 * n:
+        raise ValueError('Corrupted data: expected {} values'.format(n))
+
+    residuals = _unshuffle(shuffled, n)
+
+    return _inverse(residuals, mode).view(np.float64)
+
+
+def write_table(f, data, level=6):
+    """Write a table of floats to the binary file `f`.
+
+    Parameters
+    ----------
+    f : file
+        File open for writing in binary mode.
+    data : array_like
+        Array of shape (nrows, ncols) whose first column is monotonically
+        increasing time.
+    level : int, optional (default is 6)
+        Compression level of zlib.
+
+    """
+    data = np.asarray(data, dtype=np.float64)
+    nrows, ncols = data.shape
+
+    f.write(_FILE_HEADER.pack(MAGIC, ncols))
+
+    for i in range(0, nrows, BLOCK_SIZE):
+        block = data[i:i + BLOCK_SIZE]
+        columns = [encode(block[:, j], level) for j in range(ncols)]
+        size = sum(_COLUMN_HEADER.size + len(c) for c in columns)
+
+        f.write(_BLOCK_HEADER.pack(len(block), block[0, 0], block[-1, 0],
+                                   size))
+        for j, c in enumerate(columns):
+            f.write(_COLUMN_HEADER.pack(j, len(c)))
+            f.write(c)
+
+
+def read_table(filename, t_start=None, t_end=None, columns=None):
+    """Read a table written by `write_table`.
+
+    Only the blocks that overlap with the time window are decoded.
+    Only the requested columns of these blocks are decoded.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the file.
+    t_start : float, optional
+        If given, the blocks with all times less than `t_start` are skipped.
+    t_end : float, optional
+        If given, the blocks with all times greater than `t_end` are skipped.
+    columns : list of int, optional
+        Indices of the columns to decode. By default, all columns are
+        decoded.
+
+    Returns
+    -------
+    ndarray
+        Array of shape (nrows, len(columns)) with the rows of the decoded
+        blocks. It must be sliced further to get exactly the window.
+
+    """
+    blocks = []
+
+    with open(filename, 'rb') as f:
+        magic, ncols = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('File `{}` is not written by the delta codec'
+                             .format(filename))
+        if columns is None:
+            columns = list(range(ncols))
+        position = {j: i for i, j in enumerate(columns)}
+
+        while True:
+            header = f.read(_BLOCK_HEADER.size)
+            if not header:
+                break
+            nrows, t_first, t_last, size = _BLOCK_HEADER.unpack(header)
+
+            if ((t_start is not None and t_last < t_start) or
+                    (t_end is not None and t_first > t_end)):
+                f.seek(size, 1)
+                continue
+
+            block = np.empty((nrows, len(columns)))
+            for __ in range(ncols):
+                j, length = _COLUMN_HEADER.unpack(
+                    f.read(_COLUMN_HEADER.size))
+                if j in position:
+                    block[:, position[j]] = decode(f.read(length), nrows)
+                else:
+                    f.seek(length, 1)
+            blocks.append(block)
+
+    if not blocks:
+        return np.empty((0, len(columns)))
+
+    return np.concatenate(blocks)
+
+
+def _forward(bits, mode):
+    if mode == _XOR:
+        residuals = bits.copy()
+        residuals[1:] ^= bits[:-1]
+        # XOR residuals are already non-negative and have leading zeros.
+        return residuals
+
+    residuals = bits.copy()
+    for k in range(mode):
+        # Unsigned arithmetic wraps around, hence, differences are exact.
+        residuals[k + 1:] = np.diff(residuals[k:])
+
+    signed = residuals.view(np.int64)
+    # Zigzag transform maps small negative numbers to small positive ones.
+    return (signed << 1).view(np.uint64) ^ (signed >> 63).view(np.uint64)
+
+
+def _inverse(residuals, mode):
+    if mode == _XOR:
+        return np.bitwise_xor.accumulate(residuals)
+
+    signed = (residuals >> np.uint64(1)).view(np.int64)
+    signed ^= -(residuals & np.uint64(1)).view(np.int64)
+    bits = signed.view(np.uint64)
+
+    for k in reversed(range(mode)):
+        bits[k:] = np.cumsum(bits[k:], dtype=np.uint64)
+
+    return bits
+
+
+def _shuffle(values):
+    # Bytes of the same significance are stored together, so that long runs
+    # of zero high bytes are compressed efficiently.
+    return values.view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(shuffled, n):
+    return np.ascontiguousarray(shuffled.reshape(8, n).T).view(np.uint64)[:, 0]
@@ -0,0 +1,147 @@
+"""
+Online detection of local extrema of time series."""
+import numpy as np
+
+
+class ExtremaTracker(object):
+    """Find local minima and maxima of a time series as it is generated.
+
+    A value is a local maximum (minimum) if it is strictly greater (less)
+    than `order` values on each side of it, as in `scipy.signal.argrelmax`
+    (`scipy.signal.argrelmin`).
+    Unlike the scipy functions, values that have less than `order`
+    neighbours on one side, that is, close to the ends of the series,
+    are never considered extrema.
+
+    Values are accumulated in a buffer and processed in blocks with
+    vectorized comparisons, so that only `buffer_size + 2 * order` values
+    are kept in memory irrespective of the length of the series.
+
+    Parameters
+    ----------
+    order : int, optional (default is 1)
+        Number of values on each side of a value to compare with.
+    start_time : float, optional (default is 0.0)
+        Values with time less than `start_time` are ignored.
+    buffer_size : int, optional (default is 1000)
+        Number of values that are processed at once.
+
+    """
+
+    def __init__(self, order=1, start_time=0.0, buffer_size=1000):
+        if order < 1:
+            raise ValueError('Parameter `order` must be positive')
+
+        self._order = order
+        self._start_time = start_time
+        self._buffer_size = buffer_size
+
+        # Buffer keeps `2 * order` values from the previous block whose
+        # neighbourhoods were not complete, followed by the new values.
+        self._buffer = np.empty((buffer_size + 2 * order, 2))
+        self._counter = 0
+
+        self._maxima = []
+        self._minima = []
+
+    @property
+    def order(self):
+        return self._order
+
+    @property
+    def start_time(self):
+        return self._start_time
+
+    def append(self, time, value):
+        """Append the value of the time series at time `time`."""
+        if time < self._start_time:
+            return
+
+        self._buffer[self._counter] = (time, value)
+        self._counter += 1
+
+        if self._counter == len(self._buffer):
+            self._process()
+
+    def get_maxima(self):
+        """Return times and values of local maxima found so far."""
+        self._process()
+        return self._collect(self._maxima)
+
+    def get_minima(self):
+        """Return times and values of local minima found so far."""
+        self._process()
+        return self._collect(self._minima)
+
+    def save(self, filename):
+        """Save extrema to the `.npz` archive `filename`.
+
+        The archive contains arrays `t_max`, `d_max`, `t_min`, `d_min`
+        with times and values of maxima and minima, respectively, and
+        the parameters `order` and `start_time` of the tracker.
+
+        """
+        t_max, d_max = self.get_maxima()
+        t_min, d_min = self.get_minima()
+
+        np.savez(filename, t_max=t_max, d_max=d_max, t_min=t_min, d_min=d_min,
+                 order=self._order, start_time=self._start_time)
+
+    def get_state(self):
+        """Return the state of the tracker as a dictionary of arrays.
+
+        The state can be saved in a checkpoint and restored with `set_state`
+        to continue tracking in a restarted simulation.
+
+        """
+        t_max, d_max = self._collect(self._maxima)
+        t_min, d_min = self._collect(self._minima)
+
+        return {
+            'maxima': np.column_stack((t_max, d_max)),
+            'minima': np.column_stack((t_min, d_min)),
+            'pending': self._buffer[:self._counter].copy(),
+        }
+
+    def set_state(self, state):
+        """Restore the state returned by `get_state`."""
+        self._maxima = [np.asarray(state['maxima']).reshape(-1, 2)]
+        self._minima = [np.asarray(state['minima']).reshape(-1, 2)]
+
+        pending = np.asarray(state['pending']).reshape(-1, 2)
+        self._counter = len(pending)
+        self._buffer[:self._counter] = pending
+
+    def _process(self):
+        order = self._order
+        n = self._counter
+
+        if n <= 2 * order:
+            return
+
+        data = self._buffer[:n]
+        values = data[:, 1]
+        center = values[order:n - order]
+        is_max = np.ones(len(center), dtype=bool)
+        is_min = np.ones(len(center), dtype=bool)
+
+        for k in range(1, order + 1):
+            left = values[order - k:n - order - k]
+            right = values[order + k:n - order + k]
+            is_max &= (center > left) & (center > right)
+            is_min &= (center < left) & (center < right)
+
+        self._maxima.append(data[order:n - order][is_max].copy())
+        self._minima.append(data[order:n - order][is_min].copy())
+
+        # Keep the values whose neighbourhoods are not complete yet.
+        self._buffer[:2 * order] = data[n - 2 * order:]
+        self._counter = 2 * order
+
+    def _collect(self, blocks):
+        if blocks:
+            data = np.concatenate(blocks)
+        else:
+            data = np.empty((0, 2))
+
+        return data[:, 0], data[:, 1]
@@ -0,0 +1,105 @@
+"""
+Pool of open HDF5 files shared between readers."""
+import collections
+import contextlib
+import threading
+
+import h5py
+
+
+class HDF5FilePool(object):
+    """Keep HDF5 files open for reading to reuse them between readers.
+
+    Opening an HDF5 file requires reading its superblock and metadata, which
+    dominates the cost of reading small datasets from many files, for example,
+    when a parameter sweep is postprocessed in one process.
+    The pool keeps at most `maxsize` files open and closes the least recently
+    used file when this limit is exceeded.
+    The pool can be shared between threads: a file is used between entering
+    and leaving the context of `open`, and an evicted file is closed only
+    when the last thread that uses it leaves this context.
+
+    Parameters
+    ----------
+    maxsize : int, optional (default is 64)
+        Maximum number of simultaneously open files.
+
+    Examples
+    --------
+    >>> with HDF5FilePool() as pool:
+    ...     for d in dirs:
+    ...         r = Reader(d, file_pool=pool)
+    ...         t, d = r.get_time_and_detonation_velocity(t_start=900)
+
+    """
+
+    def __init__(self, maxsize=64):
+        if maxsize < 1:
+            raise ValueError('Parameter `maxsize` must be positive')
+
+        self._maxsize = maxsize
+        self._files = collections.OrderedDict()
+        # Numbers of users of the files in use, by the identifiers of files,
+        # and evicted files that are closed when they are released.
+        self._users = {}
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def open(self, filename):
+        """Return the context with the file `filename` opened for reading."""
+        fh = self._acquire(filename)
+        try:
+            yield fh
+        finally:
+            self._release(fh)
+
+    def close(self):
+        """Close all open files.
+
+        Files that are still in use are closed when they are released.
+
+        """
+        with self._lock:
+            while self._files:
+                __, fh = self._files.popitem()
+                self._retire(fh)
+
+    def _acquire(self, filename):
+        with self._lock:
+            if filename in self._files:
+                self._files.move_to_end(filename)
+                fh = self._files[filename]
+            else:
+                fh = h5py.File(filename, 'r')
+                self._files[filename] = fh
+
+            self._users[id(fh)] = self._users.get(id(fh), 0) + 1
+
+            while len(self._files) > self._maxsize:
+                __, evicted = self._files.popitem(last=False)
+                self._retire(evicted)
+
+            return fh
+
+    def _release(self, fh):
+        with self._lock:
+            self._users[id(fh)] -= 1
+            if self._users[id(fh)] == 0:
+                del self._users[id(fh)]
+                if id(fh) in self._retired:
+                    del self._retired[id(fh)]
+                    fh.close()
+
+    def _retire(self, fh):
+        # The lock must be held by the caller.
+        if id(fh) in self._users:
+            self._retired[id(fh)] = fh
+        else:
+            fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
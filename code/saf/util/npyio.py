@@ -0,0 +1,216 @@
+"""
+Incremental writing of arrays in the Numpy `.npy` format.
+
+The `.npy` format [1]_ is a short header followed by the raw array data.
+As the data of a C-ordered array are stored row by row, an array can be
+written incrementally if the header reserves enough space for the final shape
+and is rewritten when the number of rows is known.
+The resulting file can be memory-mapped with `np.load(fn, mmap_mode='r')`.
+
+Archives written with `np.savez` store their members without compression,
+hence, the members can be memory-mapped as well, see `load_npz_mmap`.
+
+References
+----------
+.. [1] https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+
+"""
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+# Total length of the header, including the magic string.
+# It is a multiple of 64 bytes, as recommended by the format specification,
+# and leaves enough room for any realistic shape.
+HEADER_LENGTH = 128
+
+
+def _render_header(shape, dtype):
+    header = {
+        'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        'fortran_order': False,
+        'shape': tuple(shape),
+    }
+    header = repr(header).encode('latin1')
+    magic = np.lib.format.magic(1, 0)
+    # Magic string, two bytes of header length and newline at the end.
+    padding = HEADER_LENGTH - len(magic) - 2 - len(header) - 1
+
+    if padding < 0:
+        raise ValueError('Shape {} does not fit into the header'.format(shape))
+
+    header_len = (len(header) + padding + 1).to_bytes(2, 'little')
+
+    return magic + header_len + header + b' ' * padding + b'\n'
+
+
+class NpyAppender(object):
+    """Append rows of a two-dimensional array to a `.npy` file.
+
+    Rows are accumulated in a buffer of `buffer_size` rows and written to disk
+    as raw binary blocks when the buffer is full.
+    The header of the file is updated after every block and in `flush` and
+    `close`, so that the file is a valid `.npy` file with all rows written
+    so far, even if the process is killed.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the file to write.
+    ncols : int
+        Number of columns in the array.
+    dtype : data-type, optional (default is `np.float64`)
+        Data type of the array.
+    buffer_size : int, optional (default is 1000)
+        Number of rows that are accumulated before writing them to disk.
+    nrows : int, optional (default is 0)
+        Number of rows of the existing file `filename`, written previously
+        by `NpyAppender`, that are kept; the rows after them are discarded
+        and new rows are appended.
+        If zero, the file is created anew.
+
+    """
+
+    def __init__(self, filename, ncols, dtype=np.float64, buffer_size=1000,
+                 nrows=0):
+        self._filename = filename
+        self._ncols = ncols
+        self._dtype = np.dtype(dtype)
+        self._buffer = np.empty((buffer_size, ncols), dtype=self._dtype)
+        self._buffer_size = buffer_size
+        self._counter = 0
+        self._nrows_on_disk = 0
+
+        if nrows == 0:
+            self._file = open(filename, 'wb')
+            self._file.write(_render_header((0, ncols), self._dtype))
+        else:
+            self._reopen(nrows)
+
+    @property
+    def nrows(self):
+        """Number of rows appended so far."""
+        return self._nrows_on_disk + self._counter
+
+    def append(self, row):
+        """Append a single row to the array."""
+        self._buffer[self._counter] = row
+        self._counter += 1
+
+        if self._counter == self._buffer_size:
+            self._write_buffer()
+
+    def flush(self):
+        """Write buffered rows and the header to disk."""
+        self._write_buffer()
+        self._write_header()
+        self._file.flush()
+
+    def close(self):
+        """Finalize the file."""
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+
+    def _reopen(self, nrows):
+        self._file = open(self._filename, 'r+b')
+
+        version = np.lib.format.read_magic(self._file)
+        if version != (1, 0):
+            raise ValueError('File was not written by `NpyAppender`')
+        shape, __, dtype = np.lib.format.read_array_header_1_0(self._file)
+
+        if (self._file.tell() != HEADER_LENGTH or dtype != self._dtype or
+                shape[1:] != (self._ncols,)):
+            raise ValueError('File was not written by `NpyAppender`')
+
+        row_size = self._ncols * self._dtype.itemsize
+        size = HEADER_LENGTH + nrows * row_size
+
+        if os.path.getsize(self._filename) < size:
+            raise ValueError('File has less than {} rows'.format(nrows))
+
+        self._file.truncate(size)
+        self._nrows_on_disk = nrows
+        self._write_header()
+
+    def _write_buffer(self):
+        if self._counter == 0:
+            return
+
+        self._file.write(self._buffer[:self._counter].tobytes())
+        self._nrows_on_disk += self._counter
+        self._counter = 0
+        self._write_header()
+
+    def _write_header(self):
+        shape = (self._nrows_on_disk, self._ncols)
+        self._file.seek(0, os.SEEK_SET)
+        self._file.write(_render_header(shape, self._dtype))
+        self._file.seek(0, os.SEEK_END)
+
+
+def load_npz_mmap(filename):
+    """Memory-map the arrays stored in the `.npz` archive `filename`.
+
+    Members that are stored without compression (as `np.savez` does) are
+    returned as read-only memory maps, so that only the accessed parts
+    of the arrays are read from disk.
+    Compressed members (as written by `np.savez_compressed`) are read into
+    memory.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the `.npz` archive.
+
+    Returns
+    -------
+    dict
+        Arrays of the archive accessible by their names.
+
+    """
+    result = {}
+
+    with zipfile.ZipFile(filename) as zf, open(filename, 'rb') as f:
+        for info in zf.infolist():
+            if not info.filename.endswith('.npy'):
+                continue
+
+            name = info.filename[:-len('.npy')]
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    result[name] = np.lib.format.read_array(member)
+                continue
+
+            # Local file header has fixed length of 30 bytes followed by
+            # the file name and the extra field.
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(f)
+            else:
+                header = np.lib.format.read_array_header_2_0(f)
+            shape, fortran_order, dtype = header
+            order = 'F' if fortran_order else 'C'
+
+            if dtype.hasobject:
+                raise ValueError('Cannot memory-map object arrays')
+
+            if np.prod(shape) == 0:
+                result[name] = np.empty(shape, dtype=dtype, order=order)
+            else:
+                result[name] = np.memmap(filename, dtype=dtype, mode='r',
+                                         offset=f.tell(), shape=shape,
+                                         order=order)
+
+    return result
@@ -0,0 +1,228 @@
+"""
+Index of profiles written as text files.
+
+Text writers save every profile to a separate file
+`profiles/profile-<time_step>.txt` with a header that contains the time step
+and the time of the profile.
+Listing the directory and parsing the headers of thousands of such files
+is slow, hence, `ProfileIndex` does it once and saves the time steps, times
+and offsets of the data in the files to `profiles.index.npz` next to the
+`profiles` directory.
+The index is rebuilt when the modification time of the `profiles` directory
+changes, that is, when profiles are added or removed.
+
+"""
+import logging
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from .textio import _count_tokens
+
+INDEX_FILENAME = 'profiles.index.npz'
+
+_PROFILE_FILENAME = re.compile(r'^profile-(\d+)\.txt$')
+_TIME = re.compile(r'(?:^#|\s)time\s+(\S+)')
+
+
+class ProfileIndex(object):
+    """Random access to the profiles saved in the text format.
+
+    Parameters
+    ----------
+    results_dir : str
+        Path to the directory with simulation results.
+    cache : bool, optional (default is True)
+        Whether to save the index to disk to reuse it later.
+
+    Raises
+    ------
+    ValueError
+        If there is no `profiles` directory in `results_dir`.
+
+    """
+
+    def __init__(self, results_dir, cache=True):
+        self._profiles_dir = os.path.join(results_dir, 'profiles')
+        self._index_filename = os.path.join(results_dir, INDEX_FILENAME)
+
+        if not os.path.isdir(self._profiles_dir):
+            raise ValueError('Directory `{}` does not exist'.format(
+                self._profiles_dir))
+
+        mtime_ns = os.stat(self._profiles_dir).st_mtime_ns
+        index = self._load(mtime_ns)
+
+        if index is None:
+            index = self._build()
+            if cache:
+                self._save(index, mtime_ns)
+
+        self._time_steps = index['time_step']
+        self._times = index['time']
+        self._offsets = index['offset']
+
+    @property
+    def time_steps(self):
+        """Sorted array of the time steps of the profiles."""
+        return self._time_steps
+
+    @property
+    def times(self):
+        """Array of the times of the profiles."""
+        return self._times
+
+    def read(self, time_steps=None):
+        """Read several profiles at once.
+
+        Data of all profiles are read into one buffer and converted
+        to numbers with one vectorized call.
+
+        Parameters
+        ----------
+        time_steps : array_like of int, optional
+            Time steps of the profiles. If None, all profiles are read.
+
+        Returns
+        -------
+        t : ndarray
+            Times of the profiles.
+        data : ndarray
+            Array of shape (n_profiles, n_grid, n_columns).
+
+        Raises
+        ------
+        ValueError
+            If there are no profiles for some of the time steps,
+            profiles have different sizes or cannot be parsed.
+
+        """
+        if time_steps is None:
+            rows = np.arange(len(self._time_steps))
+        else:
+            rows = self._find(time_steps)
+
+        chunks = []
+        ncols = None
+        nrows = None
+
+        for row in rows:
+            filename = self._get_filename(self._time_steps[row])
+
+            with open(filename, 'rb') as f:
+                f.seek(self._offsets[row])
+                chunk = f.read()
+
+            if ncols is None:
+                ncols = len(chunk[:chunk.find(b'\n')].split())
+
+            chunk = chunk.rstrip() + b'\n'
+            chunk_nrows = chunk.count(b'\n')
+            if nrows is None:
+                nrows = chunk_nrows
+            elif chunk_nrows != nrows:
+                raise ValueError('Profiles have different sizes')
+            chunks.append(chunk)
+
+        if not chunks:
+            return np.empty(0), np.empty((0, 0, 0))
+
+        buf = b''.join(chunks)
+        values = np.fromstring(buf, dtype=np.float64, sep=' ')
+
+        # Parsing stops at the first malformed value, hence, the number of
+        # values is compared with the number of tokens.
+        if (ncols == 0 or values.size != len(rows) * nrows * ncols or
+                values.size != _count_tokens(buf)):
+            raise ValueError('Cannot parse the profiles')
+
+        data = values.reshape(len(rows), nrows, ncols)
+
+        return self._times[rows], data
+
+    def _find(self, time_steps):
+        time_steps = np.atleast_1d(np.asarray(time_steps, dtype=np.int64))
+        rows = np.searchsorted(self._time_steps, time_steps)
+
+        found = rows < len(self._time_steps)
+        found[found] = self._time_steps[rows[found]] == time_steps[found]
+
+        if not np.all(found):
+            raise ValueError('Profiles for time steps {} are not found'.format(
+                time_steps[~found]))
+
+        return rows
+
+    def _get_filename(self, time_step):
+        return os.path.join(self._profiles_dir,
+                            'profile-{:d}.txt'.format(time_step))
+
+    def _build(self):
+        time_steps = []
+
+        for name in os.listdir(self._profiles_dir):
+            match = _PROFILE_FILENAME.match(name)
+            if match:
+                time_steps.append(int(match.group(1)))
+
+        time_steps = np.array(sorted(time_steps), dtype=np.int64)
+        times = np.empty(len(time_steps))
+        offsets = np.empty(len(time_steps), dtype=np.int64)
+
+        for i, time_step in enumerate(time_steps):
+            times[i], offsets[i] = _read_header(self._get_filename(time_step))
+
+        return {'time_step': time_steps, 'time': times, 'offset': offsets}
+
+    def _load(self, mtime_ns):
+        if not os.path.isfile(self._index_filename):
+            return None
+
+        try:
+            with np.load(self._index_filename) as data:
+                if int(data['mtime_ns']) != mtime_ns:
+                    return None
+                return {key: data[key]
+                        for key in ['time_step', 'time', 'offset']}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, index, mtime_ns):
+        logger = logging.getLogger(__name__)
+        dirname = os.path.dirname(self._index_filename)
+
+        try:
+            fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        except OSError as e:
+            # Results can be in a read-only location, then we just do not
+            # save the index.
+            logger.debug('Cannot write profiles index: {}'.format(e))
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, mtime_ns=mtime_ns, **index)
+            os.replace(tmp_filename, self._index_filename)
+        except OSError as e:
+            logger.debug('Cannot write profiles index: {}'.format(e))
+            os.remove(tmp_filename)
+
+
+def _read_header(filename):
+    """Return the time of the profile and the offset of its data."""
+    time = np.nan
+    offset = 0
+
+    with open(filename, 'rb') as f:
+        for line in f:
+            if not line.startswith(b'#'):
+                break
+            offset += len(line)
+
+            match = _TIME.search(line.decode('ascii', 'replace'))
+            if match:
+                time = float(match.group(1))
+
+    return time, offset
@@ -0,0 +1,260 @@
+"""
+Content-addressed store of simulation results.
+
+Parameter sweeps often rerun simulations with exactly the same configuration,
+for example, when a bisection revisits a value of a parameter or when two
+experiments share runs.
+`ResultStore` keeps the results of every simulation in a directory named
+after the hash of its configuration and of the code that computed it,
+so that a simulation is run only if there are no results for it yet.
+
+The key of a run is the SHA-256 hash of the canonical JSON representation
+of the kind of the simulation, the class of the configuration, all options
+of the configuration, and the version of the code.
+Options that do not change the results (see `IGNORED_OPTIONS`) are excluded.
+Integer and float values give different keys, as some options change meaning
+with the type, except for the options that are always read as floats from
+configuration files (see `FLOAT_OPTIONS`): for them, for example,
+`final_time = 1000` and `final_time = 1000.0` give the same key.
+By default, the version of the code is the hash of all source files
+of the package `saf`, hence, any change of the code invalidates the stored
+results.
+
+Results are computed in a temporary directory inside the store, which is
+renamed to its final name when the simulation finishes successfully, so that
+incomplete results are never reused, and several processes can share
+a store.
+
+Examples
+--------
+>>> from saf.action import solve
+>>> store = ResultStore('../_result-store')
+>>> outdir = store.solve('linear', config, solve, log_to_file=True)
+>>> r = Reader(outdir)
+
+"""
+import hashlib
+import json
+import numbers
+import os
+import shutil
+import tempfile
+
+METADATA_FILENAME = 'store.json'
+
+# Options that affect only how a simulation is run, not its results.
+IGNORED_OPTIONS = frozenset(['play_animation', 'checkpoint_every'])
+
+# Options that are read as floats from configuration files, hence, integer
+# values of them mean the same as the equal float values.
+FLOAT_OPTIONS = frozenset([
+    'dt', 'extrema_start_time', 'f', 'final_time', 'ic_amplitude',
+    'lambda_tol', 'output_interval', 'output_start_time', 'q', 'theta',
+    'truncation_coef', 'weno_eps',
+])
+
+_code_fingerprint = None
+
+
+def get_code_fingerprint():
+    """Return the hash of all source files of the package `saf`."""
+    global _code_fingerprint
+
+    if _code_fingerprint is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        h = hashlib.sha256()
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if not name.endswith(('.py', '.pyx', '.pxd', '.c', '.h')):
+                    continue
+                path = os.path.join(dirpath, name)
+                h.update(os.path.relpath(path, root).encode('utf-8'))
+                with open(path, 'rb') as f:
+                    h.update(f.read())
+
+        _code_fingerprint = h.hexdigest()
+
+    return _code_fingerprint
+
+
+def get_config_key(kind, config, code_version=None):
+    """Return the key of the results of the simulation with `config`.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of the simulation, for example, 'linear' or 'nonlinear'.
+    config : Config
+        Configuration of the simulation. All options must be specified.
+    code_version : str, optional
+        Version of the code. By default, `get_code_fingerprint()` is used.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 hash.
+
+    """
+    if code_version is None:
+        code_version = get_code_fingerprint()
+
+    return hashlib.sha256(
+        _canonical_json(kind, config, code_version)).hexdigest()
+
+
+class ResultStore(object):
+    """Store of simulation results addressed by configuration.
+
+    Parameters
+    ----------
+    root : str
+        Directory of the store. It is created if it does not exist.
+    code_version : str, optional
+        Version of the code that is a part of the keys of the results.
+        By default, it is the hash of the source files of `saf`.
+        Pass, for example, a release tag to reuse results across changes
+        of the code that do not affect them.
+
+    """
+
+    def __init__(self, root, code_version=None):
+        if code_version is None:
+            code_version = get_code_fingerprint()
+
+        self._root = root
+        self._code_version = code_version
+
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def root(self):
+        return self._root
+
+    def key(self, kind, config):
+        """Return the key of the results of the simulation."""
+        return get_config_key(kind, config, self._code_version)
+
+    def path(self, kind, config):
+        """Return the directory for the results of the simulation."""
+        key = self.key(kind, config)
+        return os.path.join(self._root, key[:2], key)
+
+    def get(self, kind, config):
+        """Return the directory with the results or None if there is none."""
+        path = self.path(kind, config)
+
+        if os.path.isfile(os.path.join(path, METADATA_FILENAME)):
+            return path
+
+        return None
+
+    def solve(self, kind, config, solve, postprocess=None, **kwargs):
+        """Return the directory with results, running the simulation if needed.
+
+        Parameters
+        ----------
+        kind : str
+            Kind of the simulation, for example, 'linear' or 'nonlinear'.
+        config : Config
+            Configuration of the simulation.
+        solve : callable
+            Function `solve(kind, config, outdir, **kwargs)` that runs the
+            simulation and writes results to `outdir`,
+            for example, `saf.action.solve`.
+        postprocess : callable, optional
+            Function `postprocess(outdir)` that is called after `solve`;
+            its output is stored together with the results.
+        **kwargs
+            Keyword arguments passed to `solve`.
+
+        Returns
+        -------
+        str
+            Directory with the results.
+
+        """
+        path = self.get(kind, config)
+        if path is not None:
+            return path
+
+        path = self.path(kind, config)
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+
+        tmp_path = tempfile.mkdtemp(dir=parent, suffix='.tmp')
+
+        try:
+            solve(kind, config, tmp_path, **kwargs)
+            if postprocess is not None:
+                postprocess(tmp_path)
+
+            metadata = json.loads(
+                _canonical_json(kind, config, self._code_version))
+            metadata['key'] = os.path.basename(path)
+            with open(os.path.join(tmp_path, METADATA_FILENAME), 'w') as f:
+                json.dump(metadata, f, indent=4, sort_keys=True)
+
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                # Another process stored the same results in the meantime.
+                if self.get(kind, config) is None:
+                    raise
+                shutil.rmtree(tmp_path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        return path
+
+
+def _canonical_json(kind, config, code_version):
+    config._validate()
+
+    options = {}
+    for section, values in config.to_dict()['options'].items():
+        options[section] = {
+            name: float(value) if (name in FLOAT_OPTIONS and
+                                   _is_number(value)) else _normalize(value)
+            for name, value in values.items()
+            if name not in IGNORED_OPTIONS}
+
+    # Attributes that are assigned to the configuration but are not its
+    # options are taken into account too, as the solver can use them.
+    extra = {name: _normalize(value) for name, value in vars(config).items()
+             if not name.startswith('_')}
+
+    cls = type(config)
+    data = {
+        'kind': kind,
+        'config_class': cls.__module__ + '.' + cls.__name__,
+        'options': options,
+        'extra': extra,
+        'code_version': code_version,
+    }
+
+    return json.dumps(data, sort_keys=True, separators=(',', ':'),
+                      default=repr).encode('utf-8')
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _normalize(value):
+    # Numpy scalars are converted to the built-in types of the same kind,
+    # such that the type of a value is kept in its JSON representation.
+    if isinstance(value, bool):
+        return value
+    elif isinstance(value, numbers.Integral):
+        return int(value)
+    elif isinstance(value, numbers.Real):
+        return float(value)
+    elif isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    elif isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+
+    return value
@@ -0,0 +1,78 @@
+"""
+Binary sidecar cache for text tables.
+
+Parsing text files is much slower than memory-mapping binary files.
+When a text table `<name>` is read through `read_table_cached` for the first
+time, its parsed content is written next to it as `<name>.cache.npz`
+together with the size and modification time of the text file.
+Subsequent reads memory-map the sidecar as long as the size and modification
+time of the text file do not change.
+The text files themselves are never modified.
+
+"""
+import logging
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from .npyio import load_npz_mmap
+from .textio import read_table
+
+SUFFIX = '.cache.npz'
+
+
+def read_table_cached(filename):
+    """Read a text table using a binary sidecar cache.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the text file.
+
+    Returns
+    -------
+    ndarray
+        Array of shape (nrows, ncols). It is a read-only memory-mapped array
+        if the sidecar is valid.
+
+    """
+    sidecar = filename + SUFFIX
+    stat = os.stat(filename)
+
+    if os.path.exists(sidecar):
+        try:
+            cached = load_npz_mmap(sidecar)
+            if (int(cached['source_size']) == stat.st_size and
+                    int(cached['source_mtime_ns']) == stat.st_mtime_ns):
+                return cached['data']
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+
+    data = read_table(filename)
+    _write_sidecar(sidecar, data, stat)
+
+    return data
+
+
+def _write_sidecar(sidecar, data, stat):
+    logger = logging.getLogger(__name__)
+    dirname = os.path.dirname(sidecar) or os.curdir
+
+    try:
+        fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    except OSError as e:
+        # Results can be in a read-only location, then we just do not cache.
+        logger.debug('Cannot write cache `{}`: {}'.format(sidecar, e))
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, data=data,
+                     source_size=stat.st_size,
+                     source_mtime_ns=stat.st_mtime_ns)
+        os.replace(tmp_filename, sidecar)
+    except OSError as e:
+        logger.debug('Cannot write cache `{}`: {}'.format(sidecar, e))
+        os.remove(tmp_filename)
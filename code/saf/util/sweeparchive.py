@@ -0,0 +1,162 @@
+"""
+Single-file archive of the results of a parameter sweep.
+
+Runs of a sweep produce time series of different lengths.
+Storing them as a Numpy object array requires pickling, which is slow,
+unsafe and prevents memory mapping.
+Instead, the archive stores every series of all runs in one contiguous
+array of values together with an array of offsets, such that the values of
+run `i` are `values[offsets[i]:offsets[i + 1]]`, and the parameters of the
+runs as one array per parameter.
+
+The archive is an uncompressed `.npz` file with members
+`param_<name>`, `values_<name>` and `offsets_<name>`, hence,
+it is memory-mapped by `SweepArchive` without reading it into memory.
+
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from .npyio import load_npz_mmap
+
+
+def write_sweep_archive(filename, params, series):
+    """Write results of a parameter sweep to the archive `filename`.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the archive.
+    params : dict
+        Parameters of the runs: arrays of length `n_runs` by name.
+    series : dict
+        Data of the runs: lists of `n_runs` one-dimensional arrays of
+        arbitrary lengths by name.
+
+    """
+    nruns = None
+    arrays = {}
+
+    for name, values in params.items():
+        values = np.asarray(values)
+        if nruns is None:
+            nruns = len(values)
+        if values.shape != (nruns,):
+            raise ValueError('Parameter `{}` must have {} values'.format(
+                name, nruns))
+        arrays['param_' + name] = values
+
+    for name, runs in series.items():
+        if nruns is None:
+            nruns = len(runs)
+        if len(runs) != nruns:
+            raise ValueError('Series `{}` must have {} runs'.format(
+                name, nruns))
+
+        lengths = [len(run) for run in runs]
+        offsets = np.zeros(nruns + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        if runs:
+            values = np.concatenate([np.ravel(run) for run in runs])
+        else:
+            values = np.empty(0)
+
+        arrays['values_' + name] = values
+        arrays['offsets_' + name] = offsets
+
+    dirname = os.path.dirname(filename) or os.curdir
+    fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.remove(tmp_filename)
+        raise
+
+
+class SweepArchive(object):
+    """Read the archive written by `write_sweep_archive`.
+
+    All arrays are memory-mapped, so opening an archive is cheap and
+    `get` returns views without copying.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the archive.
+
+    """
+
+    def __init__(self, filename):
+        arrays = load_npz_mmap(filename)
+
+        self._params = {}
+        self._values = {}
+        self._offsets = {}
+
+        for key, value in arrays.items():
+            kind, __, name = key.partition('_')
+            if kind == 'param':
+                self._params[name] = value
+            elif kind == 'values':
+                self._values[name] = value
+            elif kind == 'offsets':
+                self._offsets[name] = value
+
+        if not self._values and not self._params:
+            raise ValueError('File `{}` is not a sweep archive'.format(
+                filename))
+
+    def __len__(self):
+        for offsets in self._offsets.values():
+            return len(offsets) - 1
+        for values in self._params.values():
+            return len(values)
+
+    @property
+    def params(self):
+        """Parameters of the runs as arrays by name."""
+        return self._params
+
+    @property
+    def series_names(self):
+        """Names of the series stored in the archive."""
+        return sorted(self._values)
+
+    def get(self, name, i):
+        """Return the series `name` of the run `i` without copying it."""
+        offsets = self._offsets[name]
+        return self._values[name][offsets[i]:offsets[i + 1]]
+
+    def get_all(self, name):
+        """Return the series `name` of all runs as a list of views."""
+        return [self.get(name, i) for i in range(len(self))]
+
+    def lengths(self, name):
+        """Return the lengths of the series `name` of all runs."""
+        return np.diff(self._offsets[name])
+
+    def reduce(self, name, ufunc=np.add):
+        """Reduce the series `name` of every run with `ufunc`.
+
+        For example, `reduce('D', np.maximum)` returns the maximum of each
+        series.
+        The reduction is done with one vectorized call over the whole sweep.
+        Series must not be empty.
+
+        """
+        offsets = self._offsets[name]
+
+        if np.any(np.diff(offsets) == 0):
+            raise ValueError('Cannot reduce empty series')
+
+        return ufunc.reduceat(self._values[name], offsets[:-1])
+
+    def mean(self, name):
+        """Return the mean value of the series `name` of every run."""
+        return self.reduce(name) / self.lengths(name)
@@ -0,0 +1,247 @@
+"""
+Random access to the members of tar archives without extraction.
+
+Simulation results are distributed as (possibly gzip-compressed) tar
+archives of hundreds of megabytes, while a figure usually needs only a few
+files from them.
+`TarArchive` scans the archive once and saves the offsets and sizes of all
+its regular files to the sidecar `<archive>.index.json` together with
+the size and modification time of the archive.
+Subsequent reads use the index to read only the requested members.
+
+Uncompressed archives are read by seeking directly to the members.
+Compressed archives cannot be seeked, so they are decompressed on the fly
+without writing anything to disk; `read_many` reads several members
+in one forward pass over the archive.
+
+"""
+import bz2
+import gzip
+import io
+import json
+import logging
+import lzma
+import os
+import tarfile
+import tempfile
+import threading
+
+import numpy as np
+
+SUFFIX = '.index.json'
+
+_OPENERS = [
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+]
+
+
+class TarArchive(object):
+    """Read members of the tar archive `filename` on demand.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the tar archive, uncompressed or compressed with gzip,
+        bzip2 or xz.
+    cache : bool, optional (default is True)
+        Whether to save the index of the archive to disk to reuse it later.
+
+    Examples
+    --------
+    >>> archive = TarArchive('time-series.tar.gz')
+    >>> data = archive.load_npz(
+    ...     '_output-cache/N12=1280/theta=0.950/detonation-velocity.npz')
+    >>> t, d = data['t'], data['d']
+
+    """
+
+    def __init__(self, filename, cache=True):
+        self._filename = filename
+        self._index_filename = filename + SUFFIX
+        self._open = _get_opener(filename)
+        self._file = None
+        self._lock = threading.Lock()
+
+        stat = os.stat(filename)
+        members = self._load(stat)
+
+        if members is None:
+            members = self._build()
+            if cache:
+                self._save(members, stat)
+
+        self._members = members
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def names(self):
+        """Sorted list of the names of regular files in the archive."""
+        return sorted(self._members)
+
+    def __contains__(self, name):
+        return _normalize(name) in self._members
+
+    def isdir(self, name):
+        """Check whether the archive has members in the directory `name`."""
+        prefix = _normalize(name).rstrip('/') + '/'
+        return any(key.startswith(prefix) for key in self._members)
+
+    def read(self, name):
+        """Return the content of the member `name` as bytes."""
+        return self.read_many([name])[0]
+
+    def read_many(self, names):
+        """Return the contents of the members `names` as a list of bytes.
+
+        Members are read in the order in which they are stored in the
+        archive, so that a compressed archive is decompressed at most once.
+
+        Raises
+        ------
+        KeyError
+            If there is no member with one of the given names.
+
+        """
+        locations = [self._locate(name) for name in names]
+
+        result = [None] * len(locations)
+        order = sorted(range(len(locations)), key=lambda i: locations[i][0])
+
+        with self._lock:
+            f = self._get_file()
+            for i in order:
+                offset, size = locations[i]
+                # Seeking backward in a compressed file restarts
+                # the decompression from the beginning of the file.
+                f.seek(offset)
+                result[i] = f.read(size)
+
+        return result
+
+    def iter_many(self, names):
+        """Yield pairs of the name and the content of the members `names`.
+
+        Unlike `read_many`, only one member is held in memory at a time.
+        Members are yielded in the order in which they are stored in the
+        archive, so that a compressed archive is decompressed at most once,
+        unless other readers of this archive read members in the meantime.
+
+        Raises
+        ------
+        KeyError
+            If there is no member with one of the given names.
+
+        """
+        offsets = {name: self._locate(name)[0] for name in names}
+
+        for name in sorted(offsets, key=offsets.get):
+            yield name, self.read(name)
+
+    def load_npz(self, name, keys=None):
+        """Load the `.npz` member `name` into a dictionary of arrays.
+
+        If `keys` is given, only these arrays are decompressed.
+
+        """
+        with np.load(io.BytesIO(self.read(name))) as data:
+            if keys is None:
+                keys = data.files
+            return {key: data[key] for key in keys}
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _locate(self, name):
+        key = _normalize(name)
+        if key not in self._members:
+            raise KeyError('There is no member `{}` in archive `{}`'
+                           .format(name, self._filename))
+
+        return self._members[key]
+
+    def _get_file(self):
+        if self._file is None:
+            self._file = self._open(self._filename, 'rb')
+        return self._file
+
+    def _build(self):
+        members = {}
+
+        with tarfile.open(self._filename, 'r:*') as tar:
+            for info in tar:
+                if info.isfile():
+                    members[_normalize(info.name)] = (info.offset_data,
+                                                      info.size)
+
+        return members
+
+    def _load(self, stat):
+        if not os.path.isfile(self._index_filename):
+            return None
+
+        try:
+            with open(self._index_filename) as f:
+                index = json.load(f)
+            if (index['size'] != stat.st_size or
+                    index['mtime_ns'] != stat.st_mtime_ns):
+                return None
+            return {name: tuple(location)
+                    for name, location in index['members'].items()}
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    def _save(self, members, stat):
+        logger = logging.getLogger(__name__)
+        dirname = os.path.dirname(self._index_filename) or os.curdir
+        index = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'members': members,
+        }
+
+        try:
+            fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        except OSError as e:
+            # Archives can be in a read-only location, then we just do not
+            # save the index.
+            logger.debug('Cannot write archive index: {}'.format(e))
+            return
+
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_filename, self._index_filename)
+        except OSError as e:
+            logger.debug('Cannot write archive index: {}'.format(e))
+            os.remove(tmp_filename)
+
+
+def _get_opener(filename):
+    with open(filename, 'rb') as f:
+        magic = f.read(6)
+
+    for prefix, opener in _OPENERS:
+        if magic.startswith(prefix):
+            return opener
+
+    return open
+
+
+def _normalize(name):
+    name = name.replace(os.sep, '/')
+    while name.startswith('./'):
+        name = name[2:]
+    return name
@@ -0,0 +1,217 @@
+"""
+Fast reading of numeric tables written as text files.
+
+All text output of the solver (time series of detonation velocity, ZND
+solutions and profiles) is written in the fixed-width format `'%24.16e'`
+with one row per line and optional header lines that start with `#`.
+Instead of parsing such files line by line in Python, as `np.genfromtxt`
+does, the functions in this module read the whole buffer and convert it with
+a single vectorized call.
+As all rows have the same length, a window of rows can be read without
+reading the rest of the file.
+Conversely, `format_table` formats a block of rows in this layout with one
+call instead of formatting every row separately.
+
+"""
+import os
+
+import numpy as np
+
+from .timewindow import find_time_window
+
+
+def _read_header(f):
+    """Skip header lines and return the first data line and its offset."""
+    offset = 0
+
+    for line in f:
+        if not line.startswith(b'#'):
+            return line, offset
+        offset += len(line)
+
+    return b'', offset
+
+
+def _parse(buf, ncols):
+    values = np.fromstring(buf, dtype=np.float64, sep=' ')
+
+    # Older versions of Numpy only warn when they cannot parse the whole
+    # buffer and return the values parsed so far, hence, the number of
+    # values is compared with the number of tokens.
+    if (ncols == 0 or values.size % ncols != 0 or
+            values.size != _count_tokens(buf)):
+        raise ValueError('Cannot parse the table')
+
+    return values.reshape(-1, ncols)
+
+
+def _count_tokens(buf):
+    """Return the number of whitespace-separated tokens in `buf`."""
+    chars = np.frombuffer(buf, dtype=np.uint8)
+    is_token = chars > ord(' ')
+
+    # A token starts where a non-whitespace character follows whitespace.
+    return (int(is_token[:1].sum()) +
+            int(np.count_nonzero(is_token[1:] & ~is_token[:-1])))
+
+
+def format_table(block, fmt='%24.16e'):
+    """Format a two-dimensional array as text with one row per line.
+
+    The result is the same as what `np.savetxt` writes, but all values are
+    formatted with a single string-formatting operation.
+
+    Parameters
+    ----------
+    block : ndarray
+        Array of shape (nrows, ncols).
+    fmt : str, optional (default is '%24.16e')
+        Format of a single value.
+
+    Returns
+    -------
+    str
+        Text with `nrows` lines, each terminated with a newline character.
+
+    """
+    nrows, ncols = block.shape
+    row_fmt = ' '.join([fmt] * ncols) + '\n'
+
+    return (row_fmt * nrows) % tuple(block.ravel().tolist())
+
+
+def read_table(filename):
+    """Read a two-dimensional numeric table from the text file `filename`.
+
+    Lines at the beginning of the file that start with `#` are skipped.
+    The result is the same as from `np.loadtxt(filename, ndmin=2)` but the
+    data are converted with one vectorized call.
+
+    Parameters
+    ----------
+    filename : str or file
+        Path to the text file or a seekable file open in binary mode,
+        for example, `io.BytesIO` with a member of an archive.
+
+    Returns
+    -------
+    ndarray
+        Array of shape (nrows, ncols).
+
+    """
+    if hasattr(filename, 'read'):
+        return _read_table(filename)
+
+    with open(filename, 'rb') as f:
+        return _read_table(f)
+
+
+def _read_table(f):
+    start = f.tell()
+    first_line, offset = _read_header(f)
+    ncols = len(first_line.split())
+    f.seek(start + offset)
+    buf = f.read()
+
+    try:
+        return _parse(buf, ncols)
+    except ValueError:
+        # Fall back to the generic parser that reports the erroneous line.
+        f.seek(start)
+        return np.loadtxt(f, ndmin=2)
+
+
+class FixedWidthTable(object):
+    """Random access to rows of a text table with fixed-width rows.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the text file.
+
+    Raises
+    ------
+    ValueError
+        If the rows of the table do not have the same length.
+
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+
+        with open(filename, 'rb') as f:
+            first_line, self._offset = _read_header(f)
+
+        self._ncols = len(first_line.split())
+        self._row_length = len(first_line)
+        data_size = os.path.getsize(filename) - self._offset
+
+        if (self._ncols == 0 or not first_line.endswith(b'\n') or
+                data_size % self._row_length != 0):
+            raise ValueError('Rows of the table have different lengths')
+
+        self._nrows = data_size // self._row_length
+
+    def __len__(self):
+        return self._nrows
+
+    def __getitem__(self, index):
+        i, j = index
+        row = self._read(i, i + 1)
+
+        if not row.endswith(b'\n') or len(row.split()) != self._ncols:
+            raise ValueError('Rows of the table have different lengths')
+
+        return float(row.split()[j])
+
+    def read_rows(self, start, stop):
+        """Read rows from `start` (inclusive) to `stop` (exclusive)."""
+        buf = self._read(start, stop)
+        rows = np.frombuffer(buf, dtype=np.uint8)
+        rows = rows.reshape(-1, self._row_length)
+
+        if not np.all(rows[:, -1] == ord('\n')):
+            raise ValueError('Rows of the table have different lengths')
+
+        return _parse(buf, self._ncols)
+
+    def _read(self, start, stop):
+        with open(self._filename, 'rb') as f:
+            f.seek(self._offset + start * self._row_length)
+            return f.read((stop - start) * self._row_length)
+
+
+def read_table_window(filename, t_start=None, t_end=None):
+    """Read rows of a text table whose first column is in a time window.
+
+    The first column of the table must be monotonically increasing.
+    If all rows have the same length, which is the case for the files
+    written by the solver, the window is found by binary search over the rows
+    and only the window is read from disk.
+    Otherwise, the whole table is read and then sliced.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the text file.
+    t_start : float, optional
+        If given, only the rows with the first column `>= t_start` are read.
+    t_end : float, optional
+        If given, only the rows with the first column `<= t_end` are read.
+
+    Returns
+    -------
+    ndarray
+        Array of shape (nrows, ncols).
+
+    """
+    try:
+        table = FixedWidthTable(filename)
+        window = find_time_window(table, t_start, t_end, column=0)
+
+        return table.read_rows(window.start, window.stop)
+    except ValueError:
+        data = read_table(filename)
+        window = find_time_window(data[:, 0], t_start, t_end)
+
+        return data[window]
@@ -0,0 +1,131 @@
+"""
+Find windows of monotonic time series with binary search."""
+import bisect
+
+import numpy as np
+
+
+class _Column(object):
+    """Lazy view of a column of a two-dimensional array-like object."""
+
+    def __init__(self, data, column):
+        self._data = data
+        self._column = column
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, i):
+        return self._data[i, self._column]
+
+
+class UniformTime(object):
+    """Lazy array of uniformly spaced times `t0 + i * dt`, `i < n`.
+
+    Time series written with a fixed time step can store only `t0`, `dt`
+    and `n` instead of the time column. This class gives access to the
+    times without allocating the whole array: elements and slices are
+    computed on demand, so that `find_time_window` accesses O(log n) values.
+
+    """
+
+    def __init__(self, t0, dt, n):
+        self._t0 = float(t0)
+        self._dt = float(dt)
+        self._n = int(n)
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._n)
+            return self._t0 + self._dt * np.arange(start, stop, step)
+
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError('Index out of range')
+
+        return self._t0 + self._dt * i
+
+    def __array__(self, dtype=None, copy=None):
+        t = self[:]
+        if dtype is not None:
+            t = t.astype(dtype)
+        return t
+
+
+def get_time(arrays):
+    """Return the time of a time series stored in the dictionary `arrays`.
+
+    The time is either stored explicitly as the array `t` or implicitly as
+    the scalars `t0`, `dt` and `n`, then `UniformTime` is returned.
+
+    """
+    if 't' in arrays:
+        return arrays['t']
+
+    return UniformTime(arrays['t0'], arrays['dt'], arrays['n'])
+
+
+def find_series_window(arrays, t_start=None, t_end=None):
+    """Find the window of a time series stored in the dictionary `arrays`.
+
+    The time of the series (see `get_time`) is accessed only if a boundary
+    of the window is given, so that reading only detonation velocity `d`
+    of a whole series never touches the time.
+
+    Returns
+    -------
+    slice
+        Slice of indices of the series that belong to the window.
+
+    """
+    if t_start is None and t_end is None:
+        return slice(None)
+
+    return find_time_window(get_time(arrays), t_start, t_end)
+
+
+def find_time_window(t, t_start=None, t_end=None, column=None):
+    """Find the slice of indices of `t` such that `t_start <= t <= t_end`.
+
+    As the time array is monotonically increasing, the window is found with
+    binary search, that is, only O(log n) elements of `t` are accessed.
+    Hence, `t` can be a memory-mapped array, an HDF5 dataset or any other
+    sequence that reads elements lazily.
+
+    Parameters
+    ----------
+    t : sequence
+        Monotonically increasing time values supporting `len(t)` and `t[i]`.
+    t_start : float, optional
+        Left boundary of the window. If None, the window starts at `t[0]`.
+    t_end : float, optional
+        Right boundary of the window. If None, the window ends at `t[-1]`.
+    column : int, optional
+        If given, `t` is a two-dimensional array-like object and time values
+        are taken from this column, that is, `t[i, column]` is accessed
+        instead of `t[i]`.
+
+    Returns
+    -------
+    slice
+        Slice of indices of `t` that belong to the window.
+
+    """
+    if column is not None:
+        t = _Column(t, column)
+
+    if t_start is None:
+        i_start = 0
+    else:
+        i_start = bisect.bisect_left(t, t_start)
+
+    if t_end is None:
+        i_end = len(t)
+    else:
+        i_end = bisect.bisect_right(t, t_end)
+
+    return slice(i_start, max(i_start, i_end))
@@ -3,22 +3,20 @@ import os
 import sys
 
 import matplotlib.pyplot as plt
-import numpy as np
+
+from saf.fm.linear import Reader
 
 from helpers import FIGSIZE_LARGE as figsize
 from helpers import savefig
 
 time_step = 5000
-profile_name = 'profile-{:d}.txt'.format(time_step)
 
 dir_1 = os.path.join('_output', 'theta=0.920')
 dir_2 = os.path.join('_output', 'theta=0.950')
 
-data_1 = np.loadtxt(os.path.join(dir_1, 'profiles', profile_name))
-x_1, u_1, lamda_1 = data_1[:, 0], data_1[:, 1], data_1[:, 2]
+__, x_1, u_1, lamda_1 = Reader(dir_1).get_profile(time_step)
 
-data_2 = np.loadtxt(os.path.join(dir_2, 'profiles', profile_name))
-x_2, u_2, lamda_2 = data_2[:, 0], data_2[:, 1], data_2[:, 2]
+__, x_2, u_2, lamda_2 = Reader(dir_2).get_profile(time_step)
 
 fig, axes = plt.subplots(nrows=2, ncols=2, figsize=figsize)
 coord_x = 0.05
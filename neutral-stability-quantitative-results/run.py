@@ -5,7 +5,7 @@ import sys
 
 import numpy as np
 
-from mpi4py import MPI
+from saf.sweep import get_executor
 
 from lib_neutral_stability import find_critical_e_act, FMT_SIGNED, FMT_UNSIGNED
 
@@ -22,18 +22,7 @@ N12 = 40
 os.environ['OMP_NUM_THREADS'] = '1'
 
 
-def _worker(tasks, rank):
-    for t in tasks:
-        _worker_single_task(t, rank)
-
-
-def _worker_single_task(t, rank):
-    # task_list, = args
-    theta_crit = 0.0
-
-    q = t
-    worker_name = rank
-
+def _worker_single_task(q):
     try:
         outdir = 'q={:{fmt}}'.format(q, fmt=FMT_UNSIGNED)
         outdir = os.path.join(OUTPUT_DIR, outdir)
@@ -45,7 +34,8 @@ def _worker_single_task(t, rank):
         errname = os.path.join(outdir, 'stderr.log')
         sys.stdout = open(outname, 'w', buffering=1)
         sys.stderr = open(errname, 'w', buffering=1)
-        print('Worker {} | q={:{fmt}}'.format(worker_name, q, fmt=FMT_UNSIGNED))
+        print('Worker {} | q={:{fmt}}'.format(os.getpid(), q,
+                                              fmt=FMT_UNSIGNED))
     except Exception as e:
         print('q={:{fmt}} | {}'.format(q, str(e), fmt=FMT_UNSIGNED))
         return
@@ -72,29 +62,21 @@ def _worker_single_task(t, rank):
     except Exception as e:
         print('q={:{fmt}} | {}'.format(q, str(e), fmt=FMT_UNSIGNED))
         # Write exception message to the master process stdout as well.
-        sys.stdout = sys.__stdout__
-        print('q={:{fmt}} | {}'.format(q, str(e), fmt=FMT_UNSIGNED))
+        sys.__stdout__.write('q={:{fmt}} | {}\n'.format(q, str(e),
+                                                        fmt=FMT_UNSIGNED))
+    finally:
+        # Workers run several tasks, hence, the next task must not write
+        # to the logs of this one.
+        sys.stdout.close()
+        sys.stderr.close()
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
 
 
-comm = MPI.COMM_WORLD
-rank = comm.Get_rank()
-size = comm.Get_size()
-
-counter = 0
-
-all_tasks = []
-
-# Build `all_tasks` in master process to distribute it to all processes.
-if rank == 0:
+if __name__ == '__main__':
     # Values of heat release :math:`q`.
     q_values = [0.81, 1, 2, 4, 9, 16]
 
-    for i in range(size):
-        all_tasks.append([])
-
-    for i in range(len(q_values)):
-        all_tasks[i % size].append(q_values[i])
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Now distribute the tasks to each process.
-tasks = comm.scatter(all_tasks, root=0)
-_worker(tasks, rank)
+    with get_executor() as executor:
+        executor.map(_worker_single_task, q_values)
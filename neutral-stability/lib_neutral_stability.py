@@ -9,6 +9,7 @@ from saf.ffm.linear import Reader
 from saf.ffm.linear import ZNDSolverError
 
 from saf.linear.postprocessor import CannotConstructHankelMatrix
+from saf.util.resultstore import ResultStore
 
 
 # Format for floating-point numbers.
@@ -18,6 +19,11 @@ FMT_SIGNED = '+22.16e'
 POSITIVE_INDEFINITE_RATE = +9.999999999999+00
 NEGATIVE_INDEFINITE_RATE = -9.999999999999+00
 
+# Store of the results of all runs, which is shared between experiments,
+# so that every configuration is computed only once.
+RESULT_STORE = os.environ.get('SAF_RESULT_STORE',
+                              os.path.join(os.pardir, '_result-store'))
+
 
 def find_critical_e_act(params, outdir, tol, mode_number=0):
     assert 'n12' in params, 'Parameter `n12` is missing'
@@ -134,10 +140,7 @@ def _get_abs_growth_rates(params, outdir, mode_number=0):
 
     try:
         if not os.path.exists(outdir_a):
-            c_a = _get_config(n12, q, a)
-            os.mkdir(outdir_a)
-            solve('linear', c_a, outdir_a, log_to_file=True)
-            postprocess(outdir_a, savetofile=True)
+            outdir_a = _solve(_get_config(n12, q, a))
 
         r_a = Reader(outdir_a)
         stab_info_a = r_a.get_stability_info()
@@ -158,10 +161,7 @@ def _get_abs_growth_rates(params, outdir, mode_number=0):
 
     try:
         if not os.path.exists(outdir_b):
-            c_b = _get_config(n12, q, b)
-            os.mkdir(outdir_b)
-            solve('linear', c_b, outdir_b, log_to_file=True)
-            postprocess(outdir_b, savetofile=True)
+            outdir_b = _solve(_get_config(n12, q, b))
 
         r_b = Reader(outdir_b)
         stab_info_b = r_b.get_stability_info()
@@ -184,6 +184,23 @@ def _get_abs_growth_rates(params, outdir, mode_number=0):
     return ((rate_a, freq_a), (rate_b, freq_b))
 
 
+def _solve(config):
+    """Return the directory with the results of the run with `config`.
+
+    Results are taken from the result store if the same configuration was
+    computed before by any experiment.
+
+    """
+    store = ResultStore(RESULT_STORE)
+
+    return store.solve('linear', config, solve,
+                       postprocess=_postprocess, log_to_file=True)
+
+
+def _postprocess(outdir):
+    postprocess(outdir, savetofile=True)
+
+
 def _get_config(n12, q, theta):
     c = Config()
     c.n12 = n12
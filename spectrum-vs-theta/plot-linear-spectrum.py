@@ -4,6 +4,8 @@ import os
 import matplotlib.pyplot as plt
 import numpy as np
 
+from saf.util.catalog import Catalog
+
 from helpers import FIGSIZE_TWO_SUBPLOTS_TWO_ROWS as figsize
 from helpers import savefig
 
@@ -18,18 +20,10 @@ MAX_NUMBER_OF_MODES = 6
 OUTPUT_DIR = './_output'
 
 theta_range = (0.90, 1.15)
-theta_values = []
-
-dirs = os.listdir(OUTPUT_DIR)
-dirs.sort()
 
-dirs_sorted = []
-
-for d in dirs:
-    q = float(d.split('=')[1])
-    theta_values.append(q)
+runs = Catalog(OUTPUT_DIR).find(order_by='theta')
 
-dirs_sorted = [d for (q, d) in sorted(zip(theta_values, dirs))]
+dirs_sorted = [os.path.basename(run.path) for run in runs]
 
 theta_values = []
 conjugate_rates = []
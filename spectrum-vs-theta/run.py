@@ -1,17 +1,11 @@
 #!/usr/bin/env python
 r""" Run many linearized simulations with varying :math:`\theta`."""
-import os
-import sys
-import shutil
-
 import numpy as np
 
-from mpi4py import MPI
-
 from saf.action import solve
 from saf.action import postprocess
 from saf.ffm.linear import Config
-from saf.util import reset_logging
+from saf.sweep import Sweep, get_executor
 
 TOTAL_THETAS = 251
 N12 = 320
@@ -24,44 +18,11 @@ OUTPUT_DIR = '_output'
 FMT = '.3f'
 
 
-def _worker(tasks, rank):
-    for t in tasks:
-        _worker_single_task(t, rank)
-
-
-def _worker_single_task(task, rank):
-    theta = task
-    worker_name = rank
-
-    try:
-        outdir = 'theta={:{fmt}}'.format(theta, fmt=FMT)
-        outdir = os.path.join(OUTPUT_DIR, outdir)
+def _postprocess(outdir):
+    postprocess(outdir, savetofile=True)
 
-        if os.path.exists(outdir):
-            shutil.rmtree(outdir)
-        os.mkdir(outdir)
-        outname = os.path.join(outdir, 'stdout.log')
-        errname = os.path.join(outdir, 'stderr.log')
-        sys.stdout = open(outname, 'w')
-        sys.stderr = open(errname, 'w')
-        msg = 'Worker {} | theta={:{fmt}}'.format(worker_name, theta, fmt=FMT)
-        print(msg)
-    except Exception as e:
-        print('theta={:{fmt}} | {}'.format(theta, str(e), fmt=FMT))
-        return
 
-    try:
-        c = _get_config(theta)
-        solve('linear', c, outdir, log_to_file=False)
-        postprocess(outdir, savetofile=True)
-        reset_logging()
-    except Exception as e:
-        print('theta={:{fmt}} | {}'.format(theta, str(e), fmt=FMT))
-        sys.stdout = sys.__stdout__
-        print('theta={:{fmt}} | {}'.format(theta, str(e), fmt=FMT))
-
-
-def _get_config(theta):
+def _get_config():
     c = Config()
 
     c.n12 = N12
@@ -75,7 +36,6 @@ def _get_config(theta):
 
     c.lambda_tol = 1e-6
     c.q = Q
-    c.theta = theta
     c.reaction_rate_version = 'v2'  # Expression exactly as in FariaEtAl2015.
     c.f = 1
     c.ic_amplitude = 1e-10
@@ -85,23 +45,20 @@ def _get_config(theta):
     return c
 
 
-comm = MPI.COMM_WORLD
-rank = comm.Get_rank()
-size = comm.Get_size()
-
-all_tasks = []
-
-# Build `all_tasks` in master process to distribute it to all processes.
-if rank == 0:
+if __name__ == '__main__':
     # Uniformly spaced values of :math:`\theta`.
     theta_values = np.linspace(0.90, 1.15, num=TOTAL_THETAS)
 
-    for i in range(size):
-        all_tasks.append([])
+    sweep = Sweep('linear', _get_config(), grid={'theta': theta_values},
+                  outdir=OUTPUT_DIR, dirname='theta={theta:' + FMT + '}',
+                  solve=solve, postprocess=_postprocess,
+                  solve_kwargs={'log_to_file': False})
 
-    for i in range(len(theta_values)):
-        all_tasks[i % size].append(theta_values[i])
+    with get_executor() as executor:
+        results = sweep.run(executor, longest_first=True)
 
-# Now distribute the tasks to each process.
-tasks = comm.scatter(all_tasks, root=0)
-_worker(tasks, rank)
+    if executor.is_root:
+        for r in results:
+            if r.status == 'failed':
+                print('theta={:{fmt}} | {}'.format(r.params['theta'], r.error,
+                                                   fmt=FMT))
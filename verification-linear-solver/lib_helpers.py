@@ -6,6 +6,7 @@ from scipy import linalg
 
 from saf.fm.linear import Reader
 from saf.util import compute_observed_order_of_accuracy
+from saf.util.catalog import Catalog
 
 # Human-friendly representation of a missing datum.
 NAN_REPR = '{N/A}'
@@ -14,33 +15,23 @@ NAN_REPR = '{N/A}'
 def get_target_dirs_and_resolutions():
     """Get lists of simulation results and corresponding grid resolutions."""
     rootdir = '_output'
-    dirs = os.listdir(rootdir)
-    dirs.sort()
+    runs = Catalog(rootdir).find(order_by='n12')
 
     target_dirs = []
-    for d in dirs:
-        if d.startswith('n12'):
-            target_dirs.append(os.path.join(rootdir, d))
-
-    target_dirs.sort()
-
     resolutions = []
-    for d in target_dirs:
-        chunks = d.split('=')
-        resolutions.append(int(chunks[-1]))
+    for run in runs:
+        if not os.path.basename(run.path).startswith('n12'):
+            continue
+
+        target_dirs.append(run.path)
+        resolutions.append(int(run.params['n12']))
 
     return target_dirs, resolutions
 
 
 def get_errors(target_dirs):
     """Compute relative errors in $L_1$, $L_2$, and $L_\infty$ norms."""
-    d_list = []
-
-    for outdir in target_dirs:
-        r = Reader(outdir)
-        __, d = r.get_time_and_detonation_velocity()
-
-        d_list.append(d)
+    __, d_list = Reader.read_many(target_dirs)
 
     errors_l1 = [float('NaN')]
     errors_l2 = [float('NaN')]
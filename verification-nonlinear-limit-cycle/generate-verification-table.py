@@ -63,11 +63,9 @@ def get_errors(target_dirs):
     """Compute errors by comparing the mean of late-time minima of D(t)."""
     mean_min = []
 
-    for outdir in target_dirs:
-        r = Reader(outdir)
-        t, d = r.get_time_and_detonation_velocity()
+    __, dw_list = Reader.read_many(target_dirs, window=(START_TIME, None))
 
-        dw = d[t >= START_TIME]
+    for dw in dw_list:
         indices = signal.argrelmin(dw)[0]
         minima = dw[indices]
 
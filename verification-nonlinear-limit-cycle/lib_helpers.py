@@ -4,6 +4,7 @@ import numpy as np
 
 from saf.fm.linear import Reader
 from saf.util import compute_observed_order_of_accuracy
+from saf.util.catalog import Catalog
 
 # Human-friendly representation of a missing datum.
 NAN_REPR = '{N/A}'
@@ -12,23 +13,17 @@ NAN_REPR = '{N/A}'
 def get_target_dirs_and_resolutions(prefix=None):
     """Get lists of simulation results and corresponding grid resolutions."""
     rootdir = '_output'
-    dirs = os.listdir(rootdir)
-    dirs.sort()
+    runs = Catalog(rootdir).find(order_by='n12')
 
     target_dirs = []
-    for d in dirs:
-        if prefix is not None:
-            if d.startswith(prefix):
-                target_dirs.append(os.path.join(rootdir, d))
-        else:
-            target_dirs.append(os.path.join(rootdir, d))
-
-    target_dirs.sort()
-
     resolutions = []
-    for d in target_dirs:
-        chunks = d.split('=')
-        resolutions.append(int(chunks[-1]))
+    for run in runs:
+        name = os.path.basename(run.path)
+        if prefix is not None and not name.startswith(prefix):
+            continue
+
+        target_dirs.append(run.path)
+        resolutions.append(int(run.params['n12']))
 
     return target_dirs, resolutions
 
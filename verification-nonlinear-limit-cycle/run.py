@@ -1,8 +1,4 @@
 #!/usr/bin/env python
-import os
-import multiprocessing as mp
-import shutil
-
 import numpy as np
 
 from scipy import linalg
@@ -10,6 +6,7 @@ from scipy import linalg
 from saf.action import solve
 from saf.fm.nonlinear import Config
 from saf.fm.nonlinear import Reader
+from saf.sweep import Sweep, check_results, get_executor
 
 
 Q = 4
@@ -17,11 +14,9 @@ THETA = 0.95
 T_FINAL = 1000
 
 
-def _run_solver(args):
-    n12, = args
+def _get_config():
     c = Config()
 
-    c.n12 = n12
     c.final_time = T_FINAL
     c.dt = 0.005
     c.approximator = 'godunov-minmod'
@@ -39,20 +34,18 @@ def _run_solver(args):
     c.ic_type = 'znd'
     c.truncation_coef = 1e6
 
-    outdir = 'N12={:04d}'.format(n12)
-    outdir = os.path.join('_output', outdir)
-
-    if os.path.exists(outdir):
-        shutil.rmtree(outdir)
-    os.mkdir(outdir)
-    solve('nonlinear', c, outdir, log_to_file=True)
-
-    return outdir
+    return c
 
 
 if __name__ == '__main__':
     n12_list = [20, 40, 80, 160, 320, 640, 1280]
-    tasks = [(n12, ) for n12 in n12_list]
 
-    with mp.Pool(processes=4) as pool:
-        results = pool.map(_run_solver, tasks)
+    sweep = Sweep('nonlinear', _get_config(), grid={'n12': n12_list},
+                  dirname='N12={n12:04d}', solve=solve,
+                  solve_kwargs={'log_to_file': True})
+
+    with get_executor() as executor:
+        task_results = sweep.run(executor)
+
+    check_results(task_results)
+    results = [r.outdir for r in task_results]
@@ -12,6 +12,7 @@ from scipy import linalg
 
 from saf.fm.linear import Reader
 from saf.util import compute_observed_order_of_accuracy
+from saf.util.catalog import Catalog
 
 # Human-friendly representation of a missing datum.
 NAN_REPR = '{N/A}'
@@ -20,40 +21,24 @@ NAN_REPR = '{N/A}'
 def get_target_dirs_and_resolutions(prefix=None):
     """Get lists of simulation results and corresponding grid resolutions."""
     rootdir = '_output'
-    dirs = os.listdir(rootdir)
-    dirs.sort()
+    runs = Catalog(rootdir).find(order_by='n12')
 
     target_dirs = []
-    for d in dirs:
-        if prefix is not None:
-            if d.startswith(prefix):
-                target_dirs.append(os.path.join(rootdir, d))
-        else:
-            target_dirs.append(os.path.join(rootdir, d))
-
-    target_dirs.sort()
-
     resolutions = []
-    for d in target_dirs:
-        chunks = d.split('=')
-        resolutions.append(int(chunks[-1]))
+    for run in runs:
+        name = os.path.basename(run.path)
+        if prefix is not None and not name.startswith(prefix):
+            continue
+
+        target_dirs.append(run.path)
+        resolutions.append(int(run.params['n12']))
 
     return target_dirs, resolutions
 
 
 def get_time_series(target_dirs):
     """Read simulation data from `target_dirs`"""
-    t_list = []
-    d_list = []
-
-    for outdir in target_dirs:
-        r = Reader(outdir)
-        t, d = r.get_time_and_detonation_velocity()
-
-        t_list.append(t)
-        d_list.append(d)
-
-    return t_list, d_list
+    return Reader.read_many(target_dirs)
 
 
 def get_errors(target_dirs):